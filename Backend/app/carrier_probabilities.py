@@ -0,0 +1,540 @@
+# Backend/app/carrier_probabilities.py: contains backend logic for the Animal Breed Registry System.
+"""
+Carrier probabilities for recessive hereditary conditions.
+
+Health records carry free-text `hereditary_conditions` such as
+"BLAD carrier; CVM clear" or "affected". Each `;`/`,`-separated part is read
+as a status (affected, carrier or clear) for a named condition. Text
+without a condition name counts as one generic condition. For every
+animal_type and condition, the latest recorded status is genotype evidence
+at a single autosomal recessive locus (AA clear, Aa carrier, aa affected).
+Iterative peeling (Kerr & Kinghorn 1996) then spreads it to every relative
+in the registered pedigree:
+
+* the anterior of an animal comes from its parents and its full siblings,
+  one generation at a time from the founders down;
+* the posterior messages each mating sends to the sire and the dam come
+  from all their offspring in that mating and are updated for every family
+  at once.
+
+The passes repeat until the messages settle. Without pedigree loops the
+result is exact; with loops (inbreeding) it is the usual close
+approximation. Founders, and unknown parents
+of half-known animals, take Hardy–Weinberg priors with defect allele
+frequency `CARRIER_ALLELE_FREQUENCY`. Recorded statuses are trusted up to
+a small `RECORD_ERROR_RATE`, which also keeps every message positive so
+the loops in real pedigrees cannot divide by zero.
+
+For a planned mating, P(affected offspring) combines the transmission
+probabilities t = ½·P(Aa) + P(aa) of both parents with the pair's offspring
+COI: (1 − F)·t_s·t_d + F·(t_s + t_d)/2.
+
+Results are kept per database engine and animal_type. A new pedigree epoch
+rebuilds them. New health records are picked up by health-record ID: only
+the touched animals' evidence is re-read, and only the conditions whose
+evidence changed are re-solved, warm-started from the previous messages.
+Only the first call waits for a build; later refreshes run in a background
+thread while the previous state keeps being served, and each engine and
+animal_type refreshes on its own lock.
+"""
+
+from __future__ import annotations
+import os
+import re
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from . import models
+from .inbreeding import FULL_PEDIGREE_DEPTH, known_parents, topological_order
+from .pedigree import PedigreeNode, get_pedigree_epoch, get_pedigree_nodes
+
+logger = logging.getLogger(__name__)
+
+CARRIER_ALLELE_FREQUENCY = float(os.getenv("CARRIER_ALLELE_FREQUENCY", "0.02"))
+CARRIER_BACKGROUND_REFRESH = os.getenv("CARRIER_BACKGROUND_REFRESH", "true").lower() not in {"0", "false", "no"}
+RECORD_ERROR_RATE = 1e-6
+PEELING_TOLERANCE = 1e-5
+PEELING_MAX_ITERATIONS = 100
+PEELING_DAMPING = 0.5
+UNSPECIFIED_CONDITION = "hereditary condition"
+
+_STATUS_PATTERNS = [
+    ("affected", re.compile(r"\b(affected|defect(ive)?|homozygous (positive|affected))\b")),
+    ("carrier", re.compile(r"\b(carrier|positive|heterozygous)\b")),
+    ("clear", re.compile(r"\b(clear|free|negative|normal|non[- ]?carrier)\b")),
+]
+_FILLER_WORDS = re.compile(
+    r"\b(affected|defect(ive)?|carrier|positive|negative|heterozygous|homozygous|clear|free|normal|non[- ]?carrier|"
+    r"status|tested|test|known|for|of|is|a|an|the|as)\b"
+)
+_GENOTYPE_EVIDENCE = {
+    "clear": np.array([1.0, RECORD_ERROR_RATE, RECORD_ERROR_RATE]),
+    "carrier": np.array([RECORD_ERROR_RATE, 1.0, RECORD_ERROR_RATE]),
+    "affected": np.array([RECORD_ERROR_RATE, RECORD_ERROR_RATE, 1.0]),
+}
+
+# Transmission probabilities T[sire genotype, dam genotype, offspring genotype].
+_GAMETE = np.array([0.0, 0.5, 1.0])
+_TRANSMISSION = np.empty((3, 3, 3))
+_TRANSMISSION[:, :, 0] = np.outer(1 - _GAMETE, 1 - _GAMETE)
+_TRANSMISSION[:, :, 1] = np.outer(_GAMETE, 1 - _GAMETE) + np.outer(1 - _GAMETE, _GAMETE)
+_TRANSMISSION[:, :, 2] = np.outer(_GAMETE, _GAMETE)
+
+# Handles parse hereditary statuses logic for this module.
+def parse_hereditary_statuses(text: Optional[str]) -> Dict[str, str]:
+    """
+    `{condition: status}` from free text, status one of "affected",
+    "carrier" or "clear". Parts without a recognised status are ignored.
+    """
+
+    statuses: Dict[str, str] = {}
+
+    for part in re.split(r"[;,\n]", (text or "").lower()):
+        status = next((name for name, pattern in _STATUS_PATTERNS if pattern.search(part)), None)
+
+        if status is None:
+            continue
+
+        condition = " ".join(re.sub(r"[^a-z0-9 ]", " ", _FILLER_WORDS.sub(" ", part)).split())
+        statuses[condition or UNSPECIFIED_CONDITION] = status
+    return statuses
+
+# Internal helper for normalise.
+def _normalise(values: np.ndarray) -> np.ndarray:
+    return values / values.sum(axis=-1, keepdims=True)
+
+# Internal helper for posterior.
+def _posterior(log_posterior: np.ndarray, rows: Any) -> np.ndarray:
+    values = log_posterior[rows]
+    return np.exp(values - values.max(axis=-1, keepdims=True))
+
+# Calculates the probability of an affected offspring.
+def affected_offspring_probability(sire: np.ndarray, dam: np.ndarray, coi: Any) -> np.ndarray:
+    """
+    `sire` and `dam` are genotype probabilities (…, 3) in AA/Aa/aa order and
+    broadcast against each other and against `coi`.
+    """
+
+    transmit_sire = np.asarray(sire)[..., 1] * 0.5 + np.asarray(sire)[..., 2]
+    transmit_dam = np.asarray(dam)[..., 1] * 0.5 + np.asarray(dam)[..., 2]
+    coi = np.asarray(coi, dtype=float)
+    return (1 - coi) * transmit_sire * transmit_dam + coi * (transmit_sire + transmit_dam) / 2
+
+# Defines the peeling pedigree structure used by this module.
+class PeelingPedigree:
+    """
+    Array form of a pedigree for iterative peeling. Unknown parents of
+    animals with one known parent become virtual founders, one per slot, so
+    each such animal forms its own family. Animals with no known parent are
+    founders and belong to no family.
+    """
+
+    # Internal helper for init.
+    def __init__(self, nodes: Mapping[int, PedigreeNode], animal_ids: Iterable[int]) -> None:
+        self.order = topological_order(nodes, animal_ids)
+        self.index = {animal_id: position for position, animal_id in enumerate(self.order)}
+        size = len(self.order)
+        generation = np.zeros(size, dtype=np.int64)
+        families: Dict[Tuple[int, int], int] = {}
+        family_sire: List[int] = []
+        family_dam: List[int] = []
+        offspring_family = np.full(size, -1, dtype=np.int64)
+        virtual = size
+
+        for position, animal_id in enumerate(self.order):
+            node = nodes.get(animal_id)
+            registered = set(known_parents(node, nodes))
+            parents = [
+                self.index.get(parent_id, -1) if parent_id in registered else -1 for parent_id in (node.sire_id, node.dam_id)
+            ]
+
+            if parents == [-1, -1]:
+                continue
+
+            generation[position] = max(generation[parent] for parent in parents if parent >= 0) + 1
+
+            for slot in (0, 1):
+                if parents[slot] < 0:
+                    parents[slot] = virtual
+                    virtual += 1
+
+            family = families.setdefault((parents[0], parents[1]), len(families))
+
+            if family == len(family_sire):
+                family_sire.append(parents[0])
+                family_dam.append(parents[1])
+            offspring_family[position] = family
+
+        self.size = size
+        self.total = virtual
+        self.family_sire = np.array(family_sire, dtype=np.int64)
+        self.family_dam = np.array(family_dam, dtype=np.int64)
+        self.offspring = np.flatnonzero(offspring_family >= 0)
+        self.offspring_family = offspring_family[self.offspring]
+        levels = generation[self.offspring]
+        self.levels = [np.flatnonzero(levels == level) for level in range(1, int(levels.max(initial=0)) + 1)]
+        self.level_families = [np.unique(self.offspring_family[level]) for level in self.levels]
+
+@dataclass
+
+# Defines the peeling state structure used by this module.
+class PeelingState:
+    """Converged messages for one condition, kept to warm-start the next solve."""
+
+    evidence: np.ndarray
+    anterior: np.ndarray
+    to_sire: np.ndarray
+    to_dam: np.ndarray
+    genotypes: np.ndarray
+    iterations: int = 0
+
+# Calculates genotype probabilities by iterative peeling.
+def peel(
+    pedigree: PeelingPedigree,
+    evidence: np.ndarray,
+    allele_frequency: float = CARRIER_ALLELE_FREQUENCY,
+    warm: Optional[PeelingState] = None,
+    tolerance: float = PEELING_TOLERANCE,
+    max_iterations: int = PEELING_MAX_ITERATIONS,
+) -> PeelingState:
+    """
+    `evidence` is (total, 3): per-genotype likelihood of each animal's
+    records, ones where nothing is recorded. Returns the converged state;
+    `genotypes` holds P(AA), P(Aa), P(aa) for every registered animal in
+    `pedigree.order`.
+    """
+
+    q = allele_frequency
+    prior = np.array([(1 - q) ** 2, 2 * q * (1 - q), q ** 2])
+    families = len(pedigree.family_sire)
+    sires, dams = pedigree.family_sire, pedigree.family_dam
+    offspring, offspring_family = pedigree.offspring, pedigree.offspring_family
+
+    if warm is not None:
+        anterior, to_sire, to_dam = warm.anterior.copy(), warm.to_sire.copy(), warm.to_dam.copy()
+
+    else:
+        anterior = np.tile(prior, (pedigree.total, 1))
+        to_sire = np.ones((families, 3))
+        to_dam = np.ones((families, 3))
+
+    log_posterior = np.zeros((pedigree.total, 3))
+    np.add.at(log_posterior, sires, np.log(to_sire))
+    np.add.at(log_posterior, dams, np.log(to_dam))
+    log_terms = np.zeros((len(offspring), 3, 3))
+    log_family = np.zeros((families, 3, 3))
+    iterations = 0
+
+    while True:
+        iterations += 1
+        change = 0.0
+        # Loops make undamped messages oscillate; the first cold sweep has nothing to damp towards.
+        damping = PEELING_DAMPING if iterations > 1 or warm is not None else 0.0
+
+        # Posterior sweep, youngest generation first, so information reaches the founders in one pass.
+        for level, family in zip(reversed(pedigree.levels), reversed(pedigree.level_families)):
+            members = offspring[level]
+            below = _normalise(evidence[members] * _posterior(log_posterior, members))
+            log_terms[level] = np.log(np.einsum("abk,ok->oab", _TRANSMISSION, below))
+            log_family[family] = 0.0
+            np.add.at(log_family, offspring_family[level], log_terms[level])
+
+            sire, dam = sires[family], dams[family]
+            sire_side = _normalise(anterior[sire] * evidence[sire] * _posterior(log_posterior, sire) / to_sire[family])
+            dam_side = _normalise(anterior[dam] * evidence[dam] * _posterior(log_posterior, dam) / to_dam[family])
+            product = np.exp(log_family[family] - log_family[family].max(axis=(1, 2), keepdims=True))
+            new_to_sire = _normalise(np.einsum("fab,fb->fa", product, dam_side))
+            new_to_dam = _normalise(np.einsum("fab,fa->fb", product, sire_side))
+
+            if damping:
+                new_to_sire = _normalise(new_to_sire ** (1 - damping) * to_sire[family] ** damping)
+                new_to_dam = _normalise(new_to_dam ** (1 - damping) * to_dam[family] ** damping)
+            change = max(change, np.abs(new_to_sire - to_sire[family]).max(), np.abs(new_to_dam - to_dam[family]).max())
+
+            np.add.at(log_posterior, sire, np.log(new_to_sire) - np.log(to_sire[family]))
+            np.add.at(log_posterior, dam, np.log(new_to_dam) - np.log(to_dam[family]))
+            to_sire[family], to_dam[family] = new_to_sire, new_to_dam
+
+        # Anterior sweep, founders down, from parents and full siblings.
+        for level in pedigree.levels:
+            members = offspring[level]
+            family = offspring_family[level]
+            sire, dam = sires[family], dams[family]
+            sire_side = _normalise(anterior[sire] * evidence[sire] * _posterior(log_posterior, sire) / to_sire[family])
+            dam_side = _normalise(anterior[dam] * evidence[dam] * _posterior(log_posterior, dam) / to_dam[family])
+            siblings = log_family[family] - log_terms[level]
+            siblings = np.exp(siblings - siblings.max(axis=(1, 2), keepdims=True))
+            anterior[members] = _normalise(np.einsum("abk,fa,fb,fab->fk", _TRANSMISSION, sire_side, dam_side, siblings))
+
+        if change < tolerance or iterations >= max_iterations:
+            break
+
+    genotypes = _normalise(anterior * evidence * _posterior(log_posterior, slice(None)))[: pedigree.size]
+    return PeelingState(
+        evidence=evidence, anterior=anterior, to_sire=to_sire, to_dam=to_dam, genotypes=genotypes, iterations=iterations
+    )
+
+@dataclass
+
+# Defines the carrier probabilities structure used by this module.
+class CarrierProbabilities:
+    """Genotype probabilities for every condition recorded in one animal_type."""
+
+    animal_type: str
+    epoch: int
+    pedigree: PeelingPedigree
+    statuses: Dict[int, Dict[str, str]] = field(default_factory=dict)
+    conditions: Dict[str, PeelingState] = field(default_factory=dict)
+    last_record_id: int = 0
+    record_count: int = 0
+
+    # Retrieves genotype probabilities for one animal.
+    def genotypes(self, animal_id: int) -> Dict[str, np.ndarray]:
+        position = self.pedigree.index.get(animal_id)
+
+        if position is None:
+            return {}
+        return {condition: state.genotypes[position] for condition, state in self.conditions.items()}
+
+    # Calculates P(affected offspring) per condition for one mating.
+    def pair_risks(self, sire_id: int, dam_id: int, coi: float) -> List[Tuple[str, float]]:
+        """`(condition, probability)` pairs, highest first."""
+
+        sire, dam = self.pedigree.index.get(sire_id), self.pedigree.index.get(dam_id)
+
+        if sire is None or dam is None:
+            return []
+
+        risks = [
+            (condition, float(affected_offspring_probability(state.genotypes[sire], state.genotypes[dam], coi)))
+            for condition, state in self.conditions.items()
+        ]
+        return sorted(risks, key=lambda risk: (-risk[1], risk[0]))
+
+    # Calculates the highest P(affected offspring) for every dam × sire pair.
+    def risk_matrix(self, dam_ids: Sequence[int], sire_ids: Sequence[int], coi: np.ndarray) -> np.ndarray:
+        risk = np.zeros((len(dam_ids), len(sire_ids)))
+
+        if not self.conditions:
+            return risk
+
+        dams = np.array([self.pedigree.index.get(dam_id, -1) for dam_id in dam_ids], dtype=np.int64)
+        sires = np.array([self.pedigree.index.get(sire_id, -1) for sire_id in sire_ids], dtype=np.int64)
+        known = (dams >= 0)[:, None] & (sires >= 0)[None, :]
+
+        for state in self.conditions.values():
+            dam_genotypes = state.genotypes[dams][:, None, :]
+            sire_genotypes = state.genotypes[sires][None, :, :]
+            risk = np.maximum(risk, np.where(known, affected_offspring_probability(sire_genotypes, dam_genotypes, coi), 0.0))
+        return risk
+
+_STATES: "weakref.WeakKeyDictionary[Any, Dict[str, CarrierProbabilities]]" = weakref.WeakKeyDictionary()
+_REFRESH_LOCKS: "weakref.WeakKeyDictionary[Any, Dict[str, threading.Lock]]" = weakref.WeakKeyDictionary()
+_REFRESHES: "weakref.WeakKeyDictionary[Any, Dict[str, threading.Thread]]" = weakref.WeakKeyDictionary()
+_REGISTRY_LOCK = threading.Lock()
+
+# Retrieves the health records of an animal_type that mention hereditary conditions.
+def hereditary_records_query(db: Session, animal_type: str):
+    return (
+        db.query(models.AnimalHealthRecord)
+        .join(models.Animal, models.Animal.id == models.AnimalHealthRecord.animal_id)
+        .filter(models.Animal.animal_type == animal_type, models.AnimalHealthRecord.hereditary_conditions.isnot(None))
+    )
+
+# Retrieves the hereditary-record version of an animal_type.
+def hereditary_record_version(db: Session, animal_type: str) -> Tuple[int, int]:
+    """Count and highest ID of the type's health records that mention hereditary conditions."""
+
+    count, last_id = hereditary_records_query(db, animal_type).with_entities(
+        func.count(models.AnimalHealthRecord.id), func.max(models.AnimalHealthRecord.id)
+    ).one()
+    return int(count or 0), int(last_id or 0)
+
+# Internal helper for latest statuses.
+def _latest_statuses(records: Iterable[Any]) -> Dict[int, Dict[str, str]]:
+    """Latest status per animal and condition; records must be ordered oldest first."""
+
+    statuses: Dict[int, Dict[str, str]] = {}
+
+    for record in records:
+        statuses.setdefault(record.animal_id, {}).update(parse_hereditary_statuses(record.hereditary_conditions))
+    return {animal_id: values for animal_id, values in statuses.items() if values}
+
+# Internal helper for evidence.
+def _evidence(pedigree: PeelingPedigree, statuses: Mapping[int, Mapping[str, str]], condition: str) -> np.ndarray:
+    evidence = np.ones((pedigree.total, 3))
+
+    for animal_id, values in statuses.items():
+        position = pedigree.index.get(animal_id)
+
+        if position is not None and condition in values:
+            evidence[position] = _GENOTYPE_EVIDENCE[values[condition]]
+    return evidence
+
+# Internal helper for build carrier probabilities.
+def _build(db: Session, animal_type: str, epoch: int) -> CarrierProbabilities:
+    animal_ids = [row.id for row in db.query(models.Animal.id).filter(models.Animal.animal_type == animal_type).all()]
+    nodes = get_pedigree_nodes(db, animal_ids, FULL_PEDIGREE_DEPTH)
+    pedigree = PeelingPedigree(nodes, [animal_id for animal_id in animal_ids if nodes.get(animal_id)])
+    count, last_id = hereditary_record_version(db, animal_type)
+    records = (
+        hereditary_records_query(db, animal_type)
+        .filter(models.AnimalHealthRecord.id <= last_id)
+        .order_by(models.AnimalHealthRecord.record_date, models.AnimalHealthRecord.id)
+        .all()
+    )
+    state = CarrierProbabilities(
+        animal_type=animal_type, epoch=epoch, pedigree=pedigree, statuses=_latest_statuses(records),
+        last_record_id=last_id, record_count=count,
+    )
+
+    for condition in sorted({name for values in state.statuses.values() for name in values}):
+        state.conditions[condition] = peel(pedigree, _evidence(pedigree, state.statuses, condition))
+    return state
+
+# Internal helper for with new records.
+def _with_new_records(db: Session, state: CarrierProbabilities, count: int, last_id: int) -> CarrierProbabilities:
+    """
+    Copy of `state` with the evidence of animals with new records re-read
+    and the conditions that changed re-solved. The copy shares the pedigree
+    arrays; `state` itself is left untouched for readers still holding it.
+    """
+
+    touched = [
+        row.animal_id for row in hereditary_records_query(db, state.animal_type)
+        .filter(models.AnimalHealthRecord.id > state.last_record_id, models.AnimalHealthRecord.id <= last_id)
+        .with_entities(models.AnimalHealthRecord.animal_id).distinct().all()
+    ]
+    records = (
+        hereditary_records_query(db, state.animal_type)
+        .filter(models.AnimalHealthRecord.animal_id.in_(touched), models.AnimalHealthRecord.id <= last_id)
+        .order_by(models.AnimalHealthRecord.record_date, models.AnimalHealthRecord.id)
+        .all()
+    )
+    updated = _latest_statuses(records)
+    state = replace(state, statuses=dict(state.statuses), conditions=dict(state.conditions), last_record_id=last_id, record_count=count)
+    changed = set()
+
+    for animal_id in touched:
+        before, after = state.statuses.get(animal_id, {}), updated.get(animal_id, {})
+        changed |= {condition for condition in set(before) | set(after) if before.get(condition) != after.get(condition)}
+
+        if after:
+            state.statuses[animal_id] = after
+
+        else:
+            state.statuses.pop(animal_id, None)
+
+    for condition in sorted(changed):
+        evidence = _evidence(state.pedigree, state.statuses, condition)
+        state.conditions[condition] = peel(state.pedigree, evidence, warm=state.conditions.get(condition))
+    return state
+
+# Internal helper for cached state.
+def _cached_state(bind: Any, animal_type: str) -> Optional[CarrierProbabilities]:
+    with _REGISTRY_LOCK:
+        return _STATES.get(bind, {}).get(animal_type)
+
+# Internal helper for refresh lock.
+def _refresh_lock(bind: Any, animal_type: str) -> threading.Lock:
+    with _REGISTRY_LOCK:
+        return _REFRESH_LOCKS.setdefault(bind, {}).setdefault(animal_type, threading.Lock())
+
+# Internal helper for is current.
+def _is_current(state: CarrierProbabilities, epoch: int, count: int, last_id: int) -> bool:
+    return state.epoch == epoch and state.record_count == count and state.last_record_id == last_id
+
+# Handles refresh carrier probabilities logic for this module.
+def refresh_carrier_probabilities(db: Session, animal_type: str) -> CarrierProbabilities:
+    """
+    Bring the cached state of one engine and animal_type up to date and
+    return it. Rebuilt when the pedigree epoch moves or records disappear;
+    otherwise only the new hereditary records are applied. Refreshes of the
+    same engine and animal_type run one at a time; other types, and readers
+    of `get_carrier_probabilities`, never wait for them. The new state
+    replaces the old one only once it is complete.
+    """
+
+    bind = db.get_bind()
+
+    with _refresh_lock(bind, animal_type):
+        state = _cached_state(bind, animal_type)
+        epoch = get_pedigree_epoch(db, animal_type)
+        count, last_id = hereditary_record_version(db, animal_type)
+
+        if state is not None and _is_current(state, epoch, count, last_id):
+            return state
+
+        if count == 0:
+            state = CarrierProbabilities(animal_type, epoch, PeelingPedigree({}, []))
+
+        elif (
+            state is None or state.epoch != epoch or not state.record_count
+            or count < state.record_count or last_id < state.last_record_id
+        ):
+            state = _build(db, animal_type, epoch)
+
+        else:
+            state = _with_new_records(db, state, count, last_id)
+
+        with _REGISTRY_LOCK:
+            _STATES.setdefault(bind, {})[animal_type] = state
+    return state
+
+# Internal helper for run refresh.
+def _run_refresh(bind: Any, animal_type: str) -> None:
+    db = Session(bind=bind)
+
+    try:
+        refresh_carrier_probabilities(db, animal_type)
+    except Exception:
+        db.rollback()
+        logger.exception("Carrier probability refresh failed for %s; the previous state is kept.", animal_type)
+    finally:
+        db.close()
+
+# Handles schedule carrier refresh logic for this module.
+def schedule_carrier_refresh(bind: Any, animal_type: str) -> threading.Thread:
+    """Start a background refresh on `bind` unless one is already running; returns its thread."""
+
+    with _REGISTRY_LOCK:
+        refreshes = _REFRESHES.setdefault(bind, {})
+        thread = refreshes.get(animal_type)
+
+        if thread is not None and thread.is_alive():
+            return thread
+
+        thread = refreshes[animal_type] = threading.Thread(
+            target=_run_refresh, args=(bind, animal_type), name=f"carrier-refresh-{animal_type}", daemon=True
+        )
+
+    thread.start()
+    return thread
+
+# Retrieves current carrier probabilities for an animal_type.
+def get_carrier_probabilities(db: Session, animal_type: str) -> CarrierProbabilities:
+    """
+    Cached per engine and animal_type. The first call builds the state.
+    After that a stale state (new pedigree epoch or new hereditary records)
+    is still returned while `schedule_carrier_refresh` brings it up to date
+    in its own session, so requests never wait for a rebuild; with
+    `CARRIER_BACKGROUND_REFRESH` off the refresh runs inline. A check costs
+    the epoch read and one aggregate query.
+    """
+
+    bind = db.get_bind()
+    state = _cached_state(bind, animal_type)
+
+    if state is None or not CARRIER_BACKGROUND_REFRESH:
+        return refresh_carrier_probabilities(db, animal_type)
+
+    count, last_id = hereditary_record_version(db, animal_type)
+
+    if not _is_current(state, get_pedigree_epoch(db, animal_type), count, last_id):
+        schedule_carrier_refresh(bind, animal_type)
+    return state
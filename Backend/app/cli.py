@@ -0,0 +1,128 @@
+# Backend/app/cli.py: contains backend logic for the Animal Breed Registry System.
+"""
+Maintenance commands for the registry.
+
+Usage:
+    python -m Backend.app.cli refresh-inbreeding [--animal-type cattle] [--breed Boran]
+    python -m Backend.app.cli refresh-completeness [--animal-type cattle] [--breed Boran]
+    python -m Backend.app.cli rebuild-current-state [--batch-size 1000]
+    python -m Backend.app.cli gene-drop --animal-type cattle [--breed Boran] [--reference-years 5] [--replicates 1000]
+"""
+
+import argparse
+import csv
+import time
+from datetime import date
+from .current_state import rebuild_current_state
+from .database import SessionLocal
+from .gene_dropping import gene_drop_breed
+from .inbreeding import refresh_inbreeding_coefficients
+from .pedigree_completeness import refresh_pedigree_completeness
+
+# Handles refresh inbreeding logic for this module.
+def refresh_inbreeding(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        updated = refresh_inbreeding_coefficients(db, animal_type=args.animal_type, breed=args.breed)
+        print(f"✅ Stored inbreeding coefficients for {updated} animals in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+# Handles refresh completeness logic for this module.
+def refresh_completeness(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        updated = refresh_pedigree_completeness(db, animal_type=args.animal_type, breed=args.breed)
+        print(f"✅ Stored pedigree completeness for {updated} animals in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+# Handles rebuild current state logic for this module.
+def rebuild_state(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        rebuilt = rebuild_current_state(db, batch_size=args.batch_size)
+        print(f"✅ Rebuilt current state for {rebuilt} animals in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+# Handles gene drop logic for this module.
+def gene_drop(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+
+    try:
+        started = time.perf_counter()
+        today = date.today()
+        born_after = date(today.year - args.reference_years, today.month, 1) if args.reference_years else None
+        result = gene_drop_breed(
+            db, animal_type=args.animal_type, breed=args.breed, born_after=born_after,
+            replicates=args.replicates, seed=args.seed,
+        )
+        reference = result.reference_ids
+        print(f"✅ Dropped {result.founder_alleles} founder alleles through {len(result.inbreeding)} animals "
+              f"({result.replicates} replicates) in {time.perf_counter() - started:.2f}s")
+        print(f"   Reference animals:          {len(reference)}")
+        print(f"   Founders:                   {len(result.founder_ids)}")
+        print(f"   Founder equivalents:        {result.founder_equivalents:.2f}")
+        print(f"   Founder genome equivalents: {result.founder_genome_equivalents:.2f}")
+        print(f"   Allele retention:           {result.allele_retention:.1%}")
+        print(f"   Gene diversity:             {result.gene_diversity:.4f}")
+        print(f"   Mean F / F_a (reference):   {sum(result.inbreeding[a] for a in reference) / len(reference):.4f}"
+              f" / {sum(result.ancestral_inbreeding[a] for a in reference) / len(reference):.4f}")
+
+        if args.output:
+            with open(args.output, "w", newline="") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(["animal_db_id", "reference", "inbreeding", "ancestral_inbreeding"])
+                reference_set = set(reference)
+
+                for animal_id, value in result.inbreeding.items():
+                    writer.writerow([
+                        animal_id, int(animal_id in reference_set), round(value, 6), round(result.ancestral_inbreeding[animal_id], 6)
+                    ])
+            print(f"   Per-animal F and F_a written to {args.output}")
+    finally:
+        db.close()
+
+# Internal helper for build parser.
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m Backend.app.cli", description="Animal Breed Registry maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh = commands.add_parser("refresh-inbreeding", help="Recompute and store F for every animal (Meuwissen–Luo)")
+    refresh.add_argument("--animal-type", help="Only this species, e.g. cattle")
+    refresh.add_argument("--breed", help="Only this breed")
+    refresh.set_defaults(handler=refresh_inbreeding)
+
+    completeness = commands.add_parser("refresh-completeness", help="Recompute and store pedigree completeness, ECG and PEC for every animal")
+    completeness.add_argument("--animal-type", help="Only this species, e.g. cattle")
+    completeness.add_argument("--breed", help="Only this breed")
+    completeness.set_defaults(handler=refresh_completeness)
+
+    rebuild = commands.add_parser("rebuild-current-state", help="Backfill animal_current_state from history tables")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    rebuild.set_defaults(handler=rebuild_state)
+
+    drop = commands.add_parser("gene-drop", help="Estimate founder genome equivalents, allele retention and F_a by gene dropping")
+    drop.add_argument("--animal-type", required=True, help="Species, e.g. cattle")
+    drop.add_argument("--breed", help="Only this breed")
+    drop.add_argument("--reference-years", type=int, default=5, help="Reference population: animals born in the last N years (0 = all)")
+    drop.add_argument("--replicates", type=int, default=1000)
+    drop.add_argument("--seed", type=int)
+    drop.add_argument("--output", help="Write per-animal F and F_a to this CSV file")
+    drop.set_defaults(handler=gene_drop)
+    return parser
+
+# Handles main logic for this module.
+def main(argv=None) -> None:
+    args = _build_parser().parse_args(argv)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from datetime import datetime, timezone
-from . import models, schemas
+from typing import Dict, Optional
+from . import models, schemas, pedigree, current_state, genetics_cache, pedigree_changes, pedigree_completeness
 from .utils.core import generate_animal_id
 
 MEASUREMENT_FIELDS = {
@@ -123,13 +124,19 @@ def create_animal(db: Session, animal: schemas.AnimalCreate, breeder_id: int):
     db.add(db_animal)
     db.flush()
     _create_initial_snapshot_records(db, db_animal, animal)
+    current_state.refresh_current_state(db, [db_animal.id])
+    epochs = pedigree.bump_pedigree_epoch(db, [db_animal.animal_type])
     db.commit()
     db.refresh(db_animal)
+    pedigree.record_animal_saved(db, db_animal, epochs)
+    pedigree_completeness.update_pedigree_completeness(db, [db_animal.id])
     return db_animal
 
 # Updates an existing animal record with validated values.
 def update_animal(db: Session, db_animal: models.Animal, animal: schemas.AnimalUpdate):
     update_data = animal.model_dump(exclude_unset=True)
+    previous_parents = (db_animal.sire_id, db_animal.dam_id)
+    previous_type = db_animal.animal_type
 
     if "sire_id" in update_data:
         sire_public_id = update_data.pop("sire_id")
@@ -152,9 +159,21 @@ def update_animal(db: Session, db_animal: models.Animal, animal: schemas.AnimalU
     if snapshot_data:
         snapshot_payload = type("SnapshotPayload", (), snapshot_data | {"date_of_birth": datetime.now(timezone.utc).date()})()
         _create_initial_snapshot_records(db, db_animal, snapshot_payload, record_date=datetime.now(timezone.utc).date())
+        current_state.refresh_current_state(db, [db_animal.id])
+
+    parents_changed = (db_animal.sire_id, db_animal.dam_id) != previous_parents
+    epochs: Dict[str, int] = {}
+
+    if parents_changed or db_animal.animal_type != previous_type:
+        epochs = pedigree.bump_pedigree_epoch(db, [previous_type, db_animal.animal_type])
+
+    if parents_changed:
+        # Same transaction as the epoch bump: no worker can reload the new epoch with old values.
+        pedigree_changes.invalidate_descendant_cone(db, [db_animal.id], commit=False)
 
     db.commit()
     db.refresh(db_animal)
+    pedigree.record_animal_saved(db, db_animal, epochs)
     return db_animal
 
 # Creates and stores a new animal measurement record.
@@ -171,6 +190,7 @@ def create_animal_measurement(db: Session, db_animal: models.Animal, measurement
     db_animal.updated_at = datetime.now(timezone.utc)
     db.add(db_measurement)
     db.add(db_animal)
+    current_state.refresh_current_state(db, [db_animal.id])
     db.commit()
     db.refresh(db_measurement)
     db.refresh(db_animal)
@@ -224,12 +244,29 @@ def create_breeding_event(db: Session, breeding_event: schemas.BreedingEventCrea
     )
 
     db.add(db_event)
+    _touch_breeding_parents(db, db_event.sire_id, db_event.dam_id)
 
     db.commit()
 
     db.refresh(db_event)
+    genetics_cache.record_breeding_event_written(db, db_event.sire_id, db_event.dam_id)
     return db_event
 
+# Internal helper for touch breeding parents.
+def _touch_breeding_parents(db: Session, *animal_ids: Optional[int]) -> None:
+    """
+    Bump `updated_at` on the animals a breeding event touches, in the
+    caller's transaction. Cached sire components are stamped with it, so
+    every worker's cache sees the event, not just this process's.
+    """
+
+    ids = sorted({animal_id for animal_id in animal_ids if animal_id})
+
+    if ids:
+        db.query(models.Animal).filter(models.Animal.id.in_(ids)).update(
+            {models.Animal.updated_at: datetime.now(timezone.utc)}, synchronize_session="fetch"
+        )
+
 # Internal helper for latest first.
 def _latest_first(query):
     return query.order_by(text('record_date DESC'), text('id DESC')).limit(100).all()
@@ -240,6 +277,7 @@ def create_health_record(db: Session, db_animal: models.Animal, payload: schemas
     db_animal.updated_at = datetime.now(timezone.utc)
     db.add(rec)
     db.add(db_animal)
+    current_state.refresh_current_state(db, [db_animal.id])
     db.commit()
     db.refresh(rec)
     return rec
@@ -250,6 +288,7 @@ def create_fertility_record(db: Session, db_animal: models.Animal, payload: sche
     db_animal.updated_at = datetime.now(timezone.utc)
     db.add(rec)
     db.add(db_animal)
+    current_state.refresh_current_state(db, [db_animal.id])
     db.commit()
     db.refresh(rec)
     return rec
@@ -260,6 +299,7 @@ def create_production_record(db: Session, db_animal: models.Animal, payload: sch
     db_animal.updated_at = datetime.now(timezone.utc)
     db.add(rec)
     db.add(db_animal)
+    current_state.refresh_current_state(db, [db_animal.id])
     db.commit()
     db.refresh(rec)
     return rec
@@ -270,6 +310,7 @@ def create_offspring_record(db: Session, db_animal: models.Animal, payload: sche
     db_animal.updated_at = datetime.now(timezone.utc)
     db.add(rec)
     db.add(db_animal)
+    current_state.refresh_current_state(db, [db_animal.id])
     db.commit()
     db.refresh(rec)
     return rec
@@ -295,6 +336,7 @@ def get_animal_full_profile(db: Session, db_animal: models.Animal):
 # Updates an existing breeding event record with validated values.
 def update_breeding_event(db: Session, db_event: models.BreedingEvent, payload: schemas.BreedingEventUpdate):
     data = payload.model_dump(exclude_unset=True)
+    previous_animals = (db_event.sire_id, db_event.dam_id)
 
     if data.get("outcome") == "live_birth":
         data.setdefault("status", "completed")
@@ -313,4 +355,8 @@ def update_breeding_event(db: Session, db_event: models.BreedingEvent, payload:
         setattr(db_event, field, value)
 
     db_event.updated_at = datetime.now(timezone.utc)
-    db.add(db_event); db.commit(); db.refresh(db_event); return db_event
+    db.add(db_event)
+    _touch_breeding_parents(db, db_event.sire_id, db_event.dam_id, *previous_animals)
+    db.commit(); db.refresh(db_event)
+    genetics_cache.record_breeding_event_written(db, db_event.sire_id, db_event.dam_id, *previous_animals)
+    return db_event
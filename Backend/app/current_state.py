@@ -0,0 +1,149 @@
+# Backend/app/current_state.py: contains backend logic for the Animal Breed Registry System.
+"""
+Maintenance of the denormalized `animal_current_state` table.
+
+The history tables (measurements, health, fertility, production, offspring)
+stay the source of truth. Every write path in crud and the breeding service
+calls `refresh_current_state` before committing, so the summary row changes
+in the same transaction as the record it summarises. Readers (Animal
+properties, genetics profiles, reports) then read one row per animal instead
+of loading and scanning every history row.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from . import models
+
+HEALTH_STATE_FIELDS = ["health_status", "vaccination_status", "disease_history", "hereditary_conditions", "vet_notes"]
+FERTILITY_STATE_FIELDS = ["fertility_status", "age_at_first_service_months", "services_per_conception", "birth_interval_days"]
+PRODUCTION_STATE_FIELDS = ["production_type", "daily_milk_yield", "milk_fat_percent", "egg_count_annual"]
+OFFSPRING_STATE_FIELDS = ["offspring_count", "offspring_survival_rate", "offspring_quality_score"]
+
+# Retrieves the newest history row per animal.
+def latest_rows(
+    db: Session,
+    model: Any,
+    animal_ids: List[int],
+    date_column: str = "record_date",
+    partition_by: Tuple[str, ...] = (),
+) -> List[Any]:
+    """
+    Newest row per animal (and per `partition_by` columns) in one query, using
+    ROW_NUMBER() OVER (PARTITION BY animal_id ... ORDER BY date DESC, id DESC).
+    """
+
+    ranked = (
+        select(
+            model.id.label("row_id"),
+            func.row_number().over(
+                partition_by=[model.animal_id] + [getattr(model, column) for column in partition_by],
+                order_by=[getattr(model, date_column).desc(), model.id.desc()],
+            ).label("row_rank"),
+        )
+        .where(model.animal_id.in_(animal_ids))
+        .subquery()
+    )
+    return (
+        db.query(model)
+        .join(ranked, ranked.c.row_id == model.id)
+        .filter(ranked.c.row_rank == 1)
+        .all()
+    )
+
+# Internal helper for copy fields.
+def _copy_fields(state: models.AnimalCurrentState, row: Any, fields: List[str]) -> None:
+    for field in fields:
+        setattr(state, field, getattr(row, field))
+
+# Calculates current-state rows from history without saving them.
+def compute_current_states(db: Session, animal_ids: Iterable[int]) -> Dict[int, models.AnimalCurrentState]:
+    """
+    Return transient `AnimalCurrentState` objects for `animal_ids`, built with
+    five window queries regardless of how many animals are passed. Values
+    follow the same rules as the legacy Animal properties.
+    """
+
+    animal_ids = list(dict.fromkeys(animal_ids))
+
+    if not animal_ids:
+        return {}
+
+    measurements: Dict[int, Dict[str, Any]] = defaultdict(dict)
+
+    for row in latest_rows(db, models.AnimalMeasurement, animal_ids, "measured_at", ("measurement_type",)):
+        measurements[row.animal_id][row.measurement_type] = row
+
+    health = {row.animal_id: row for row in latest_rows(db, models.AnimalHealthRecord, animal_ids)}
+    fertility = {row.animal_id: row for row in latest_rows(db, models.AnimalFertilityRecord, animal_ids)}
+    production = {row.animal_id: row for row in latest_rows(db, models.AnimalProductionRecord, animal_ids)}
+    offspring = {row.animal_id: row for row in latest_rows(db, models.AnimalOffspringRecord, animal_ids)}
+    now = datetime.now(timezone.utc)
+    states: Dict[int, models.AnimalCurrentState] = {}
+
+    for animal_id in animal_ids:
+        latest_by_type = measurements.get(animal_id, {})
+
+        # Internal helper for measurement value.
+        def measurement_value(*measurement_types: str):
+            rows = [latest_by_type[t] for t in measurement_types if t in latest_by_type]
+            return max(rows, key=lambda r: (r.measured_at, r.id)).value if rows else None
+
+        state = models.AnimalCurrentState(
+            animal_id=animal_id,
+            latest_measured_at=max((row.measured_at for row in latest_by_type.values()), default=None),
+            birth_weight=measurement_value("birth_weight"),
+            current_weight=measurement_value("current_weight", "weight"),
+            weaning_weight=measurement_value("weaning_weight"),
+            mature_weight=measurement_value("mature_weight"),
+            body_condition_score=measurement_value("body_condition_score"),
+            average_daily_gain=measurement_value("average_daily_gain"),
+            updated_at=now,
+        )
+
+        for rows, fields, date_field in (
+            (health, HEALTH_STATE_FIELDS, "health_record_date"),
+            (fertility, FERTILITY_STATE_FIELDS, "fertility_record_date"),
+            (production, PRODUCTION_STATE_FIELDS, "production_record_date"),
+            (offspring, OFFSPRING_STATE_FIELDS, "offspring_record_date"),
+        ):
+            row = rows.get(animal_id)
+
+            if row is not None:
+                _copy_fields(state, row, fields)
+                setattr(state, date_field, row.record_date)
+
+        production_row = production.get(animal_id)
+
+        if production_row is not None and production_row.average_daily_gain is not None:
+            state.average_daily_gain = production_row.average_daily_gain
+
+        states[animal_id] = state
+    return states
+
+# Updates current-state rows for animals whose history changed.
+def refresh_current_state(db: Session, animal_ids: Iterable[int]) -> None:
+    """
+    Recompute and stage the current-state rows for `animal_ids`. Pending
+    history rows are flushed first; the caller commits, so the summary lands
+    in the same transaction as the record that changed it.
+    """
+
+    db.flush()
+
+    for state in compute_current_states(db, animal_ids).values():
+        db.merge(state)
+
+# Handles rebuild current state logic for this module.
+def rebuild_current_state(db: Session, batch_size: int = 1000) -> int:
+    """Backfill every animal's current-state row from history. Returns the count."""
+
+    animal_ids = [row.id for row in db.query(models.Animal.id).order_by(models.Animal.id).all()]
+
+    for start in range(0, len(animal_ids), batch_size):
+        refresh_current_state(db, animal_ids[start:start + batch_size])
+        db.commit()
+    return len(animal_ids)
@@ -0,0 +1,216 @@
+# Backend/app/gene_dropping.py: contains backend logic for the Animal Breed Registry System.
+"""
+Monte Carlo gene dropping over the registered pedigree.
+
+Pedigree completeness counts known ancestors; it says nothing about how
+much founder diversity has survived. Gene dropping answers that by
+simulation. Every unknown parent slot (one per missing sire or dam) gets
+a unique founder allele. The alleles are then passed down the pedigree in
+topological order, and each parent transmits one of its two alleles at
+random. Replicates run side by side as the last axis of an
+`(animals, 2, replicates)` label array. All animals of one generation are
+filled with a single fancy-indexing step, so the Python loop runs once per
+generation, not once per animal or per replicate.
+
+From the simulated genotypes of a reference population (usually the most
+recent cohort) it estimates:
+
+* allele retention: the share of founder alleles still present, overall
+  and per founder;
+* founder equivalents f_e = 1 / Σ p_i², from expected founder
+  contributions p_i;
+* founder genome equivalents f_ge = 1 / (2 Σ q_a²), from the simulated
+  allele frequencies q_a (Lacy 1989), and the matching gene diversity
+  1 − Σ q_a²;
+* for every animal, the simulated inbreeding F (both alleles identical by
+  descent) and Ballou's ancestral inbreeding F_a. F_a is the probability
+  that an allele has already been IBD in at least one ancestor. Each
+  allele carries a flag that is set when it passes through a parent whose
+  two alleles are identical.
+
+Replicates are processed in chunks so the label array stays within
+`max_cells` entries.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Mapping, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from . import models
+from .inbreeding import FULL_PEDIGREE_DEPTH, known_parents, pedigree_closure, topological_order
+from .pedigree import PedigreeNode, get_pedigree_nodes
+
+DEFAULT_REPLICATES = 1000
+DEFAULT_MAX_CELLS = 20_000_000
+
+@dataclass
+
+# Defines the gene drop result structure used by this module.
+class GeneDropResult:
+    """Diversity estimates for a reference population plus per-animal F and F_a."""
+
+    replicates: int
+    reference_ids: List[int]
+    founder_ids: List[int]
+    founder_alleles: int
+    allele_retention: float
+    founder_equivalents: float
+    founder_genome_equivalents: float
+    gene_diversity: float
+    founder_contributions: Dict[int, float] = field(default_factory=dict)
+    founder_retention: Dict[int, float] = field(default_factory=dict)
+    inbreeding: Dict[int, float] = field(default_factory=dict)
+    ancestral_inbreeding: Dict[int, float] = field(default_factory=dict)
+
+# Internal helper for pedigree arrays.
+def _pedigree_arrays(nodes: Mapping[int, PedigreeNode], order: List[int]):
+    """Parent positions (−1 when unknown) and generation number for each animal in `order`."""
+
+    position = {animal_id: index for index, animal_id in enumerate(order)}
+    parents = np.full((len(order), 2), -1, dtype=np.int64)
+    generation = np.zeros(len(order), dtype=np.int64)
+
+    for index, animal_id in enumerate(order):
+        node = nodes.get(animal_id)
+        registered = set(known_parents(node, nodes))
+
+        for slot, parent_id in enumerate((node.sire_id, node.dam_id)):
+            if parent_id in registered and parent_id in position:
+                parents[index, slot] = position[parent_id]
+
+        known = parents[index][parents[index] >= 0]
+
+        if known.size:
+            generation[index] = generation[known].max() + 1
+    return parents, generation
+
+# Calculates founder diversity statistics by gene dropping.
+def gene_drop(
+    nodes: Mapping[int, PedigreeNode],
+    reference_ids: Sequence[int],
+    replicates: int = DEFAULT_REPLICATES,
+    seed: Optional[int] = None,
+    max_cells: int = DEFAULT_MAX_CELLS,
+) -> GeneDropResult:
+    """
+    Drop founder alleles through the ancestors of `reference_ids` and
+    summarise what reaches them. F and F_a are reported for every animal
+    in that ancestry. Raises ValueError when no reference animal is in
+    `nodes`.
+    """
+
+    reference_ids = [animal_id for animal_id in dict.fromkeys(reference_ids) if nodes.get(animal_id)]
+
+    if not reference_ids:
+        raise ValueError("No reference animals found in the pedigree")
+
+    order = topological_order(nodes, pedigree_closure(nodes, reference_ids))
+    parents, generation = _pedigree_arrays(nodes, order)
+    size = len(order)
+
+    # One founder allele label per unknown parent slot; `allele_owner` maps a label to its founder.
+    unknown = parents < 0
+    labels = np.full((size, 2), -1, dtype=np.int64)
+    labels[unknown] = np.arange(int(unknown.sum()))
+    allele_count = int(unknown.sum())
+    allele_owner = np.repeat(np.arange(size), 2)[unknown.ravel()]
+    founder_positions = np.unique(allele_owner)
+
+    levels = [np.flatnonzero(generation == level) for level in range(int(generation.max()) + 1)]
+    index_of = {animal_id: index for index, animal_id in enumerate(order)}
+    reference = np.array([index_of[animal_id] for animal_id in reference_ids])
+    chunk = max(1, min(replicates, max_cells // max(2 * size, allele_count, 1)))
+    rng = np.random.default_rng(seed)
+
+    ibd_sum = np.zeros(size)
+    ancestral_sum = np.zeros(size)
+    retained_sum = np.zeros(allele_count)
+    frequency_sum = np.zeros(allele_count)
+    homozygosity_sum = 0.0
+    done = 0
+
+    while done < replicates:
+        width = min(chunk, replicates - done)
+        columns = np.arange(width)
+        alleles = np.empty((size, 2, width), dtype=np.int64)
+        flagged = np.zeros((size, 2, width), dtype=bool)
+        alleles[unknown] = labels[unknown][:, None]
+
+        for level in levels:
+            for slot in (0, 1):
+                children = level[parents[level, slot] >= 0]
+
+                if not children.size:
+                    continue
+
+                parent = parents[children, slot][:, None]
+                picked = rng.integers(0, 2, size=(children.size, width))
+                parent_ibd = alleles[parent[:, 0], 0] == alleles[parent[:, 0], 1]
+                alleles[children, slot] = alleles[parent, picked, columns]
+                flagged[children, slot] = flagged[parent, picked, columns] | parent_ibd
+
+        ibd_sum += (alleles[:, 0] == alleles[:, 1]).sum(axis=1)
+        ancestral_sum += flagged.sum(axis=(1, 2)) / 2
+
+        # Allele counts in the reference population, one row per replicate.
+        sample = alleles[reference].transpose(2, 0, 1).reshape(width, -1)
+        counts = np.bincount((sample + (columns * allele_count)[:, None]).ravel(), minlength=width * allele_count)
+        frequencies = counts.reshape(width, allele_count) / sample.shape[1]
+        retained_sum += (frequencies > 0).sum(axis=0)
+        frequency_sum += frequencies.sum(axis=0)
+        homozygosity_sum += float((frequencies ** 2).sum())
+        done += width
+
+    founder_index = np.searchsorted(founder_positions, allele_owner)
+    contributions = np.bincount(founder_index, weights=frequency_sum / replicates, minlength=len(founder_positions))
+    alleles_per_founder = np.bincount(founder_index, minlength=len(founder_positions))
+    retention = np.bincount(founder_index, weights=retained_sum / replicates, minlength=len(founder_positions)) / alleles_per_founder
+    homozygosity = homozygosity_sum / replicates
+    return GeneDropResult(
+        replicates=replicates,
+        reference_ids=reference_ids,
+        founder_ids=[order[position] for position in founder_positions],
+        founder_alleles=allele_count,
+        allele_retention=float(retained_sum.sum() / (replicates * allele_count)),
+        founder_equivalents=float(1.0 / np.sum(contributions ** 2)),
+        founder_genome_equivalents=float(1.0 / (2 * homozygosity)),
+        gene_diversity=float(1.0 - homozygosity),
+        founder_contributions={order[p]: float(v) for p, v in zip(founder_positions, contributions)},
+        founder_retention={order[p]: float(v) for p, v in zip(founder_positions, retention)},
+        inbreeding={animal_id: float(ibd_sum[index] / replicates) for index, animal_id in enumerate(order)},
+        ancestral_inbreeding={animal_id: float(ancestral_sum[index] / replicates) for index, animal_id in enumerate(order)},
+    )
+
+# Calculates gene-dropping statistics for a whole breed.
+def gene_drop_breed(
+    db: Session,
+    *,
+    animal_type: str,
+    breed: Optional[str] = None,
+    born_after: Optional[date] = None,
+    replicates: int = DEFAULT_REPLICATES,
+    seed: Optional[int] = None,
+) -> GeneDropResult:
+    """
+    Gene dropping for every animal of `animal_type` (and `breed`) born on or
+    after `born_after`, which form the reference population, through their
+    full registered ancestry.
+    """
+
+    query = db.query(models.Animal.id).filter(models.Animal.animal_type == animal_type)
+
+    if breed:
+        query = query.filter(models.Animal.breed == breed)
+
+    if born_after:
+        query = query.filter(models.Animal.date_of_birth >= born_after)
+
+    reference_ids = [row.id for row in query.order_by(models.Animal.id).all()]
+
+    if not reference_ids:
+        raise ValueError("No animals match the reference population")
+
+    nodes = get_pedigree_nodes(db, reference_ids, FULL_PEDIGREE_DEPTH)
+    return gene_drop(nodes, reference_ids, replicates=replicates, seed=seed)
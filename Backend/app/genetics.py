@@ -12,12 +12,20 @@ Implements:
 """
 
 from __future__ import annotations
+import heapq
+import time
 from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import date
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from sqlalchemy.orm import Session
 from . import models
+from .carrier_probabilities import CarrierProbabilities, get_carrier_probabilities
+from .current_state import compute_current_states
+from .genetics_candidates import SireCandidateFilter, candidate_sires_query
+from .genetics_cache import animal_result_version, get_pedigree_result_cache, get_sire_cache, memoize_by_epoch, pedigree_result_version, sire_version
+from .pedigree import PedigreeNode, ancestor_graph, get_pedigree_nodes
+from .pedigree_completeness import COMPLETENESS_DEPTH, indexed_completeness, line_completeness, maccluer_pec
 
 @dataclass
 
@@ -64,34 +72,25 @@ class AnimalBreedingProfile:
     def __getattr__(self, name: str) -> Any:
         return getattr(self.animal, name)
 
-# Internal helper for latest record.
-def _latest_record(db: Session, model: Any, animal_id: int, date_column: str = "record_date") -> Any:
-    """Return newest normalized record for an animal, or None."""
-
-    column = getattr(model, date_column)
-    return (
-        db.query(model)
-        .filter(model.animal_id == animal_id)
-        .order_by(column.desc(), model.id.desc())
-        .first()
-    )
-
-# Internal helper for value or fallback.
-def _value_or_fallback(value: Any, fallback: Any) -> Any:
-    return fallback if value is None else value
-
-# Handles build animal breeding profile logic for this module.
-def build_animal_breeding_profile(animal: models.Animal, db: Optional[Session] = None) -> AnimalBreedingProfile:
-    """
-    Build the scoring read-model from normalized tables.
-
-    Priority order:
-    1. Latest normalized history record.
-    2. Backward-compatible value stored directly on animals.
-    3. None, which lowers confidence but does not break scoring.
-    """
-
-    profile = AnimalBreedingProfile(
+PROFILE_STATE_FIELDS = [
+    "birth_weight", "current_weight", "weaning_weight", "mature_weight", "body_condition_score", "average_daily_gain",
+    "health_status", "vaccination_status", "disease_history", "hereditary_conditions", "vet_notes",
+    "fertility_status", "age_at_first_service_months", "services_per_conception", "birth_interval_days",
+    "offspring_count", "offspring_survival_rate", "offspring_quality_score",
+    "production_type", "daily_milk_yield", "milk_fat_percent", "egg_count_annual",
+]
+
+STATE_DATA_SOURCES = [
+    ("latest_measured_at", "animal_measurements"),
+    ("health_record_date", "animal_health_records"),
+    ("fertility_record_date", "animal_fertility_records"),
+    ("production_record_date", "animal_production_records"),
+    ("offspring_record_date", "animal_offspring_records"),
+]
+
+# Internal helper for legacy profile.
+def _legacy_profile(animal: models.Animal) -> AnimalBreedingProfile:
+    return AnimalBreedingProfile(
         animal=animal,
         birth_weight=getattr(animal, "birth_weight", None),
         current_weight=getattr(animal, "current_weight", None),
@@ -118,75 +117,89 @@ def build_animal_breeding_profile(animal: models.Animal, db: Optional[Session] =
         data_sources=["animals_legacy_fields"],
     )
 
-    if db is None:
-        return profile
-
-    measurement = (
-        db.query(models.AnimalMeasurement)
-        .filter(models.AnimalMeasurement.animal_id == animal.id)
-        .order_by(models.AnimalMeasurement.measured_at.desc(), models.AnimalMeasurement.id.desc())
-        .first()
-    )
-
-    if measurement:
-        if (measurement.measurement_type or "weight").lower() == "weight":
-            profile.current_weight = measurement.value
-
-        profile.data_sources.append("animal_measurements")
+# Handles build animal breeding profile logic for this module.
+def build_animal_breeding_profile(animal: models.Animal, db: Optional[Session] = None) -> AnimalBreedingProfile:
+    """
+    Build the scoring read-model from normalized tables.
 
-    health = _latest_record(db, models.AnimalHealthRecord, animal.id)
+    Priority order:
+    1. Latest normalized history record.
+    2. Backward-compatible value stored directly on animals.
+    3. None, which lowers confidence but does not break scoring.
 
-    if health:
-        profile.health_status = _value_or_fallback(health.health_status, profile.health_status)
-        profile.vaccination_status = _value_or_fallback(health.vaccination_status, profile.vaccination_status)
-        profile.disease_history = _value_or_fallback(health.disease_history, profile.disease_history)
-        profile.hereditary_conditions = _value_or_fallback(health.hereditary_conditions, profile.hereditary_conditions)
-        profile.vet_notes = _value_or_fallback(health.vet_notes, profile.vet_notes)
-        profile.data_sources.append("animal_health_records")
+    With a session this is `build_animal_breeding_profiles` for one animal.
+    """
 
-    fertility = _latest_record(db, models.AnimalFertilityRecord, animal.id)
+    if db is None:
+        return _legacy_profile(animal)
+    return build_animal_breeding_profiles([animal], db)[animal.id]
 
-    if fertility:
-        profile.fertility_status = _value_or_fallback(fertility.fertility_status, profile.fertility_status)
-        profile.age_at_first_service_months = _value_or_fallback(fertility.age_at_first_service_months, profile.age_at_first_service_months)
-        profile.services_per_conception = _value_or_fallback(fertility.services_per_conception, profile.services_per_conception)
-        profile.birth_interval_days = _value_or_fallback(fertility.birth_interval_days, profile.birth_interval_days)
-        profile.data_sources.append("animal_fertility_records")
+# Handles build animal breeding profiles logic for this module.
+def build_animal_breeding_profiles(animals: List[models.Animal], db: Session) -> Dict[int, AnimalBreedingProfile]:
+    """
+    Build `{animal_db_id: AnimalBreedingProfile}` for many animals with a
+    fixed number of queries: one read of `animal_current_state` and one
+    breeding-event scan, however many animals are passed. Animals without a
+    current-state row yet are summarised from history with window queries.
+    """
 
-    production = _latest_record(db, models.AnimalProductionRecord, animal.id)
+    animal_ids = list(dict.fromkeys(animal.id for animal in animals))
 
-    if production:
-        profile.production_type = _value_or_fallback(production.production_type, profile.production_type)
-        profile.daily_milk_yield = _value_or_fallback(production.daily_milk_yield, profile.daily_milk_yield)
-        profile.milk_fat_percent = _value_or_fallback(production.milk_fat_percent, profile.milk_fat_percent)
-        profile.egg_count_annual = _value_or_fallback(production.egg_count_annual, profile.egg_count_annual)
-        profile.average_daily_gain = _value_or_fallback(production.average_daily_gain, profile.average_daily_gain)
-        profile.data_sources.append("animal_production_records")
+    if not animal_ids:
+        return {}
 
-    offspring = _latest_record(db, models.AnimalOffspringRecord, animal.id)
+    states = {
+        state.animal_id: state
+        for state in db.query(models.AnimalCurrentState).filter(models.AnimalCurrentState.animal_id.in_(animal_ids)).all()
+    }
+    missing = [animal_id for animal_id in animal_ids if animal_id not in states]
 
-    if offspring:
-        profile.offspring_count = _value_or_fallback(offspring.offspring_count, profile.offspring_count)
-        profile.offspring_survival_rate = _value_or_fallback(offspring.offspring_survival_rate, profile.offspring_survival_rate)
-        profile.offspring_quality_score = _value_or_fallback(offspring.offspring_quality_score, profile.offspring_quality_score)
-        profile.data_sources.append("animal_offspring_records")
+    if missing:
+        states.update(compute_current_states(db, missing))
 
+    events_by_animal: Dict[int, List[Any]] = defaultdict(list)
     breeding_events = (
         db.query(models.BreedingEvent)
-        .filter((models.BreedingEvent.sire_id == animal.id) | (models.BreedingEvent.dam_id == animal.id))
+        .filter(models.BreedingEvent.sire_id.in_(animal_ids) | models.BreedingEvent.dam_id.in_(animal_ids))
         .order_by(models.BreedingEvent.breeding_date.desc(), models.BreedingEvent.id.desc())
         .all()
     )
 
-    if breeding_events:
-        profile.last_breeding_status = breeding_events[0].status
-        profile.last_breeding_outcome = breeding_events[0].outcome
-        failure_outcomes = {"failed_conception", "miscarriage", "stillbirth", "abortion", "failed"}
-        success_outcomes = {"live_birth", "successful", "delivered"}
-        profile.failed_breedings = sum(1 for event in breeding_events if (event.outcome or event.status or "").lower() in failure_outcomes)
-        profile.successful_breedings = sum(1 for event in breeding_events if (event.outcome or event.status or "").lower() in success_outcomes)
-        profile.data_sources.append("breeding_events")
-    return profile
+    for event in breeding_events:
+        for animal_id in {event.sire_id, event.dam_id}:
+            if animal_id is not None:
+                events_by_animal[animal_id].append(event)
+
+    profiles: Dict[int, AnimalBreedingProfile] = {}
+
+    for animal in animals:
+        if animal.id in profiles:
+            continue
+
+        state = states[animal.id]
+        profile = AnimalBreedingProfile(
+            animal=animal,
+            **{field: getattr(state, field) for field in PROFILE_STATE_FIELDS},
+            data_sources=["animals_legacy_fields"],
+        )
+
+        for date_field, source in STATE_DATA_SOURCES:
+            if getattr(state, date_field) is not None:
+                profile.data_sources.append(source)
+
+        events = events_by_animal.get(animal.id)
+
+        if events:
+            profile.last_breeding_status = events[0].status
+            profile.last_breeding_outcome = events[0].outcome
+            failure_outcomes = {"failed_conception", "miscarriage", "stillbirth", "abortion", "failed"}
+            success_outcomes = {"live_birth", "successful", "delivered"}
+            profile.failed_breedings = sum(1 for event in events if (event.outcome or event.status or "").lower() in failure_outcomes)
+            profile.successful_breedings = sum(1 for event in events if (event.outcome or event.status or "").lower() in success_outcomes)
+            profile.data_sources.append("breeding_events")
+
+        profiles[animal.id] = profile
+    return profiles
 
 GESTATION_DAYS: Dict[str, int] = {
     "cattle":  283,
@@ -213,35 +226,12 @@ def build_pedigree_graph(
     """
     Walk the pedigree tree upward from `root_id` up to `max_depth` generations.
     Returns {animal_db_id: (sire_db_id | None, dam_db_id | None)}.
-    Uses BFS to avoid recursion limits on deep pedigrees.
+    Reads parentage from the in-memory pedigree index, or from a single
+    recursive CTE when the index is disabled, instead of querying the
+    database once per ancestor.
     """
 
-    graph: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
-    queue = [(root_id, 0)]
-    visited: set = set()
-
-    while queue:
-        animal_id, depth = queue.pop(0)
-
-        if animal_id in visited or depth > max_depth:
-            continue
-
-        visited.add(animal_id)
-
-        animal = db.query(models.Animal).filter(models.Animal.id == animal_id).first()
-
-        if not animal:
-            continue
-
-        graph[animal_id] = (animal.sire_id, animal.dam_id)
-
-        if depth < max_depth:
-            if animal.sire_id:
-                queue.append((animal.sire_id, depth + 1))
-
-            if animal.dam_id:
-                queue.append((animal.dam_id, depth + 1))
-    return graph
+    return ancestor_graph(get_pedigree_nodes(db, [root_id], max_depth), root_id, max_depth)
 
 # Internal helper for get ancestors with paths.
 def _get_ancestors_with_paths(
@@ -254,8 +244,10 @@ def _get_ancestors_with_paths(
     """
     Recursively collect ancestors of `animal_id`.
     Returns {ancestor_id: [list of path lengths to this ancestor]}.
-    Multiple paths to the same ancestor indicate a common ancestor — the
-    key ingredient for computing the inbreeding coefficient.
+
+    This enumerates every path and grows as 2^depth. The engine uses
+    `PedigreePathCounter` instead; this version is kept as the reference
+    implementation for tests and benchmarks.
     """
 
     if animal_id is None or depth > max_depth:
@@ -280,12 +272,175 @@ def _get_ancestors_with_paths(
             result[ancestor].extend(paths)
     return result
 
+# Defines the pedigree path counter structure used by this module.
+class PedigreePathCounter:
+    """
+    Memoized path-count histograms over a pedigree mapping.
+
+    `histogram(animal_id, max_depth)` returns `{ancestor_id: counts}` where
+    `counts[L]` is the number of distinct pedigree paths of length L from the
+    animal to that ancestor. Path counts are pushed one generation at a time,
+    so an ancestor reached through many paths is expanded once per depth
+    rather than once per path, and results are memoized per
+    (animal, max_depth).
+    """
+
+    # Internal helper for init.
+    def __init__(self, pedigree: Mapping[int, PedigreeNode]) -> None:
+        self.pedigree = pedigree
+        self._memo: Dict[Tuple[int, int], Dict[int, List[int]]] = {}
+
+    # Handles has histogram logic for this module.
+    def has_histogram(self, animal_id: int, max_depth: int) -> bool:
+        return (animal_id, max_depth) in self._memo
+
+    # Handles histogram logic for this module.
+    def histogram(self, animal_id: Optional[int], max_depth: int = 8) -> Dict[int, List[int]]:
+        if animal_id is None or max_depth < 0:
+            return {}
+
+        key = (animal_id, max_depth)
+        cached = self._memo.get(key)
+
+        if cached is not None:
+            return cached
+
+        hist: Dict[int, List[int]] = {}
+        frontier: Dict[int, int] = {animal_id: 1}
+
+        for length in range(max_depth + 1):
+            next_frontier: Dict[int, int] = defaultdict(int)
+
+            for node_id, count in frontier.items():
+                row = hist.get(node_id)
+
+                if row is None:
+                    row = [0] * (max_depth + 1)
+                    hist[node_id] = row
+
+                row[length] += count
+                node = self.pedigree.get(node_id) if length < max_depth else None
+
+                if node:
+                    if node.sire_id is not None:
+                        next_frontier[node.sire_id] += count
+
+                    if node.dam_id is not None:
+                        next_frontier[node.dam_id] += count
+
+            if not next_frontier:
+                break
+
+            frontier = next_frontier
+
+        self._memo[key] = hist
+        return hist
+
+# Internal helper for weighted path sum.
+def _weighted_path_sum(counts: List[int], max_depth: int) -> int:
+    """Return Σ counts[L] × 2^(max_depth − L) as an exact integer."""
+
+    return sum(count << (max_depth - length) for length, count in enumerate(counts) if count)
+
+# Calculates the inbreeding coefficient from two path histograms.
+def coi_from_histograms(
+    sire_hist: Dict[int, List[int]],
+    dam_hist: Dict[int, List[int]],
+    max_depth: int,
+) -> float:
+    """
+    Wright's sum over common ancestors, computed from path histograms.
+
+    Σ_L1 Σ_L2 c1[L1] c2[L2] 0.5^(L1+L2+1) factorises into the product of two
+    weighted sums per ancestor. Integer arithmetic keeps the result identical
+    to summing every path pair individually.
+    """
+
+    if len(dam_hist) < len(sire_hist):
+        sire_hist, dam_hist = dam_hist, sire_hist
+
+    total = 0
+
+    for ancestor_id, sire_counts in sire_hist.items():
+        dam_counts = dam_hist.get(ancestor_id)
+
+        if dam_counts is None:
+            continue
+
+        total += _weighted_path_sum(sire_counts, max_depth) * _weighted_path_sum(dam_counts, max_depth)
+    return total / (1 << (2 * max_depth + 1))
+
+# Defines the pedigree traversal structure used by this module.
+class PedigreeTraversal:
+    """
+    One walk of the pedigrees a request needs, shared by every consumer.
+
+    Parentage is read once (pedigree index or one recursive CTE) and each
+    animal's path histogram is built once at `max_depth`. COI, pedigree
+    completeness at any depth up to `max_depth` and the ancestor graph are
+    all read from those histograms, so the sire and dam pedigrees are not
+    walked again per metric.
+    """
+
+    # Internal helper for init.
+    def __init__(
+        self,
+        db: Optional[Session],
+        animal_ids: List[int],
+        max_depth: int = 8,
+        pedigree: Optional[Mapping[int, PedigreeNode]] = None,
+        counter: Optional[PedigreePathCounter] = None,
+    ) -> None:
+        self.max_depth = max_depth
+        self.pedigree = pedigree if pedigree is not None else get_pedigree_nodes(db, animal_ids, max_depth)
+        self.counter = counter or PedigreePathCounter(self.pedigree)
+
+    # Handles histogram logic for this module.
+    def histogram(self, animal_id: Optional[int], max_depth: Optional[int] = None) -> Dict[int, List[int]]:
+        """
+        Path histogram covering at least `max_depth` generations. The
+        full-depth histogram is returned whenever it has been built, so rows
+        may be longer than requested; readers only look at the prefix.
+        """
+
+        depth = self.max_depth if max_depth is None else max_depth
+
+        if animal_id is not None and depth <= self.max_depth and self.counter.has_histogram(animal_id, self.max_depth):
+            return self.counter.histogram(animal_id, self.max_depth)
+        return self.counter.histogram(animal_id, depth)
+
+    # Calculates the projected COI of a sire × dam pairing.
+    def coi(self, sire_id: int, dam_id: int, max_depth: Optional[int] = None) -> float:
+        depth = self.max_depth if max_depth is None else max_depth
+        F = coi_from_histograms(self.counter.histogram(sire_id, depth), self.counter.histogram(dam_id, depth), depth)
+        return round(min(F, 1.0), 6)
+
+    # Handles completeness logic for this module.
+    def completeness(self, animal_id: int, max_depth: int = 4) -> Dict[str, Any]:
+        return _completeness_from_histogram(self.histogram(animal_id, max_depth), max_depth, self.pedigree)
+
+    # Builds the ancestor graph of one animal.
+    def graph(self, animal_id: int, max_depth: Optional[int] = None) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+        """Same result as `pedigree.ancestor_graph`, read off the histogram's ancestors."""
+
+        depth = self.max_depth if max_depth is None else max_depth
+        graph: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+
+        for ancestor_id, counts in self.histogram(animal_id, depth).items():
+            node = self.pedigree.get(ancestor_id)
+
+            if node and any(counts[:depth + 1]):
+                graph[ancestor_id] = (node.sire_id, node.dam_id)
+        return graph
+
 # Calculates inbreeding coefficient for the requested data.
 def compute_inbreeding_coefficient(
     sire_id: int,
     dam_id: int,
     db: Session,
     max_depth: int = 8,
+    pedigree: Optional[Mapping[int, PedigreeNode]] = None,
+    traversal: Optional[PedigreeTraversal] = None,
 ) -> float:
     """
     Calculate Wright's Coefficient of Inbreeding (F) for a hypothetical
@@ -295,33 +450,116 @@ def compute_inbreeding_coefficient(
     where the sum is over all common ancestors A, L1 is the number of
     generations from the sire to A, L2 from the dam to A, and F_A is
     the inbreeding coefficient of ancestor A (assumed 0 for simplicity
-    beyond max_depth).
+    beyond max_depth). For the exact value over the whole registered
+    pedigree, see `inbreeding.offspring_inbreeding`.
 
     Returns a value in [0.0, 1.0].  Multiply by 100 for a percentage.
+
+    `pedigree` may carry nodes preloaded for many animals at once; otherwise
+    the sire and dam pedigrees are fetched together. Pass a `traversal` to
+    share the walk with pedigree completeness. With a session, results are
+    memoized per pedigree epoch of the dam's animal_type.
+    """
+
+    if traversal is None:
+        traversal = PedigreeTraversal(db, [sire_id, dam_id], max_depth, pedigree=pedigree)
+
+    # Internal helper for compute.
+    def compute() -> float:
+        return traversal.coi(sire_id, dam_id, max_depth)
+
+    if db is None:
+        return compute()
+
+    dam = traversal.pedigree.get(dam_id)
+    return memoize_by_epoch(db, ("coi", sire_id, dam_id, max_depth), compute, dam.animal_type if dam else None)
+
+# Defines the coancestry sweep structure used by this module.
+class CoancestrySweep:
     """
+    One dam scored against many candidate sires.
+
+    The dam's weighted path sums W_d(A) = Σ_L c[L] 2^(D−L) are built once.
+    A sire's own histogram is itself plus its parents' histograms one
+    generation shorter, so its Wright sum splits into one term for the sire
+    as an ancestor of the dam plus a dot product with each parent. Those dot
+    products are memoized per parent, so half-brothers share their sire's
+    term and full brothers cost nothing extra. Results are exactly equal to
+    `compute_inbreeding_coefficient`.
+    """
+
+    # Internal helper for init.
+    def __init__(
+        self,
+        pedigree: Mapping[int, PedigreeNode],
+        dam_id: int,
+        max_depth: int = 8,
+        counter: Optional[PedigreePathCounter] = None,
+    ) -> None:
+        self.pedigree = pedigree
+        self.max_depth = max_depth
+        self.counter = counter or PedigreePathCounter(pedigree)
+        self.dam_weights = {
+            ancestor_id: _weighted_path_sum(counts, max_depth)
+            for ancestor_id, counts in self.counter.histogram(dam_id, max_depth).items()
+        }
+        self._parent_terms: Dict[int, int] = {}
+        self._preloaded: Dict[int, float] = {}
+
+    # Stores COI values computed elsewhere, e.g. by worker processes.
+    def preload(self, values: Mapping[int, float]) -> None:
+        self._preloaded.update(values)
+
+    # Handles has preloaded logic for this module.
+    def has_preloaded(self, sire_id: int) -> bool:
+        return sire_id in self._preloaded
+
+    # Internal helper for parent term.
+    def _parent_term(self, parent_id: Optional[int]) -> int:
+        """Σ_A W_p(A; D−1) × W_d(A; D) for one parent of a candidate sire."""
+
+        if parent_id is None or self.max_depth < 1:
+            return 0
 
-    sire_graph = build_pedigree_graph(db, sire_id, max_depth)
-    dam_graph = build_pedigree_graph(db, dam_id,  max_depth)
-    sire_ancestors = _get_ancestors_with_paths(sire_id, sire_graph, 0, max_depth)
-    dam_ancestors = _get_ancestors_with_paths(dam_id,  dam_graph,  0, max_depth)
-    common = set(sire_ancestors.keys()) & set(dam_ancestors.keys())
+        cached = self._parent_terms.get(parent_id)
 
-    F = 0.0
+        if cached is None:
+            depth = self.max_depth - 1
+            cached = 0
 
-    for ancestor_id in common:
-        sire_paths = sire_ancestors[ancestor_id]
-        dam_paths = dam_ancestors[ancestor_id]
+            for ancestor_id, counts in self.counter.histogram(parent_id, depth).items():
+                dam_weight = self.dam_weights.get(ancestor_id)
 
-        for l1 in sire_paths:
-            for l2 in dam_paths:
-                F += (0.5) ** (l1 + l2 + 1)
-    return round(min(F, 1.0), 6)
+                if dam_weight:
+                    cached += _weighted_path_sum(counts, depth) * dam_weight
+
+            self._parent_terms[parent_id] = cached
+        return cached
+
+    # Calculates the projected COI for one candidate sire.
+    def coi(self, sire_id: int) -> float:
+        preloaded = self._preloaded.get(sire_id)
+
+        if preloaded is not None:
+            return preloaded
+
+        node = self.pedigree.get(sire_id)
+        total = (self.dam_weights.get(sire_id, 0) << self.max_depth)
+
+        if node:
+            total += self._parent_term(node.sire_id) + self._parent_term(node.dam_id)
+
+        F = total / (1 << (2 * self.max_depth + 1))
+        return round(min(F, 1.0), 6)
 
 # Handles analyze pedigree completeness logic for this module.
 def analyze_pedigree_completeness(
     animal_id: int,
     db: Session,
     max_depth: int = 4,
+    pedigree: Optional[Mapping[int, PedigreeNode]] = None,
+    traversal: Optional[PedigreeTraversal] = None,
+    version: Optional[int] = None,
 
 ) -> Dict[str, Any]:
     """
@@ -330,6 +568,12 @@ def analyze_pedigree_completeness(
     COI is only as reliable as the recorded parentage. Missing ancestors can
     make a pairing look less related than it really is, so this helper returns
     a conservative warning that can be shown in the UI.
+
+    Animals with a stored record (pedigree_completeness.py) are a lookup
+    up to COMPLETENESS_DEPTH generations. Otherwise slot counts are read
+    from the animal's path histogram; a `traversal` that already holds it
+    for COI is reused. `version` is the animal_type's result version when
+    the caller already read it for this request; otherwise it is read here.
     """
 
     if not animal_id:
@@ -340,40 +584,80 @@ def analyze_pedigree_completeness(
             "expected_ancestor_slots": sum(2 ** generation for generation in range(1, max_depth + 1)),
             "completeness_percent": 0.0,
             "missing_ancestor_slots": sum(2 ** generation for generation in range(1, max_depth + 1)),
+            "known_by_generation": [0] * max_depth,
+            "equivalent_generations": 0.0,
             "warning": "No animal selected; pedigree completeness cannot be assessed.",
         }
 
-    known_slots = 0
-    expected_slots = 0
-    missing_slots = 0
-    deepest_generation = 0
-    queue = [(animal_id, 0)]
+    if db is not None and version is None:
+        version = animal_result_version(db, animal_id)
 
-    while queue:
-        current_id, generation = queue.pop(0)
+    if db is not None and max_depth <= COMPLETENESS_DEPTH:
+        stored = indexed_completeness(db, animal_id)
 
-        if generation >= max_depth:
-            continue
+        if stored is not None:
+            return _completeness_summary(stored.known_slots, stored.expected_slots, max_depth)
+
+    if traversal is None:
+        traversal = PedigreeTraversal(db, [animal_id], max_depth, pedigree=pedigree)
+
+    if db is None:
+        return traversal.completeness(animal_id, max_depth)
+
+    node = traversal.pedigree.get(animal_id)
+    cached = memoize_by_epoch(
+        db,
+        ("completeness", animal_id, max_depth),
+        lambda: traversal.completeness(animal_id, max_depth),
+        node.animal_type if node else None,
+        version=version,
+    )
+    return dict(cached)
+
+# Internal helper for completeness from histogram.
+def _completeness_from_histogram(
+    histogram: Dict[int, List[int]],
+    max_depth: int,
+    pedigree: Mapping[int, PedigreeNode],
+) -> Dict[str, Any]:
+    """
+    Ancestor-slot counts up to `max_depth` generations. Every path to a
+    recorded ancestor in generation g < max_depth contributes that
+    ancestor's two parent slots, so the counts equal a path-by-path walk.
+    Rows longer than `max_depth + 1` (a deeper COI histogram) are fine.
+    """
 
-        animal = db.query(models.Animal).filter(models.Animal.id == current_id).first()
+    known_slots = [0] * max_depth
+    expected_slots = [0] * max_depth
+
+    for ancestor_id, counts in histogram.items():
+        animal = pedigree.get(ancestor_id)
 
         if not animal:
             continue
 
-        next_generation = generation + 1
-
-        for parent_id in (animal.sire_id, animal.dam_id):
-            expected_slots += 1
+        for generation, count in enumerate(counts[:max_depth]):
+            if count:
+                expected_slots[generation] += 2 * count
+                known_slots[generation] += count * sum(1 for parent_id in (animal.sire_id, animal.dam_id) if parent_id)
+    return _completeness_summary(known_slots, expected_slots, max_depth)
 
-            if parent_id:
-                known_slots += 1
-                deepest_generation = max(deepest_generation, next_generation)
-                queue.append((parent_id, next_generation))
+# Internal helper for equivalent generations.
+def _equivalent_generations(known_by_generation: List[int]) -> float:
+    return sum(count / 2 ** generation for generation, count in enumerate(known_by_generation, start=1))
 
-            else:
-                missing_slots += 1
+# Internal helper for completeness summary.
+def _completeness_summary(known_slots, expected_slots, max_depth: int) -> Dict[str, Any]:
+    """
+    Completeness result from slot counts per generation (parents first).
+    `equivalent_generations` is Σ known_g / 2^g over the requested generations.
+    """
 
-    completeness = (known_slots / expected_slots) if expected_slots else 0.0
+    known_by_generation = [int(count) for count in known_slots[:max_depth]]
+    known = sum(known_by_generation)
+    expected = sum(expected_slots[:max_depth])
+    deepest_generation = max((generation for generation, count in enumerate(known_by_generation, start=1) if count), default=0)
+    completeness = (known / expected) if expected else 0.0
 
     warning = None
 
@@ -385,10 +669,12 @@ def analyze_pedigree_completeness(
     return {
         "generations_requested": max_depth,
         "generations_available": deepest_generation,
-        "known_ancestor_slots": known_slots,
-        "expected_ancestor_slots": expected_slots,
+        "known_ancestor_slots": known,
+        "expected_ancestor_slots": expected,
         "completeness_percent": round(completeness * 100, 1),
-        "missing_ancestor_slots": missing_slots,
+        "missing_ancestor_slots": expected - known,
+        "known_by_generation": known_by_generation,
+        "equivalent_generations": round(_equivalent_generations(known_by_generation), 4),
         "warning": warning,
     }
 
@@ -398,12 +684,27 @@ def combine_pedigree_completeness(
     dam_id: int,
     db: Session,
     max_depth: int = 8,
+    pedigree: Optional[Mapping[int, PedigreeNode]] = None,
+    dam_completeness: Optional[Dict[str, Any]] = None,
+    traversal: Optional[PedigreeTraversal] = None,
+    version: Optional[int] = None,
 
 ) -> Dict[str, Any]:
-    """Return pair-level pedigree completeness for a proposed mating."""
+    """
+    Return pair-level pedigree completeness for a proposed mating.
+
+    `dam_completeness` may carry the dam's own result at the same depth when
+    one dam is compared against many sires. `pec` is the MacCluer index and
+    `equivalent_generations` the equivalent complete generations of the
+    offspring, both over `max_depth` generations. `version` is passed on to
+    both parents' lookups.
+    """
+
+    if traversal is None:
+        traversal = PedigreeTraversal(db, [sire_id, dam_id], max_depth, pedigree=pedigree)
 
-    sire = analyze_pedigree_completeness(sire_id, db, max_depth=max_depth)
-    dam = analyze_pedigree_completeness(dam_id, db, max_depth=max_depth)
+    sire = analyze_pedigree_completeness(sire_id, db, max_depth=max_depth, traversal=traversal, version=version)
+    dam = dam_completeness or analyze_pedigree_completeness(dam_id, db, max_depth=max_depth, traversal=traversal, version=version)
     expected = sire["expected_ancestor_slots"] + dam["expected_ancestor_slots"]
     known = sire["known_ancestor_slots"] + dam["known_ancestor_slots"]
     missing = sire["missing_ancestor_slots"] + dam["missing_ancestor_slots"]
@@ -419,6 +720,10 @@ def combine_pedigree_completeness(
 
     if pair_warning and pair_warning not in warnings:
         warnings.insert(0, pair_warning)
+
+    # The offspring's lines are the sire's and dam's pedigrees one generation further back.
+    sire_line = line_completeness(sire["known_by_generation"] if sire_id else None, max_depth)
+    dam_line = line_completeness(dam["known_by_generation"] if dam_id else None, max_depth)
     return {
         "generations_requested": max_depth,
         "generations_available": min(sire["generations_available"], dam["generations_available"]),
@@ -426,6 +731,11 @@ def combine_pedigree_completeness(
         "expected_ancestor_slots": expected,
         "completeness_percent": round(completeness * 100, 1),
         "missing_ancestor_slots": missing,
+        "equivalent_generations": round(
+            1.0 + (_equivalent_generations(sire["known_by_generation"][:max_depth - 1])
+                   + _equivalent_generations(dam["known_by_generation"][:max_depth - 1])) / 2, 4
+        ),
+        "pec": round(maccluer_pec(sire_line, dam_line), 4),
         "sire": sire,
         "dam": dam,
         "warnings": warnings,
@@ -464,6 +774,9 @@ SCORING_WEIGHTS = {
     "confidence": 0.05,
 }
 
+# COI depth used for candidates scored after a `budget_ms` deadline has passed.
+APPROXIMATE_COI_DEPTH = 3
+
 HIGH_RISK_RELATED_PAIRS = {
     "same_animal",
     "sire_is_dam_parent",
@@ -513,8 +826,13 @@ def _has_negative_keyword(value: Optional[str], keywords: List[str]) -> bool:
     return any(keyword in text for keyword in keywords)
 
 # Handles detect relationship risks logic for this module.
-def detect_relationship_risks(sire: models.Animal, dam: models.Animal) -> List[str]:
-    """Return explainable close-relationship flags for the proposed pair."""
+def detect_relationship_risks(sire: Any, dam: Any) -> List[str]:
+    """
+    Return explainable close-relationship flags for the proposed pair.
+
+    Accepts ORM animals or pedigree-index nodes; only `id`, `sire_id` and
+    `dam_id` are read, so no database access is needed.
+    """
 
     flags: List[str] = []
 
@@ -684,7 +1002,15 @@ def score_data_confidence(animal: Any) -> Tuple[float, List[str]]:
     return round(_clamp(confidence), 4), missing
 
 # Handles build risk penalties logic for this module.
-def build_risk_penalties(sire: Any, dam: Any, coi: float, relationship_flags: List[str]) -> Tuple[float, List[str]]:
+def build_risk_penalties(
+    sire: Any,
+    dam: Any,
+    coi: float,
+    relationship_flags: List[str],
+    sire_penalties: Optional[List[Tuple[float, str]]] = None,
+    carrier_risks: Optional[List[Tuple[str, float]]] = None,
+
+) -> Tuple[float, List[str]]:
     penalties = 0.0
     risk_flags: List[str] = []
 
@@ -705,29 +1031,135 @@ def build_risk_penalties(sire: Any, dam: Any, coi: float, relationship_flags: Li
             penalties += 0.25
             risk_flags.append(flag.replace("_", " ").capitalize())
 
+    if carrier_risks:
+        condition, probability = carrier_risks[0]
+
+        if probability >= 0.25:
+            penalties += 0.35
+            risk_flags.append(
+                f"High hereditary risk: {probability:.0%} chance of an affected offspring ({condition}); avoid this pairing."
+            )
+
+        elif probability >= 0.02:
+            penalties += 0.10
+            risk_flags.append(
+                f"{probability:.0%} chance of an affected offspring ({condition}); confirm carrier status before mating."
+            )
+
+    if sire_penalties is None:
+        sire_penalties = build_sire_risk_penalties(sire)
+
+    for penalty, flag in sire_penalties:
+        penalties += penalty
+        risk_flags.append(flag)
+    return _clamp(penalties, 0, 0.90), risk_flags
+
+# Handles build sire risk penalties logic for this module.
+def build_sire_risk_penalties(sire: Any) -> List[Tuple[float, str]]:
+    """Penalties that depend on the sire's own records only, in application order."""
+
+    penalties: List[Tuple[float, str]] = []
+
     if _has_negative_keyword(sire.hereditary_conditions, ["affected", "carrier", "positive", "defect"]):
-        penalties += 0.35
-        risk_flags.append("Sire has recorded hereditary-condition risk.")
+        penalties.append((0.35, "Sire has recorded hereditary-condition risk."))
 
     if _has_negative_keyword(sire.health_status, ["poor", "sick", "unfit", "quarantined"]):
-        penalties += 0.20
-        risk_flags.append("Sire health status is not suitable for breeding.")
+        penalties.append((0.20, "Sire health status is not suitable for breeding."))
 
     if _has_negative_keyword(sire.fertility_status, ["poor", "infertile"]):
-        penalties += 0.20
-        risk_flags.append("Sire fertility status is poor.")
+        penalties.append((0.20, "Sire fertility status is poor."))
 
     failed_breedings = getattr(sire, "failed_breedings", 0) or 0
     successful_breedings = getattr(sire, "successful_breedings", 0) or 0
 
     if failed_breedings >= 3 and successful_breedings == 0:
-        penalties += 0.20
-        risk_flags.append("Sire has repeated failed breeding outcomes recorded.")
+        penalties.append((0.20, "Sire has repeated failed breeding outcomes recorded."))
 
     elif failed_breedings > successful_breedings and failed_breedings >= 2:
-        penalties += 0.10
-        risk_flags.append("Sire has more failed than successful breeding outcomes.")
-    return _clamp(penalties, 0, 0.90), risk_flags
+        penalties.append((0.10, "Sire has more failed than successful breeding outcomes."))
+    return penalties
+
+@dataclass
+
+# Defines the sire components structure used by this module.
+class SireComponents:
+    """
+    Score components that depend on the sire alone and can be cached per sire.
+    Holds plain values only, so entries outlive the session that built them.
+    """
+
+    scores: Dict[str, float]
+    missing_data: List[str]
+    penalties: List[Tuple[float, str]]
+    data_sources: List[str]
+    last_breeding_status: Optional[str] = None
+    last_breeding_outcome: Optional[str] = None
+
+# Handles build sire components logic for this module.
+def build_sire_components(profile: AnimalBreedingProfile) -> SireComponents:
+    confidence_score, missing_data = score_data_confidence(profile)
+    return SireComponents(
+        scores={
+            "performance": score_performance(profile),
+            "health": score_health(profile),
+            "fertility": score_fertility(profile),
+            "offspring": score_offspring(profile),
+            "confidence": confidence_score,
+        },
+        missing_data=missing_data,
+        penalties=build_sire_risk_penalties(profile),
+        data_sources=list(profile.data_sources),
+        last_breeding_status=profile.last_breeding_status,
+        last_breeding_outcome=profile.last_breeding_outcome,
+    )
+
+# Calculates the best final score a sire could reach with any dam.
+def sire_score_upper_bound(sire_components: SireComponents) -> float:
+    """
+    Final score with COI = 0 and no COI or relationship penalties. It follows
+    the same float operations as `evaluate_pair`, so it is never below the
+    score the sire actually receives.
+    """
+
+    scores = {"genetic_diversity": score_genetic_diversity(0.0), **sire_components.scores}
+    weighted_score = sum(scores[key] * weight for key, weight in SCORING_WEIGHTS.items())
+    penalties = 0.0
+
+    for penalty, _ in sire_components.penalties:
+        penalties += penalty
+    return _clamp(weighted_score - _clamp(penalties, 0, 0.90))
+
+# Retrieves sire components from the cache, building any that are missing.
+def get_sire_components(
+    sires: List[models.Animal],
+    db: Session,
+    extra_profiles: Optional[List[models.Animal]] = None,
+) -> Tuple[Dict[int, SireComponents], Dict[int, AnimalBreedingProfile]]:
+    """
+    Return `{sire_db_id: SireComponents}` for `sires`, loading profiles only
+    for sires whose cached entry is missing or stale. Animals in
+    `extra_profiles` (for example the dam) are profiled in the same batch;
+    their profiles are returned as the second element.
+    """
+
+    cache = get_sire_cache(db)
+    components: Dict[int, SireComponents] = {}
+    stale: List[models.Animal] = []
+
+    for sire in sires:
+        cached = cache.get(sire.id, sire_version(sire))
+
+        if cached is None:
+            stale.append(sire)
+
+        else:
+            components[sire.id] = cached
+
+    profiles = build_animal_breeding_profiles(list(extra_profiles or []) + stale, db)
+
+    for sire in stale:
+        components[sire.id] = cache.put(sire.id, sire_version(sire), build_sire_components(profiles[sire.id]))
+    return components, profiles
 
 # Handles recommendation level logic for this module.
 def recommendation_level(final_score: float, confidence_score: float, risk_flags: List[str]) -> str:
@@ -760,27 +1192,81 @@ def explain_recommendation(scores: Dict[str, float], risk_flags: List[str], miss
         parts.append(f"Missing data reduces confidence: {', '.join(missing_data[:4])}.")
     return " ".join(parts)
 
+@dataclass
+
+# Defines the dam context structure used by this module.
+class DamContext:
+    """Dam-side work computed once and shared by every candidate sire."""
+
+    profile: AnimalBreedingProfile
+    completeness: Dict[str, Any]
+    coancestry: CoancestrySweep
+    carriers: Optional[CarrierProbabilities] = None
+    version: Optional[int] = None
+
+# Builds the shared dam-side context for a ranking pass.
+def build_dam_context(
+    dam: models.Animal,
+    db: Session,
+    pedigree: Mapping[int, PedigreeNode],
+    max_depth: int = 8,
+    profile: Optional[AnimalBreedingProfile] = None,
+    version: Optional[int] = None,
+) -> DamContext:
+    traversal = PedigreeTraversal(db, [dam.id], max_depth, pedigree=pedigree)
+    coancestry = CoancestrySweep(pedigree, dam.id, max_depth, counter=traversal.counter)
+    return DamContext(
+        profile=profile or build_animal_breeding_profile(dam, db),
+        completeness=analyze_pedigree_completeness(dam.id, db, max_depth=min(max_depth, 4), traversal=traversal, version=version),
+        coancestry=coancestry,
+        carriers=get_carrier_probabilities(db, dam.animal_type),
+        version=version,
+    )
+
 # Handles evaluate pair logic for this module.
-def evaluate_pair(sire: models.Animal, dam: models.Animal, db: Session, max_depth: int = 6) -> dict:
-    coi = compute_inbreeding_coefficient(sire.id, dam.id, db, max_depth)
+def evaluate_pair(
+    sire: models.Animal,
+    dam: models.Animal,
+    db: Session,
+    max_depth: int = 6,
+    pedigree: Optional[Mapping[int, PedigreeNode]] = None,
+    dam_context: Optional[DamContext] = None,
+    sire_components: Optional[SireComponents] = None,
+
+) -> dict:
+    if dam_context is None:
+        traversal = PedigreeTraversal(db, [sire.id, dam.id], max_depth, pedigree=pedigree)
+        coi = compute_inbreeding_coefficient(sire.id, dam.id, db, max_depth, traversal=traversal)
+        dam_profile = build_animal_breeding_profile(dam, db)
+        dam_completeness = None
+        carriers = get_carrier_probabilities(db, dam.animal_type)
+        version = pedigree_result_version(db, dam.animal_type)
+
+    else:
+        # Sires share the sweep's histograms; the dam's were built with it.
+        traversal = PedigreeTraversal(
+            db, [sire.id, dam.id], max_depth, pedigree=pedigree or dam_context.coancestry.pedigree, counter=dam_context.coancestry.counter
+        )
+        coi = dam_context.coancestry.coi(sire.id)
+        dam_profile = dam_context.profile
+        dam_completeness = dam_context.completeness
+        carriers = dam_context.carriers or get_carrier_probabilities(db, dam.animal_type)
+        version = dam_context.version
+
     classification = classify_coi(coi)
     relationship_flags = detect_relationship_risks(sire, dam)
-    pedigree_completeness = combine_pedigree_completeness(sire.id, dam.id, db, max_depth=min(max_depth, 4))
-    sire_profile = build_animal_breeding_profile(sire, db)
-    dam_profile = build_animal_breeding_profile(dam, db)
-    confidence_score, missing_data = score_data_confidence(sire_profile)
-
-    scores = {
-        "genetic_diversity": score_genetic_diversity(coi),
-        "performance": score_performance(sire_profile),
-        "health": score_health(sire_profile),
-        "fertility": score_fertility(sire_profile),
-        "offspring": score_offspring(sire_profile),
-        "confidence": confidence_score,
-    }
-
+    pedigree_completeness = combine_pedigree_completeness(
+        sire.id, dam.id, db, max_depth=min(max_depth, 4), dam_completeness=dam_completeness, traversal=traversal, version=version
+    )
+    sire_components = sire_components or build_sire_components(build_animal_breeding_profile(sire, db))
+    confidence_score = sire_components.scores["confidence"]
+    missing_data = list(sire_components.missing_data)
+    scores = {"genetic_diversity": score_genetic_diversity(coi), **sire_components.scores}
     weighted_score = sum(scores[key] * weight for key, weight in SCORING_WEIGHTS.items())
-    penalty_score, risk_flags = build_risk_penalties(sire_profile, dam_profile, coi, relationship_flags)
+    carrier_risks = carriers.pair_risks(sire.id, dam.id, coi)
+    penalty_score, risk_flags = build_risk_penalties(
+        sire, dam_profile, coi, relationship_flags, sire_penalties=sire_components.penalties, carrier_risks=carrier_risks
+    )
 
     for warning in pedigree_completeness.get("warnings", []):
         if warning and warning not in risk_flags:
@@ -801,14 +1287,18 @@ def evaluate_pair(sire: models.Animal, dam: models.Animal, db: Session, max_dept
         "confidence_score": round(confidence_score * 100, 1),
         "penalty_score": round(penalty_score * 100, 1),
         "risk_flags": risk_flags,
+        "hereditary_risk": [
+            {"condition": condition, "affected_offspring_probability": round(probability, 4)}
+            for condition, probability in carrier_risks if probability >= 0.001
+        ],
         "missing_data": missing_data,
-        "data_sources": sire_profile.data_sources,
+        "data_sources": list(sire_components.data_sources),
         "pedigree_completeness": pedigree_completeness,
         "pedigree_depth_analyzed": pedigree_completeness["generations_requested"],
         "pedigree_depth_available": pedigree_completeness["generations_available"],
         "pedigree_completeness_percent": pedigree_completeness["completeness_percent"],
-        "last_breeding_status": sire_profile.last_breeding_status,
-        "last_breeding_outcome": sire_profile.last_breeding_outcome,
+        "last_breeding_status": sire_components.last_breeding_status,
+        "last_breeding_outcome": sire_components.last_breeding_outcome,
         "recommendation_level": recommendation_level(final_score, confidence_score, risk_flags),
         "explanation": explain_recommendation(scores, risk_flags, missing_data),
         "final_score": round(final_score, 4),
@@ -820,6 +1310,10 @@ def recommend_sires(
     db: Session,
     top_n: int = 10,
     max_depth: int = 8,
+    stats: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    budget_ms: Optional[float] = None,
+    filters: Optional[SireCandidateFilter] = None,
 
 ) -> List[dict]:
     """
@@ -827,40 +1321,186 @@ def recommend_sires(
     breeding decision model. The score combines projected COI/genetic diversity,
     measurable performance, health, fertility, offspring evidence, and data
     confidence, then subtracts explainable risk penalties.
+
+    This is `iter_sire_recommendations` run to completion; see it for the
+    search strategy, the `budget_ms` anytime mode and candidate `filters`.
+    When `stats` is given it receives the final event's search statistics.
+    """
+
+    events = iter_sire_recommendations(
+        dam_id, db, top_n=top_n, max_depth=max_depth, workers=workers, budget_ms=budget_ms, filters=filters
+    )
+
+    for event in events:
+        if event["event"] == "final":
+            if stats is not None:
+                stats.update(event["search_stats"])
+            return event["recommendations"]
+    return []
+
+# Handles iter sire recommendations logic for this module.
+def iter_sire_recommendations(
+    dam_id: int,
+    db: Session,
+    top_n: int = 10,
+    max_depth: int = 8,
+    workers: Optional[int] = None,
+    budget_ms: Optional[float] = None,
+    filters: Optional[SireCandidateFilter] = None,
+
+) -> Iterator[dict]:
     """
+    Rank sires for `dam_id`, yielding progress events as the search runs:
+
+    - `{"event": "start", "candidates": n, "top_n": k}` once the pool is known;
+    - `{"event": "candidate", "evaluated": i, "candidates": n, "recommendation": {...}}`
+      for every sire scored, in evaluation order (not final rank order);
+    - `{"event": "final", "recommendations": [...], "search_stats": {...}}` last.
+
+    The pool is every male of the dam's animal_type that passes `filters`,
+    selected in SQL by `genetics_candidates.candidate_sires_query`.
+    Recommendation dicts have the `evaluate_pair` shape plus sire and farm
+    identifiers. Candidates are visited in order of their best reachable
+    score and kept in a size-`top_n` heap; once a sire's upper bound cannot
+    beat the heap's weakest entry, it and every remaining sire are skipped
+    without computing COI. The final list is identical to scoring and sorting
+    every candidate.
+
+    Large pools compute COI on `workers` processes (default
+    GENETICS_WORKERS, see genetics_parallel.py) in growing batches taken in
+    bound order; the ranking is unchanged.
+
+    With `budget_ms`, exact COI is computed in bound order (best sire-only
+    scores first) until the budget is spent; remaining candidates are scored
+    with COI traced only APPROXIMATE_COI_DEPTH generations, which can only
+    under-count shared ancestry. Every recommendation carries `coi_exact`
+    and `coi_depth`; `search_stats` reports how many sires were scored
+    exactly, `exact_fraction` of the pool, and whether the ranking as a
+    whole is `exact`.
+    """
+
+    from .genetics_parallel import open_coi_executor
 
     dam = db.query(models.Animal).filter(models.Animal.id == dam_id).first()
 
-    if not dam:
-        return []
+    started = time.perf_counter()
+
+    if not dam or top_n <= 0:
+        yield {"event": "final", "recommendations": [], "search_stats": _search_stats(0, 0, 0)}
+        return
+
+    sires = candidate_sires_query(db, dam, filters).all()
+    yield {"event": "start", "candidates": len(sires), "top_n": top_n}
+
+    # The epoch check comes first: it reloads a stale index, so the sweep below
+    # never stores COI from old parentage under the new epoch.
+    coi_version = pedigree_result_version(db, dam.animal_type)
+    result_cache = get_pedigree_result_cache(db)
 
-    sires = (
+    # One pedigree load covers the dam and every candidate sire.
+    pedigree = get_pedigree_nodes(db, [dam.id] + [sire.id for sire, _ in sires], max_depth)
+    components, profiles = get_sire_components([sire for sire, _ in sires], db, extra_profiles=[dam])
+    dam_context = build_dam_context(dam, db, pedigree, max_depth, profile=profiles[dam.id], version=coi_version)
 
-        db.query(models.Animal, models.Breeder)
-        .join(models.Breeder, models.Breeder.id == models.Animal.breeder_id, isouter=True)
+    # Best reachable ranking key per sire: COI = 0 and no pair penalties.
+    candidates = []
 
-        .filter(
-            models.Animal.gender == "male",
-            models.Animal.animal_type == dam.animal_type,
-            models.Animal.id != dam_id,
+    for index, (sire, breeder) in enumerate(sires):
+        sire_components = components[sire.id]
+        best_key = (
+            round(sire_score_upper_bound(sire_components), 4),
+            round(sire_components.scores["confidence"] * 100, 1),
+            0.0,
+            -index,
         )
+        candidates.append((best_key, index))
 
-        .all()
-    )
+    candidates.sort(reverse=True)
+    top: List[Tuple[Tuple[float, float, float, int], dict]] = []
+    evaluated = 0
+    sire_ids = [sire.id for sire, _ in sires]
+
+    # COI computed for this dam under the current pedigree epoch is reused.
+    if coi_version is not None:
+        cached_coi = {sire_id: result_cache.get(("coi", sire_id, dam.id, max_depth), coi_version) for sire_id in sire_ids}
+        dam_context.coancestry.preload({sire_id: coi for sire_id, coi in cached_coi.items() if coi is not None})
+
+    deadline = None if budget_ms is None else started + budget_ms / 1000.0
+    approximate_depth = min(APPROXIMATE_COI_DEPTH, max_depth)
+    approximate_context: Optional[DamContext] = None
+    exact_evaluated = 0
+
+    with open_coi_executor(pedigree, [dam.id] + sire_ids, max_depth, workers=workers) as executor:
+        batch_size = max(4 * top_n, 64 * executor.workers)
+
+        for position, (best_key, index) in enumerate(candidates):
+            if len(top) >= top_n and best_key < top[0][0]:
+                break
+
+            sire, breeder = sires[index]
+            # Past the deadline only COI already known exactly stays exact.
+            exact = deadline is None or time.perf_counter() < deadline or dam_context.coancestry.has_preloaded(sire.id)
 
-    results = []
-
-    for sire, breeder in sires:
-        evaluation = evaluate_pair(sire, dam, db, max_depth=max_depth)
-        results.append({
-            "sire_id": sire.id,
-            "sire_animal_id": sire.animal_id,
-            "breed": sire.breed,
-            "date_of_birth": str(sire.date_of_birth),
-            "farm_name": breeder.farm_name if breeder else "Unknown",
-            "farm_prefix": breeder.farm_prefix if breeder else "—",
-            **evaluation,
-        })
-
-    results.sort(key=lambda x: (x["final_score"], x["confidence_score"], -x["coi"]), reverse=True)
-    return results[:top_n]
+            # Worker processes compute COI for the next candidates in bound order.
+            if exact and executor.workers > 1 and not dam_context.coancestry.has_preloaded(sire.id):
+                batch = [sire_ids[i] for _, i in candidates[position:position + batch_size]]
+                dam_context.coancestry.preload(executor.dam_coi(dam.id, batch, max_depth))
+                batch_size *= 2
+
+            if exact:
+                context = dam_context
+                exact_evaluated += 1
+
+            else:
+                if approximate_context is None:
+                    approximate_context = replace(dam_context, coancestry=CoancestrySweep(pedigree, dam.id, approximate_depth))
+
+                context = approximate_context
+
+            evaluation = evaluate_pair(
+                sire, dam, db, max_depth=max_depth, pedigree=pedigree, dam_context=context, sire_components=components[sire.id]
+            )
+            evaluated += 1
+            result = {
+                "sire_id": sire.id,
+                "sire_animal_id": sire.animal_id,
+                "breed": sire.breed,
+                "date_of_birth": str(sire.date_of_birth),
+                "farm_name": breeder.farm_name if breeder else "Unknown",
+                "farm_prefix": breeder.farm_prefix if breeder else "—",
+                **evaluation,
+                "coi_exact": exact,
+                "coi_depth": max_depth if exact else approximate_depth,
+            }
+            # The original index breaks ties exactly as the old stable sort did.
+            key = (result["final_score"], result["confidence_score"], -result["coi"], -index)
+
+            if len(top) < top_n:
+                heapq.heappush(top, (key, result))
+
+            elif key > top[0][0]:
+                heapq.heapreplace(top, (key, result))
+
+            if coi_version is not None:
+                result_cache.put(("coi", sire.id, dam.id, result["coi_depth"]), coi_version, result["coi"])
+
+            yield {"event": "candidate", "evaluated": evaluated, "candidates": len(sires), "recommendation": result}
+
+    yield {
+        "event": "final",
+        "recommendations": [result for _, result in sorted(top, key=lambda item: item[0], reverse=True)],
+        "search_stats": _search_stats(len(sires), evaluated, exact_evaluated),
+    }
+
+# Internal helper for search stats.
+def _search_stats(candidates: int, evaluated: int, exact_evaluated: int) -> Dict[str, Any]:
+    return {
+        "candidates": candidates,
+        "evaluated": evaluated,
+        "pruned": candidates - evaluated,
+        "exact_evaluated": exact_evaluated,
+        "approximate_evaluated": evaluated - exact_evaluated,
+        "exact_fraction": round(exact_evaluated / candidates, 4) if candidates else 1.0,
+        # Bound pruning is exact, so only approximate COI makes the ranking approximate.
+        "exact": exact_evaluated == evaluated,
+    }
@@ -0,0 +1,209 @@
+# Backend/app/genetics_allocation.py: contains backend logic for the Animal Breed Registry System.
+"""
+Herd-wide mate allocation.
+
+`recommend_sires` ranks sires for one dam at a time, so a breeding season
+run dam by dam keeps sending every dam to the same few sires. Here every
+open dam is paired with the sire pool at once:
+
+1. `build_pair_score_matrix` fills dam × sire matrices of projected
+   offspring COI and `evaluate_pair` final score. Sire-only components are
+   encoded once with the vectorized scorer; COI comes from one coancestry
+   sweep per dam (path counting, the same values `evaluate_pair` uses) or,
+   with `coi_method="kinship"`, from a single full-pedigree kinship matrix.
+2. `allocate_mates` repeats each sire column once per unit of its usage cap
+   and solves the resulting rectangular assignment problem with
+   `scipy.optimize.linear_sum_assignment`. That is exactly a min-cost flow
+   with per-sire capacities, so the result is optimal for the objective:
+   the highest total score, or the lowest mean offspring COI (ties broken
+   by score).
+
+Pairs the relationship rules flag as close relatives, and pairs above an
+optional COI ceiling, are never assigned; a dam left without an eligible
+sire is reported as unassigned.
+
+The same matrix serves batch recommendations: `rank_sires_per_dam` turns
+each dam's row into a top-N ranking without rescoring any sire.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from .carrier_probabilities import CarrierProbabilities
+from .genetics_parallel import open_coi_executor
+from .genetics_vectorized import build_candidate_columns, relationship_penalties, score_candidates, sire_component_matrix
+from .kinship import kinship_matrix
+from .pedigree import PedigreeNode
+
+ALLOCATION_OBJECTIVES = ("score", "coi")
+COI_METHODS = ("paths", "kinship")
+_FORBIDDEN_COST = 1e6
+# Weight of the score tie-breaker under the COI objective; far below one COI step.
+_COI_TIE_BREAK = 1e-6
+
+@dataclass
+
+# Defines the pair score matrix structure used by this module.
+class PairScoreMatrix:
+    """Projected offspring COI and final score for every dam × sire pair."""
+
+    dam_ids: List[int]
+    sire_ids: List[int]
+    coi: np.ndarray
+    final_score: np.ndarray
+    related: np.ndarray
+    penalty_score: Optional[np.ndarray] = None
+    sire_components: Optional[np.ndarray] = None
+
+@dataclass
+
+# Defines the mate allocation structure used by this module.
+class MateAllocation:
+    """Solved assignment: `(dam_id, sire_id)` pairs plus per-sire usage."""
+
+    assignments: List[Tuple[int, int]]
+    unassigned_dam_ids: List[int]
+    sire_usage: Dict[int, int]
+    total_score: float
+    mean_coi: Optional[float]
+
+# Builds the dam × sire COI and score matrices.
+def build_pair_score_matrix(
+    dams: Sequence[Any],
+    sire_profiles: Sequence[Any],
+    pedigree: Mapping[int, PedigreeNode],
+    max_depth: int = 8,
+    coi_method: str = "paths",
+    workers: Optional[int] = None,
+    carriers: Optional[CarrierProbabilities] = None,
+) -> PairScoreMatrix:
+    """
+    `dams` need `id`, `sire_id` and `dam_id`; `sire_profiles` are breeding
+    profiles (or anything carrying the scored attributes). With
+    `coi_method="paths"` the COI is Wright's path count to `max_depth`,
+    identical to `evaluate_pair`; `"kinship"` uses the full registered
+    pedigree instead and is much faster for large herds. With `carriers`,
+    pairs are also penalised for P(affected offspring) as in `evaluate_pair`.
+    """
+
+    if coi_method not in COI_METHODS:
+        raise ValueError(f"coi_method must be one of {COI_METHODS}")
+
+    dam_ids = [dam.id for dam in dams]
+    sire_ids = [profile.id for profile in sire_profiles]
+    coi = np.zeros((len(dam_ids), len(sire_ids)))
+
+    if dam_ids and sire_ids:
+        if coi_method == "kinship":
+            kinship = kinship_matrix(pedigree, sire_ids + dam_ids)
+            coi = np.round(np.minimum(kinship[len(sire_ids):, :len(sire_ids)], 1.0), 6)
+
+        else:
+            with open_coi_executor(pedigree, dam_ids + sire_ids, max_depth, workers=workers) as executor:
+                for row, dam_id in enumerate(dam_ids):
+                    values = executor.dam_coi(dam_id, sire_ids, max_depth)
+                    coi[row] = [values[sire_id] for sire_id in sire_ids]
+
+    columns = build_candidate_columns(sire_profiles)
+    components = sire_component_matrix(columns)
+    final_score = np.zeros_like(coi)
+    penalty_score = np.zeros_like(coi)
+    related = np.zeros(coi.shape, dtype=bool)
+    carrier_risk = carriers.risk_matrix(dam_ids, sire_ids, coi) if carriers is not None else None
+
+    for row, dam in enumerate(dams):
+        scored = score_candidates(columns, dam, coi[row], components, None if carrier_risk is None else carrier_risk[row])
+        final_score[row] = scored["final_score"]
+        penalty_score[row] = scored["penalty_score"]
+        related[row] = relationship_penalties(columns, dam) > 0
+    return PairScoreMatrix(
+        dam_ids=dam_ids,
+        sire_ids=sire_ids,
+        coi=coi,
+        final_score=final_score,
+        related=related,
+        penalty_score=penalty_score,
+        sire_components=components,
+    )
+
+# Retrieves each dam's best sires from a pair score matrix.
+def rank_sires_per_dam(matrix: PairScoreMatrix, top_n: int, exclude_related: bool = False) -> List[List[int]]:
+    """
+    Column indices of the `top_n` best sires for every dam, best first, in
+    the order `recommend_sires` uses: final score, then data confidence,
+    then lower COI, then sire position.
+    """
+
+    if top_n <= 0 or not matrix.sire_ids:
+        return [[] for _ in matrix.dam_ids]
+
+    positions = np.arange(len(matrix.sire_ids))
+    confidence = np.round(matrix.sire_components[:, -1] * 100, 1)
+    rankings: List[List[int]] = []
+
+    for row in range(len(matrix.dam_ids)):
+        order = np.lexsort((positions, matrix.coi[row], -confidence, -np.round(matrix.final_score[row], 4)))
+
+        if exclude_related:
+            order = order[~matrix.related[row, order]]
+        rankings.append(order[:top_n].tolist())
+    return rankings
+
+# Calculates the optimal capacity-constrained dam → sire assignment.
+def allocate_mates(
+    matrix: PairScoreMatrix,
+    caps: Sequence[int],
+    objective: str = "score",
+    max_coi: Optional[float] = None,
+) -> MateAllocation:
+    """
+    Assign each dam at most one sire, and sire `j` at most `caps[j]` dams.
+    A sire never needs more copies than there are dams, so each column is
+    repeated `min(cap, dams)` times before solving.
+    """
+
+    if objective not in ALLOCATION_OBJECTIVES:
+        raise ValueError(f"objective must be one of {ALLOCATION_OBJECTIVES}")
+
+    dam_count = len(matrix.dam_ids)
+    slots = np.repeat(np.arange(len(matrix.sire_ids)), np.minimum(np.asarray(caps, dtype=int), dam_count).clip(min=0))
+
+    if objective == "score":
+        cost = -matrix.final_score
+    else:
+        cost = matrix.coi - _COI_TIE_BREAK * matrix.final_score
+
+    forbidden = matrix.related.copy()
+
+    if max_coi is not None:
+        forbidden |= matrix.coi > max_coi
+
+    cost = np.where(forbidden, _FORBIDDEN_COST, cost)[:, slots]
+    assignments: List[Tuple[int, int]] = []
+    usage: Dict[int, int] = {}
+    rows: List[int] = []
+    columns: List[int] = []
+
+    if cost.size:
+        for row, slot in zip(*linear_sum_assignment(cost)):
+            column = int(slots[slot])
+
+            if forbidden[row, column]:
+                continue
+
+            sire_id = matrix.sire_ids[column]
+            assignments.append((matrix.dam_ids[row], sire_id))
+            usage[sire_id] = usage.get(sire_id, 0) + 1
+            rows.append(int(row))
+            columns.append(column)
+
+    assigned = set(rows)
+    return MateAllocation(
+        assignments=assignments,
+        unassigned_dam_ids=[dam_id for row, dam_id in enumerate(matrix.dam_ids) if row not in assigned],
+        sire_usage=usage,
+        total_score=float(matrix.final_score[rows, columns].sum()) if rows else 0.0,
+        mean_coi=float(matrix.coi[rows, columns].mean()) if rows else None,
+    )
@@ -0,0 +1,180 @@
+# Backend/app/genetics_cache.py: contains backend logic for the Animal Breed Registry System.
+"""
+Process-level caches for the genetics engine.
+
+Sire-only score components (performance, health, fertility, offspring, data
+confidence and the sire's own risk penalties) do not depend on the dam, so a
+ranking pass for a new dam can reuse them. Entries are keyed by sire and
+stamped with the sire's `updated_at`, which every record write bumps,
+breeding events included (crud bumps the sire and dam in the event's
+transaction, so other workers' entries go stale too). crud also drops this
+process's entries when a breeding event touching the sire is written.
+
+Pedigree-derived results (COI, kinship, pedigree completeness) are kept in
+a second cache stamped with the pedigree epoch of the animal_type they were
+computed for. Any create, delete or parentage change bumps the epoch, and an
+entry whose epoch is no longer current is dropped on its next lookup.
+
+Whole ranked recommendation lists are cached too, versioned by the pedigree
+epoch and the latest record change in the candidate pool (see
+services/genetics_service.py).
+
+Like the pedigree index, one cache of each kind is kept per database engine.
+"""
+
+from __future__ import annotations
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+from sqlalchemy.orm import Session
+from . import pedigree
+
+SIRE_CACHE_MAX_ENTRIES = int(os.getenv("SIRE_CACHE_MAX_ENTRIES", "20000"))
+PEDIGREE_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("PEDIGREE_RESULT_CACHE_MAX_ENTRIES", "50000"))
+RECOMMENDATION_CACHE_MAX_ENTRIES = int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", "2000"))
+
+V = TypeVar("V")
+
+# Defines the versioned lru cache structure used by this module.
+class VersionedLRUCache(Generic[V]):
+    """
+    Bounded LRU map whose entries are only returned for a matching version.
+    An entry found with any other version is stale and is dropped.
+    """
+
+    # Internal helper for init.
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Retrieves a cached value when its version still matches.
+    def get(self, key: Hashable, version: Any) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    del self._entries[key]
+
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    # Stores a value under the given version.
+    def put(self, key: Hashable, version: Any, value: V) -> V:
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    # Handles invalidate logic for this module.
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    # Handles clear logic for this module.
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # Internal helper for len.
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_SIRE_CACHES: "weakref.WeakKeyDictionary[Any, VersionedLRUCache]" = weakref.WeakKeyDictionary()
+_RESULT_CACHES: "weakref.WeakKeyDictionary[Any, VersionedLRUCache]" = weakref.WeakKeyDictionary()
+_RECOMMENDATION_CACHES: "weakref.WeakKeyDictionary[Any, VersionedLRUCache]" = weakref.WeakKeyDictionary()
+_CACHES_LOCK = threading.Lock()
+
+# Internal helper for cache for bind.
+def _cache_for(db: Session, caches: "weakref.WeakKeyDictionary[Any, VersionedLRUCache]", max_entries: int) -> VersionedLRUCache:
+    bind = db.get_bind()
+
+    with _CACHES_LOCK:
+        cache = caches.get(bind)
+
+        if cache is None:
+            cache = VersionedLRUCache(max_entries)
+            caches[bind] = cache
+    return cache
+
+# Retrieves the sire component cache for the session's engine.
+def get_sire_cache(db: Session) -> VersionedLRUCache:
+    return _cache_for(db, _SIRE_CACHES, SIRE_CACHE_MAX_ENTRIES)
+
+# Retrieves the pedigree result cache for the session's engine.
+def get_pedigree_result_cache(db: Session) -> VersionedLRUCache:
+    return _cache_for(db, _RESULT_CACHES, PEDIGREE_RESULT_CACHE_MAX_ENTRIES)
+
+# Retrieves the ranked-recommendation cache for the session's engine.
+def get_recommendation_cache(db: Session) -> VersionedLRUCache:
+    return _cache_for(db, _RECOMMENDATION_CACHES, RECOMMENDATION_CACHE_MAX_ENTRIES)
+
+# Retrieves the epoch pedigree-derived results are stamped with.
+def pedigree_result_version(db: Session, animal_type: Optional[str] = None) -> Optional[int]:
+    """
+    Current pedigree epoch of `animal_type` (global when omitted), or None
+    when the pedigree index is disabled and results are not memoized.
+    """
+
+    if not pedigree.PEDIGREE_INDEX_ENABLED:
+        return None
+    return pedigree.get_pedigree_epoch(db, animal_type)
+
+# Retrieves the result version of one animal's animal_type.
+def animal_result_version(db: Session, animal_id: int) -> Optional[int]:
+    if not pedigree.PEDIGREE_INDEX_ENABLED:
+        return None
+
+    node = pedigree.get_pedigree_index(db).get(animal_id)
+    return pedigree.get_pedigree_epoch(db, node.animal_type if node else None)
+
+# Handles memoize by epoch logic for this module.
+def memoize_by_epoch(
+    db: Session,
+    key: Hashable,
+    compute: Callable[[], V],
+    animal_type: Optional[str] = None,
+    version: Optional[int] = None,
+) -> V:
+    """
+    Return the cached value for `key` if it was computed under the current
+    pedigree epoch, otherwise compute and store it. Keys should name the
+    result kind and its inputs, e.g. ("coi", sire_id, dam_id, depth).
+    Pass `version` when the caller already read the epoch for this request.
+    """
+
+    if version is None:
+        version = pedigree_result_version(db, animal_type)
+
+    if version is None:
+        return compute()
+
+    cache = get_pedigree_result_cache(db)
+    value = cache.get(key, version)
+
+    if value is None:
+        value = cache.put(key, version, compute())
+    return value
+
+# Retrieves the cache version for a sire.
+def sire_version(sire: Any) -> Any:
+    return getattr(sire, "updated_at", None)
+
+# Handles record breeding event written logic for this module.
+def record_breeding_event_written(db: Session, *animal_ids: Optional[int]) -> None:
+    """Drop cached sire components for every animal a breeding event touches."""
+
+    get_sire_cache(db).invalidate(animal_id for animal_id in animal_ids if animal_id is not None)
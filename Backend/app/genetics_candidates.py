@@ -0,0 +1,153 @@
+# Backend/app/genetics_candidates.py: contains backend logic for the Animal Breed Registry System.
+"""
+Candidate-sire selection for the recommendation engine.
+
+Scoring a sire costs a profile read and a COI evaluation, so the pool is cut
+down in SQL first. `candidate_sires_query` always restricts to males of the
+dam's animal_type (served by the `(animal_type, gender, breed)` index, see
+migrations/008) and applies the optional `SireCandidateFilter` on top:
+breeds, an age window on `date_of_birth`, the breeder's county, approved
+breeders only, and exclusion of the dam's close relatives.
+
+Close relatives are the pairings `detect_relationship_risks` flags as high
+risk: the dam's parents, her offspring and her full or half siblings. Their
+IDs come from the pedigree index when it is enabled; otherwise the same
+rules are expressed as column predicates, so no extra query is needed.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional, Set, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session
+from . import models, pedigree
+
+@dataclass(frozen=True)
+
+# Defines the sire candidate filter structure used by this module.
+class SireCandidateFilter:
+    """Optional restrictions on the sires a recommendation pass scores."""
+
+    breeds: Tuple[str, ...] = ()
+    min_age_months: Optional[int] = None
+    max_age_months: Optional[int] = None
+    county: Optional[str] = None
+    approved_breeders_only: bool = False
+    exclude_close_relatives: bool = False
+
+    # Handles is empty logic for this module.
+    def is_empty(self) -> bool:
+        return self == SireCandidateFilter()
+
+    # Handles cache key logic for this module.
+    def cache_key(self, today: Optional[date] = None) -> Tuple[Any, ...]:
+        """Hashable form for result caches; age windows move with the date."""
+
+        if self.is_empty():
+            return ()
+
+        has_age_window = self.min_age_months is not None or self.max_age_months is not None
+        return (
+            tuple(sorted(breed.lower() for breed in self.breeds)),
+            self.min_age_months,
+            self.max_age_months,
+            (self.county or "").lower() or None,
+            self.approved_breeders_only,
+            self.exclude_close_relatives,
+            (today or date.today()).isoformat() if has_age_window else None,
+        )
+
+# Internal helper for month start.
+def _month_start(today: date, months_back: int) -> date:
+    index = today.year * 12 + (today.month - 1) - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+# Retrieves the dam's close relatives from the pedigree index.
+def close_relative_ids(db: Session, dam: Any) -> Set[int]:
+    """Parents, offspring and full or half siblings of `dam`."""
+
+    index = pedigree.get_pedigree_index(db)
+    parents = {parent_id for parent_id in (dam.sire_id, dam.dam_id) if parent_id}
+    relatives = set(parents) | index.children(dam.id)
+
+    for parent_id in parents:
+        relatives |= index.children(parent_id)
+
+    relatives.discard(dam.id)
+    return relatives
+
+# Internal helper for close relative predicates.
+def _not_close_relative(dam: Any):
+    """Column predicates equivalent to `close_relative_ids`, for index-less deployments."""
+
+    animal = models.Animal
+    conditions = [or_(animal.sire_id.is_(None), animal.sire_id != dam.id), or_(animal.dam_id.is_(None), animal.dam_id != dam.id)]
+
+    for parent_id, column in ((dam.sire_id, animal.sire_id), (dam.dam_id, animal.dam_id)):
+        if parent_id:
+            conditions.append(animal.id != parent_id)
+            conditions.append(or_(column.is_(None), column != parent_id))
+    return and_(*conditions)
+
+# Retrieves the sire pool query for an animal type.
+def sire_pool_query(
+    db: Session,
+    animal_type: str,
+    filters: Optional[SireCandidateFilter] = None,
+    today: Optional[date] = None,
+) -> Query:
+    """
+    `(Animal, Breeder | None)` rows for every male of `animal_type` that
+    passes the dam-independent parts of `filters`, ordered by animal ID.
+    Breeder conditions turn the outer join into an inner one, so sires
+    without a breeder are dropped only when a breeder filter is set.
+    """
+
+    filters = filters or SireCandidateFilter()
+    query = (
+        db.query(models.Animal, models.Breeder)
+        .join(models.Breeder, models.Breeder.id == models.Animal.breeder_id, isouter=True)
+        .filter(models.Animal.animal_type == animal_type, models.Animal.gender == "male")
+    )
+
+    if filters.breeds:
+        query = query.filter(models.Animal.breed.in_(list(filters.breeds)))
+
+    today = today or date.today()
+
+    if filters.min_age_months is not None:
+        query = query.filter(models.Animal.date_of_birth < _month_start(today, filters.min_age_months - 1))
+
+    if filters.max_age_months is not None:
+        query = query.filter(models.Animal.date_of_birth >= _month_start(today, filters.max_age_months))
+
+    if filters.county:
+        query = query.filter(models.Breeder.county == filters.county)
+
+    if filters.approved_breeders_only:
+        query = query.filter(models.Breeder.status == "approved")
+    return query.order_by(models.Animal.id)
+
+# Retrieves the candidate sire query for a dam.
+def candidate_sires_query(
+    db: Session,
+    dam: Any,
+    filters: Optional[SireCandidateFilter] = None,
+    today: Optional[date] = None,
+) -> Query:
+    """`sire_pool_query` for the dam's animal_type, without the dam and, if asked, her close relatives."""
+
+    filters = filters or SireCandidateFilter()
+    query = sire_pool_query(db, dam.animal_type, filters, today).filter(models.Animal.id != dam.id)
+
+    if filters.exclude_close_relatives:
+        if pedigree.PEDIGREE_INDEX_ENABLED:
+            relatives = close_relative_ids(db, dam)
+
+            if relatives:
+                query = query.filter(models.Animal.id.notin_(sorted(relatives)))
+
+        else:
+            query = query.filter(_not_close_relative(dam))
+    return query
@@ -0,0 +1,186 @@
+# Backend/app/genetics_ocs.py: contains backend logic for the Animal Breed Registry System.
+"""
+Optimal contribution selection (OCS) for breed-level genetic management.
+
+Per-pair COI says how related one mating is; OCS decides how much each
+candidate should contribute to the next generation. With contributions c
+(summing to ½ over males and ½ over females), merit vector m and kinship
+matrix K it solves
+
+    maximise  c'm   subject to  c'Kc ≤ θ,  Q'c = s,  c ≥ 0
+
+where c'Kc is the group coancestry of the offspring and θ the target. The
+Lagrangian solution of Meuwissen (1997) gives c in closed form from three
+triangular solves against the Cholesky factor of K; candidates that come
+out negative are dropped and the system is re-solved on the rest, which
+converges in a handful of iterations. No pairwise loops are involved, so a
+few thousand candidates solve in about a second.
+
+Targets are usually given as a rate of inbreeding ΔF per generation; the
+coancestry target is then θ = C + ΔF(1 − C), with C the group coancestry of
+the candidates under equal contributions within each sex.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Sequence
+import numpy as np
+from scipy.linalg import LinAlgError, cho_factor, cho_solve
+from .genetics_vectorized import WEIGHT_VECTOR, build_candidate_columns, sire_component_matrix, sire_penalties
+
+_NEGATIVE_TOLERANCE = 1e-12
+_MAX_ITERATIONS = 200
+
+@dataclass
+
+# Defines the ocs result structure used by this module.
+class OcsResult:
+    """Optimal contributions (aligned with the input order) and summary statistics."""
+
+    contributions: np.ndarray
+    expected_merit: float
+    group_coancestry: float
+    target_coancestry: float
+    minimum_coancestry: float
+    feasible: bool
+    constraint_binding: bool
+    iterations: int
+
+# Calculates a merit value per candidate from the recommendation score components.
+def merit_vector(profiles: Sequence[Any]) -> np.ndarray:
+    """
+    Merit in [0, 1]: the animal-only recommendation components (performance,
+    health, fertility, offspring, data confidence) weighted as in
+    SCORING_WEIGHTS, minus the animal's own risk penalties. Genetic
+    diversity is left out because OCS accounts for it through kinship.
+    """
+
+    columns = build_candidate_columns(profiles)
+    weights = WEIGHT_VECTOR[1:] / WEIGHT_VECTOR[1:].sum()
+    return np.clip(sire_component_matrix(columns) @ weights - sire_penalties(columns), 0.0, 1.0)
+
+# Internal helper for sex design.
+def _sex_design(is_male: np.ndarray):
+    """Indicator matrix Q (n × 2) and the contribution totals s for each sex present."""
+
+    sexes = [mask for mask in (is_male, ~is_male) if mask.any()]
+    Q = np.column_stack(sexes).astype(float)
+    s = np.full(len(sexes), 1.0 / len(sexes))
+    return Q, s
+
+# Calculates the group coancestry under equal contributions within each sex.
+def uniform_group_coancestry(kinship: np.ndarray, is_male: np.ndarray) -> float:
+    is_male = np.asarray(is_male, dtype=bool)
+    Q, s = _sex_design(is_male)
+    c = Q @ (s / Q.sum(axis=0))
+    return float(c @ kinship @ c)
+
+# Calculates the coancestry target for a desired rate of inbreeding.
+def coancestry_target(kinship: np.ndarray, is_male: np.ndarray, delta_f: float) -> float:
+    current = uniform_group_coancestry(kinship, is_male)
+    return current + delta_f * (1.0 - current)
+
+# Calculates optimal contributions with the Lagrangian method.
+def optimal_contributions(
+    kinship: np.ndarray,
+    merit: np.ndarray,
+    is_male: np.ndarray,
+    target_coancestry: float,
+) -> OcsResult:
+    """
+    Solve the OCS quadratic program. When the target is below the lowest
+    coancestry the candidates can reach, the minimum-coancestry solution is
+    returned with `feasible=False`. When the target is loose enough that the
+    coancestry constraint does not bind, the best male and best female
+    share the contributions (`constraint_binding=False`).
+
+    Raises ValueError when `kinship` is not positive definite.
+    """
+
+    kinship = np.asarray(kinship, dtype=float)
+    merit = np.asarray(merit, dtype=float)
+    is_male = np.asarray(is_male, dtype=bool)
+    n = len(merit)
+
+    if kinship.shape != (n, n) or is_male.shape != (n,):
+        raise ValueError("kinship, merit and is_male must describe the same candidates")
+
+    active = np.arange(n)
+    contributions = np.zeros(n)
+    iterations = 0
+    binding = True
+    feasible = True
+    minimum = 0.0
+
+    while iterations < _MAX_ITERATIONS:
+        iterations += 1
+        K = kinship[np.ix_(active, active)]
+        m = merit[active]
+        Q, s = _sex_design(is_male[active])
+
+        try:
+            factor = cho_factor(K, lower=True, check_finite=False)
+        except LinAlgError as exc:
+            raise ValueError("Kinship matrix is not positive definite") from exc
+
+        Kinv_m = cho_solve(factor, m, check_finite=False)
+        Kinv_Q = cho_solve(factor, Q, check_finite=False)
+        P_inv = np.linalg.inv(Q.T @ Kinv_Q)
+        minimum_c = Kinv_Q @ (P_inv @ s)
+        minimum = float(s @ P_inv @ s)
+        # Merit left after the part explained by sex means: u'K⁻¹u.
+        Kinv_u = Kinv_m - Kinv_Q @ (P_inv @ (Q.T @ Kinv_m))
+        spread = float(m @ Kinv_u)
+
+        if target_coancestry <= minimum or spread <= 0:
+            feasible = target_coancestry >= minimum
+            candidate = minimum_c
+
+        else:
+            # c = K⁻¹(m − Qλ) / 2λ₀ with λ₀ chosen so that c'Kc equals the target.
+            scale = np.sqrt((target_coancestry - minimum) / spread)
+            candidate = minimum_c + scale * Kinv_u
+
+        negative = candidate < -_NEGATIVE_TOLERANCE
+
+        if not negative.any():
+            contributions[:] = 0.0
+            contributions[active] = np.clip(candidate, 0.0, None)
+            break
+
+        keep = ~negative
+
+        # Never drop the last candidate of a sex; keep its best animal instead.
+        for mask in (is_male[active], ~is_male[active]):
+            if mask.any() and not (keep & mask).any():
+                keep[np.flatnonzero(mask)[np.argmax(candidate[mask])]] = True
+
+        if keep.sum() == len(active):
+            contributions[:] = 0.0
+            contributions[active] = np.clip(candidate, 0.0, None)
+            break
+
+        active = active[keep]
+
+    # Renormalise within each sex after clipping rounding noise.
+    for mask in (is_male, ~is_male):
+        total = contributions[mask].sum()
+
+        if mask.any() and total > 0:
+            contributions[mask] *= (0.5 if is_male.any() and (~is_male).any() else 1.0) / total
+
+    group_coancestry = float(contributions @ kinship @ contributions)
+
+    if feasible and group_coancestry < target_coancestry - 1e-9:
+        binding = False
+
+    return OcsResult(
+        contributions=contributions,
+        expected_merit=float(contributions @ merit),
+        group_coancestry=group_coancestry,
+        target_coancestry=float(target_coancestry),
+        minimum_coancestry=minimum,
+        feasible=feasible,
+        constraint_binding=binding,
+        iterations=iterations,
+    )
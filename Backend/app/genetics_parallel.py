@@ -0,0 +1,405 @@
+# Backend/app/genetics_parallel.py: contains backend logic for the Animal Breed Registry System.
+"""
+Multi-core COI evaluation for large sire pools.
+
+COI is CPU-bound Python, so a ranking pass over thousands of sires is limited
+to one core inside a FastAPI worker thread. A `ProcessCoiExecutor` fans
+candidate chunks across one long-lived worker pool per server process,
+started with forkserver (or spawn), never fork: forking a process that
+runs request threads can deadlock the child on a lock held by another
+thread. Workers keep compact parentage snapshots (three integer arrays)
+by key: the whole pedigree of an animal_type, replaced when its epoch
+moves, or the roots' ancestors when the pedigree index is disabled. A
+snapshot crosses to each worker once. Each worker keeps its own memoized
+path counter and coancestry sweeps, so results are exactly the values
+`CoancestrySweep` computes in-process.
+
+`open_coi_executor` picks the implementation: sequential when one worker is
+configured, when the pool is too small to be worth a parallel pass, or
+when worker processes cannot be started on this host.
+"""
+
+from __future__ import annotations
+import atexit
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+import weakref
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+import numpy as np
+from .genetics import CoancestrySweep, PedigreePathCounter
+from .inbreeding import pedigree_closure
+from .pedigree import PedigreeIndex, PedigreeNode
+
+logger = logging.getLogger(__name__)
+
+GENETICS_WORKERS = int(os.getenv("GENETICS_WORKERS", "1"))
+GENETICS_PARALLEL_MIN_CANDIDATES = int(os.getenv("GENETICS_PARALLEL_MIN_CANDIDATES", "2000"))
+GENETICS_CHUNK_SIZE = int(os.getenv("GENETICS_CHUNK_SIZE", "256"))
+GENETICS_START_METHOD = os.getenv("GENETICS_START_METHOD", "forkserver")
+_MAX_SWEEPS_PER_EXECUTOR = 64
+# Snapshots each worker keeps, for example one per animal_type in use.
+_WORKER_SNAPSHOTS = 4
+
+@dataclass
+
+# Defines the pedigree snapshot structure used by this module.
+class PedigreeSnapshot:
+    """Parentage of the animals a COI pass can reach; 0 marks an unknown parent."""
+
+    ids: np.ndarray
+    sire_ids: np.ndarray
+    dam_ids: np.ndarray
+
+    # Internal helper for len.
+    def __len__(self) -> int:
+        return len(self.ids)
+
+# Builds a compact parentage snapshot for the given animals.
+def build_pedigree_snapshot(
+    pedigree: Mapping[int, PedigreeNode],
+    root_ids: Iterable[Optional[int]],
+    max_depth: int,
+) -> PedigreeSnapshot:
+    """
+    Snapshot every animal within `max_depth` generations of `root_ids`, which
+    is exactly what `PedigreePathCounter.histogram(_, max_depth)` reads.
+    """
+
+    depth: Dict[int, int] = {}
+    frontier = [animal_id for animal_id in dict.fromkeys(root_ids) if animal_id is not None]
+
+    for generation in range(max_depth + 1):
+        next_frontier: List[int] = []
+
+        for animal_id in frontier:
+            if animal_id in depth:
+                continue
+
+            depth[animal_id] = generation
+            node = pedigree.get(animal_id)
+
+            if node is None:
+                continue
+
+            next_frontier.extend(parent_id for parent_id in (node.sire_id, node.dam_id) if parent_id is not None)
+
+        frontier = next_frontier
+
+    nodes = [pedigree.get(animal_id) for animal_id in depth]
+    nodes = [node for node in nodes if node is not None]
+    return PedigreeSnapshot(
+        ids=np.array([node.id for node in nodes], dtype=np.int64),
+        sire_ids=np.array([node.sire_id or 0 for node in nodes], dtype=np.int64),
+        dam_ids=np.array([node.dam_id or 0 for node in nodes], dtype=np.int64),
+    )
+
+# Handles snapshot nodes logic for this module.
+def snapshot_nodes(snapshot: PedigreeSnapshot) -> Dict[int, PedigreeNode]:
+    return {
+        animal_id: PedigreeNode(animal_id, sire_id or None, dam_id or None, None, None, None)
+        for animal_id, sire_id, dam_id in zip(snapshot.ids.tolist(), snapshot.sire_ids.tolist(), snapshot.dam_ids.tolist())
+    }
+
+# Internal helper for sibling order.
+def _sibling_order(pedigree: Mapping[int, PedigreeNode], sire_ids: Sequence[int]) -> List[int]:
+    """Sort sires so siblings land in the same chunk and share memoized parent terms."""
+
+    # Internal helper for sort key.
+    def sort_key(sire_id: int):
+        node = pedigree.get(sire_id)
+        return (node.sire_id or 0, node.dam_id or 0, sire_id) if node else (0, 0, sire_id)
+
+    return sorted(dict.fromkeys(sire_ids), key=sort_key)
+
+# Defines the sequential coi executor structure used by this module.
+class SequentialCoiExecutor:
+    """In-process COI evaluation; the fallback every other executor matches exactly."""
+
+    workers = 1
+
+    # Internal helper for init.
+    def __init__(self, pedigree: Mapping[int, PedigreeNode]) -> None:
+        self.pedigree = pedigree
+        self._counter = PedigreePathCounter(pedigree)
+        self._sweeps: "OrderedDict[Tuple[int, int], CoancestrySweep]" = OrderedDict()
+
+    # Internal helper for sweep.
+    def _sweep(self, dam_id: int, max_depth: int) -> CoancestrySweep:
+        key = (dam_id, max_depth)
+        sweep = self._sweeps.get(key)
+
+        if sweep is None:
+            sweep = CoancestrySweep(self.pedigree, dam_id, max_depth, counter=self._counter)
+            self._sweeps[key] = sweep
+
+            if len(self._sweeps) > _MAX_SWEEPS_PER_EXECUTOR:
+                self._sweeps.popitem(last=False)
+        return sweep
+
+    # Calculates projected COI of one dam with many sires.
+    def dam_coi(self, dam_id: int, sire_ids: Sequence[int], max_depth: int) -> Dict[int, float]:
+        sweep = self._sweep(dam_id, max_depth)
+        return {sire_id: sweep.coi(sire_id) for sire_id in sire_ids}
+
+    # Calculates projected COI for arbitrary sire/dam pairs.
+    def pair_coi(self, pairs: Iterable[Tuple[int, int]], max_depth: int) -> Dict[Tuple[int, int], float]:
+        """Return `{(sire_id, dam_id): coi}`; pairs are grouped by dam internally."""
+
+        by_dam: Dict[int, List[int]] = defaultdict(list)
+
+        for sire_id, dam_id in pairs:
+            by_dam[dam_id].append(sire_id)
+
+        values: Dict[Tuple[int, int], float] = {}
+
+        for dam_id, sire_ids in by_dam.items():
+            for sire_id, coi in self.dam_coi(dam_id, sire_ids, max_depth).items():
+                values[(sire_id, dam_id)] = coi
+        return values
+
+    # Handles close logic for this module.
+    def close(self) -> None:
+        self._sweeps.clear()
+
+    # Internal helper for enter.
+    def __enter__(self) -> "SequentialCoiExecutor":
+        return self
+
+    # Internal helper for exit.
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+_SHIPPED_KEYS: "OrderedDict[str, None]" = OrderedDict()
+_TYPE_SNAPSHOTS: "weakref.WeakKeyDictionary[PedigreeIndex, Dict[str, Tuple[int, str, PedigreeSnapshot, Set[int]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Internal helper for start method.
+def _start_method() -> str:
+    """forkserver or spawn: forking a threaded server process can deadlock the child."""
+
+    methods = multiprocessing.get_all_start_methods()
+    return GENETICS_START_METHOD if GENETICS_START_METHOD in methods and GENETICS_START_METHOD != "fork" else "spawn"
+
+# Retrieves the process-wide COI worker pool.
+def get_coi_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Start the pool on first use and keep it for the life of the process; it
+    is only replaced when a caller asks for more workers than it has.
+    """
+
+    global _POOL, _POOL_WORKERS
+
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS < workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(_start_method()))
+            _POOL_WORKERS = workers
+            _SHIPPED_KEYS.clear()
+        return _POOL
+
+# Handles shutdown coi pool logic for this module.
+def shutdown_coi_pool(pool: Optional[ProcessPoolExecutor] = None) -> None:
+    """Stop the worker pool (only if it is still `pool`, when given); the next parallel pass starts a new one."""
+
+    global _POOL, _POOL_WORKERS
+
+    with _POOL_LOCK:
+        if _POOL is None or (pool is not None and _POOL is not pool):
+            return
+
+        stopped, _POOL, _POOL_WORKERS = _POOL, None, 0
+        _SHIPPED_KEYS.clear()
+
+    stopped.shutdown(wait=False, cancel_futures=True)
+
+atexit.register(shutdown_coi_pool)
+
+_worker_executors: "OrderedDict[str, SequentialCoiExecutor]" = OrderedDict()
+
+# Internal helper for worker dam chunk.
+def _worker_dam_chunk(
+    key: str, snapshot: Optional[PedigreeSnapshot], dam_id: int, sire_ids: List[int], max_depth: int
+) -> Optional[List[float]]:
+    """Runs in a worker. Returns None when the worker has not been sent snapshot `key` yet."""
+
+    executor = _worker_executors.get(key)
+
+    if executor is None:
+        if snapshot is None:
+            return None
+
+        executor = _worker_executors[key] = SequentialCoiExecutor(snapshot_nodes(snapshot))
+
+        if len(_worker_executors) > _WORKER_SNAPSHOTS:
+            _worker_executors.popitem(last=False)
+
+    _worker_executors.move_to_end(key)
+    values = executor.dam_coi(dam_id, sire_ids, max_depth)
+    return [values[sire_id] for sire_id in sire_ids]
+
+# Calculates the content key of a snapshot.
+def snapshot_key(snapshot: PedigreeSnapshot) -> str:
+    digest = hashlib.sha1()
+
+    for column in (snapshot.ids, snapshot.sire_ids, snapshot.dam_ids):
+        digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.hexdigest()
+
+# Defines the process coi executor structure used by this module.
+class ProcessCoiExecutor(SequentialCoiExecutor):
+    """
+    COI evaluation fanned across the process-wide worker pool. Tasks carry
+    only IDs and the snapshot key; a worker that lacks the snapshot answers
+    None and gets the task again with the snapshot attached, so each worker
+    receives a snapshot once. The first pass under a new key attaches it up
+    front to save that round trip.
+    """
+
+    # Internal helper for init.
+    def __init__(
+        self,
+        pedigree: Mapping[int, PedigreeNode],
+        snapshot: PedigreeSnapshot,
+        workers: int,
+        chunk_size: int = GENETICS_CHUNK_SIZE,
+        key: Optional[str] = None,
+    ) -> None:
+        super().__init__(pedigree)
+        self.workers = workers
+        self.chunk_size = max(chunk_size, 1)
+        self.snapshot = snapshot
+        self.key = key or snapshot_key(snapshot)
+        self._pool: Optional[ProcessPoolExecutor] = get_coi_pool(workers)
+
+    # Internal helper for run chunks.
+    def _run_chunks(self, dam_id: int, chunks: List[List[int]], max_depth: int, ship: bool) -> List[Optional[List[float]]]:
+        snapshot = self.snapshot if ship else None
+        futures = [self._pool.submit(_worker_dam_chunk, self.key, snapshot, dam_id, chunk, max_depth) for chunk in chunks]
+        return [future.result() for future in futures]
+
+    # Calculates projected COI of one dam with many sires.
+    def dam_coi(self, dam_id: int, sire_ids: Sequence[int], max_depth: int) -> Dict[int, float]:
+        if self._pool is None:
+            return super().dam_coi(dam_id, sire_ids, max_depth)
+
+        ordered = _sibling_order(self.pedigree, sire_ids)
+        # Enough chunks to balance the load, but never more than chunk_size sires each.
+        size = min(self.chunk_size, max(1, -(-len(ordered) // (self.workers * 4))))
+        chunks = [ordered[start:start + size] for start in range(0, len(ordered), size)]
+
+        with _POOL_LOCK:
+            shipped = self.key in _SHIPPED_KEYS
+
+            if not shipped:
+                _SHIPPED_KEYS[self.key] = None
+
+                if len(_SHIPPED_KEYS) > _WORKER_SNAPSHOTS:
+                    _SHIPPED_KEYS.popitem(last=False)
+
+        try:
+            results = self._run_chunks(dam_id, chunks, max_depth, ship=not shipped)
+            missing = [index for index, chunk_values in enumerate(results) if chunk_values is None]
+
+            if missing:
+                retried = self._run_chunks(dam_id, [chunks[index] for index in missing], max_depth, ship=True)
+
+                for index, chunk_values in zip(missing, retried):
+                    results[index] = chunk_values
+
+            values: Dict[int, float] = {}
+
+            for chunk, chunk_values in zip(chunks, results):
+                values.update(zip(chunk, chunk_values))
+            return values
+
+        except (BrokenProcessPool, OSError, RuntimeError):
+            logger.warning("COI worker pool failed — continuing sequentially.")
+            shutdown_coi_pool(self._pool)
+            self._pool = None
+            return super().dam_coi(dam_id, sire_ids, max_depth)
+
+    # Handles close logic for this module.
+    def close(self) -> None:
+        """Release this pass; the shared pool and the workers' snapshots stay warm."""
+
+        self._pool = None
+        super().close()
+
+# Internal helper for type snapshot.
+def _type_snapshot(index: PedigreeIndex, root_ids: Sequence[int]) -> Optional[Tuple[str, PedigreeSnapshot]]:
+    """
+    Snapshot of the whole registered pedigree of the roots' animal_type,
+    reused until the index's epoch for that type moves. Returns None when
+    the roots span several types or are not all registered.
+    """
+
+    types = {node.animal_type if node else None for node in (index.get(root_id) for root_id in root_ids)}
+
+    if len(types) != 1 or None in types:
+        return None
+
+    animal_type = types.pop()
+    epoch = index.epoch(animal_type)
+    cached = _TYPE_SNAPSHOTS.get(index, {}).get(animal_type)
+
+    if cached is None or cached[0] != epoch or not cached[3].issuperset(root_ids):
+        type_ids = [node.id for node in index if node.animal_type == animal_type]
+        closure = pedigree_closure(index, type_ids)
+        nodes = [index.get(animal_id) for animal_id in closure]
+        snapshot = PedigreeSnapshot(
+            ids=np.array([node.id for node in nodes], dtype=np.int64),
+            sire_ids=np.array([node.sire_id or 0 for node in nodes], dtype=np.int64),
+            dam_ids=np.array([node.dam_id or 0 for node in nodes], dtype=np.int64),
+        )
+        cached = (epoch, f"{animal_type}:{epoch}:{uuid.uuid4().hex}", snapshot, closure)
+        _TYPE_SNAPSHOTS.setdefault(index, {})[animal_type] = cached
+    return cached[1], cached[2]
+
+# Handles open coi executor logic for this module.
+def open_coi_executor(
+    pedigree: Mapping[int, PedigreeNode],
+    root_ids: Sequence[int],
+    max_depth: int,
+    workers: Optional[int] = None,
+    min_candidates: Optional[int] = None,
+) -> SequentialCoiExecutor:
+    """
+    Return a COI executor for the animals in `root_ids` (dams and candidate
+    sires). `workers` defaults to GENETICS_WORKERS; pools with fewer than
+    `min_candidates` animals (default GENETICS_PARALLEL_MIN_CANDIDATES) stay
+    in-process. With the pedigree index, workers hold the animal_type's
+    whole pedigree and get a new snapshot only after its epoch moves;
+    otherwise the snapshot covers the roots' ancestors up to `max_depth`.
+    Use the result as a context manager.
+    """
+
+    workers = GENETICS_WORKERS if workers is None else workers
+    min_candidates = GENETICS_PARALLEL_MIN_CANDIDATES if min_candidates is None else min_candidates
+
+    if workers <= 1 or len(root_ids) < min_candidates:
+        return SequentialCoiExecutor(pedigree)
+
+    try:
+        typed = _type_snapshot(pedigree, root_ids) if isinstance(pedigree, PedigreeIndex) else None
+
+        if typed is None:
+            return ProcessCoiExecutor(pedigree, build_pedigree_snapshot(pedigree, root_ids, max_depth), workers)
+        return ProcessCoiExecutor(pedigree, typed[1], workers, key=typed[0])
+
+    except (OSError, NotImplementedError, ValueError) as exc:
+        logger.warning("COI worker pool unavailable (%s) — running sequentially.", exc)
+        return SequentialCoiExecutor(pedigree)
@@ -0,0 +1,347 @@
+# Backend/app/genetics_vectorized.py: contains backend logic for the Animal Breed Registry System.
+"""
+Columnar scoring path for large candidate pools.
+
+`score_performance`, `score_fertility` and friends in genetics.py score one
+profile at a time. Here the candidate profiles are turned into NumPy columns
+once (text fields become small category codes, missing numbers become NaN)
+and every component is computed for every candidate in one pass. The final
+score is the component matrix times the `SCORING_WEIGHTS` vector, minus the
+same explainable penalties `evaluate_pair` applies.
+
+Results agree with `evaluate_pair` to floating-point tolerance; the exact
+per-pair path is still used for the explanations shown to breeders.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .genetics import SCORING_WEIGHTS, _field_present, _has_negative_keyword
+
+COMPONENT_ORDER = ["genetic_diversity", "performance", "health", "fertility", "offspring", "confidence"]
+WEIGHT_VECTOR = np.array([SCORING_WEIGHTS[name] for name in COMPONENT_ORDER])
+
+# (column, low, high) for the performance traits every species shares.
+PERFORMANCE_RANGES = [
+    ("body_condition_score", 1.0, 5.0),
+    ("average_daily_gain", 0.0, 2.0),
+    ("daily_milk_yield", 0.0, 45.0),
+    ("milk_fat_percent", 2.0, 7.0),
+    ("egg_count_annual", 0.0, 320.0),
+]
+
+# Species-specific upper bounds for current and weaning weight; None skips the trait.
+WEIGHT_RANGES = {
+    "cattle": (800.0, 250.0),
+    "goat": (120.0, 40.0),
+    "sheep": (120.0, 40.0),
+    "pig": (250.0, 40.0),
+    "poultry": (5.0, None),
+}
+DEFAULT_WEIGHT_RANGE = (500.0, None)
+
+NUMERIC_COLUMNS = [
+    "current_weight", "weaning_weight", "body_condition_score", "average_daily_gain", "daily_milk_yield",
+    "milk_fat_percent", "egg_count_annual", "services_per_conception", "birth_interval_days",
+    "age_at_first_service_months", "offspring_survival_rate", "offspring_quality_score", "offspring_count",
+]
+
+CONFIDENCE_FIELDS = [
+    "birth_weight", "current_weight", "weaning_weight", "body_condition_score", "average_daily_gain",
+    "health_status", "vaccination_status", "disease_history", "hereditary_conditions", "fertility_status",
+    "services_per_conception", "offspring_survival_rate", "offspring_quality_score",
+]
+
+@dataclass
+
+# Defines the candidate columns structure used by this module.
+class CandidateColumns:
+    """
+    Candidate profiles held column-wise. Numeric traits are float arrays with
+    NaN for missing values; text fields are reduced to the codes the scoring
+    rules need.
+    """
+
+    ids: np.ndarray
+    sire_ids: np.ndarray
+    dam_ids: np.ndarray
+    numeric: Dict[str, np.ndarray]
+    current_weight_high: np.ndarray
+    weaning_weight_high: np.ndarray
+    vaccination: np.ndarray
+    health_status: np.ndarray
+    disease_negative: np.ndarray
+    hereditary_negative: np.ndarray
+    fertility_status: np.ndarray
+    successful_breedings: np.ndarray
+    failed_breedings: np.ndarray
+    present: np.ndarray
+    penalty_hereditary: np.ndarray
+    penalty_health: np.ndarray
+    penalty_fertility: np.ndarray
+
+    # Internal helper for len.
+    def __len__(self) -> int:
+        return len(self.ids)
+
+# Internal helper for category code.
+def _category_code(value: Optional[str], positive: set, negative: set) -> int:
+    if not value:
+        return 0
+
+    text = value.lower()
+
+    if text in positive:
+        return 1
+
+    if text in negative:
+        return -1
+    return 0
+
+# Internal helper for text codes.
+@lru_cache(maxsize=4096)
+def _text_codes(
+    vaccination_status: Optional[str],
+    health_status: Optional[str],
+    fertility_status: Optional[str],
+    disease_history: Optional[str],
+    hereditary_conditions: Optional[str],
+) -> Tuple[Tuple[int, int, int], Tuple[bool, ...]]:
+    """Category codes and keyword flags; registries repeat a few values, so this is memoized."""
+
+    codes = (
+        _category_code(vaccination_status, {"complete", "up_to_date", "up-to-date", "current"}, {"none", "missing", "unknown"}),
+        _category_code(health_status, {"excellent", "good", "healthy"}, {"poor", "sick", "quarantined", "unfit"}),
+        _category_code(fertility_status, {"proven", "fertile", "good", "excellent"}, {"poor", "infertile", "unknown problem"}),
+    )
+    flags = (
+        _has_negative_keyword(disease_history, ["chronic", "recurrent", "lameness", "mastitis", "defect", "disease", "sick", "positive"]),
+        _has_negative_keyword(hereditary_conditions, ["carrier", "affected", "defect", "positive", "hereditary"]),
+        _has_negative_keyword(hereditary_conditions, ["affected", "carrier", "positive", "defect"]),
+        _has_negative_keyword(health_status, ["poor", "sick", "unfit", "quarantined"]),
+        _has_negative_keyword(fertility_status, ["poor", "infertile"]),
+    )
+    return codes, flags
+
+# Builds scoring columns from breeding profiles.
+def build_candidate_columns(profiles: Sequence[Any]) -> CandidateColumns:
+    """
+    Encode `AnimalBreedingProfile` objects (or anything with the same
+    attributes) into columns. Only this step reads animals one at a time; it
+    runs once per candidate pool and the columns can be scored against any
+    number of dams.
+    """
+
+    count = len(profiles)
+    # dtype=float turns None into NaN.
+    numeric = {name: np.array([getattr(p, name) for p in profiles], dtype=float) for name in NUMERIC_COLUMNS}
+    weight_ranges = [WEIGHT_RANGES.get((p.animal_type or "").lower(), DEFAULT_WEIGHT_RANGE) for p in profiles]
+    text = [
+        _text_codes(p.vaccination_status, p.health_status, p.fertility_status, p.disease_history, p.hereditary_conditions)
+        for p in profiles
+    ]
+    codes = np.array([code for code, _ in text], dtype=np.int8).reshape(count, 3)
+    flags = np.array([flag for _, flag in text], dtype=bool).reshape(count, 5)
+    breedings = np.array(
+        [(getattr(p, "successful_breedings", 0) or 0, getattr(p, "failed_breedings", 0) or 0) for p in profiles], dtype=float
+    ).reshape(count, 2)
+    # The scalar rule counts its two boolean entries as present even when False.
+    present = np.ones((count, len(CONFIDENCE_FIELDS) + 2), dtype=bool)
+
+    for column, name in enumerate(CONFIDENCE_FIELDS):
+        present[:, column] = [_field_present(getattr(p, name)) for p in profiles]
+
+    ids = np.array([p.id for p in profiles], dtype=np.int64)
+    parents = np.array([(p.sire_id or 0, p.dam_id or 0) for p in profiles], dtype=np.int64).reshape(count, 2)
+    current_weight_high = np.array([high for high, _ in weight_ranges], dtype=float)
+    weaning_weight_high = np.array([high for _, high in weight_ranges], dtype=float)
+
+    return CandidateColumns(
+        ids=ids,
+        sire_ids=parents[:, 0],
+        dam_ids=parents[:, 1],
+        numeric=numeric,
+        current_weight_high=current_weight_high,
+        weaning_weight_high=weaning_weight_high,
+        vaccination=codes[:, 0],
+        health_status=codes[:, 1],
+        disease_negative=flags[:, 0],
+        hereditary_negative=flags[:, 1],
+        fertility_status=codes[:, 2],
+        successful_breedings=breedings[:, 0],
+        failed_breedings=breedings[:, 1],
+        present=present,
+        penalty_hereditary=flags[:, 2],
+        penalty_health=flags[:, 3],
+        penalty_fertility=flags[:, 4],
+    )
+
+# Internal helper for score from range.
+def _score_from_range(values: np.ndarray, low: Any, high: Any) -> np.ndarray:
+    return np.clip((values - low) / (high - low), 0.0, 1.0)
+
+# Internal helper for average.
+def _nan_average(matrix: np.ndarray, default: float = 0.5) -> np.ndarray:
+    """Row mean over present (non-NaN) entries, `default` where none are present."""
+
+    mask = ~np.isnan(matrix)
+    count = mask.sum(axis=1)
+    total = np.where(mask, matrix, 0.0).sum(axis=1)
+    mean = np.divide(total, count, out=np.full(len(matrix), default), where=count > 0)
+    return np.clip(mean, 0.0, 1.0)
+
+# Calculates the performance score for every candidate.
+def score_performance(columns: CandidateColumns) -> np.ndarray:
+    numeric = columns.numeric
+    traits = [_score_from_range(numeric[name], low, high) for name, low, high in PERFORMANCE_RANGES]
+    traits.append(_score_from_range(numeric["current_weight"], 0.0, columns.current_weight_high))
+    traits.append(_score_from_range(numeric["weaning_weight"], 0.0, columns.weaning_weight_high))
+    return _nan_average(np.column_stack(traits))
+
+# Calculates the health score for every candidate.
+def score_health(columns: CandidateColumns) -> np.ndarray:
+    score = np.full(len(columns), 0.70)
+    score += np.select([columns.vaccination > 0, columns.vaccination < 0], [0.15, -0.15], 0.0)
+    score -= np.where(columns.disease_negative, 0.25, 0.0)
+    score -= np.where(columns.hereditary_negative, 0.40, 0.0)
+    score += np.select([columns.health_status < 0, columns.health_status > 0], [-0.35, 0.10], 0.0)
+    return np.clip(score, 0.0, 1.0)
+
+# Calculates the fertility score for every candidate.
+def score_fertility(columns: CandidateColumns) -> np.ndarray:
+    numeric = columns.numeric
+    successful = columns.successful_breedings
+    failed = columns.failed_breedings
+    outcomes = successful + failed
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        traits = np.column_stack([
+            np.select([columns.fertility_status > 0, columns.fertility_status < 0], [0.90, 0.20], np.nan),
+            np.clip(1 - (numeric["services_per_conception"] - 1) / 3, 0.0, 1.0),
+            np.clip(1 - (numeric["birth_interval_days"] - 365) / 365, 0.0, 1.0),
+            np.clip(1 - np.abs(numeric["age_at_first_service_months"] - 18) / 24, 0.0, 1.0),
+            np.where(outcomes > 0, np.clip(successful / np.maximum(outcomes, 1), 0.0, 1.0), np.nan),
+        ])
+    return _nan_average(traits)
+
+# Calculates the offspring score for every candidate.
+def score_offspring(columns: CandidateColumns) -> np.ndarray:
+    numeric = columns.numeric
+    rate = numeric["offspring_survival_rate"]
+    traits = np.column_stack([
+        np.clip(np.where(rate > 1, rate / 100.0, rate), 0.0, 1.0),
+        np.clip(numeric["offspring_quality_score"] / 100.0, 0.0, 1.0),
+        _score_from_range(numeric["offspring_count"], 0.0, 10.0),
+    ])
+    return _nan_average(traits)
+
+# Calculates the data confidence score for every candidate.
+def score_data_confidence(columns: CandidateColumns) -> np.ndarray:
+    return np.round(columns.present.mean(axis=1), 4)
+
+# Calculates the sire-only component matrix.
+def sire_component_matrix(columns: CandidateColumns) -> np.ndarray:
+    """n × 5 matrix of performance, health, fertility, offspring and confidence."""
+
+    return np.column_stack([
+        score_performance(columns),
+        score_health(columns),
+        score_fertility(columns),
+        score_offspring(columns),
+        score_data_confidence(columns),
+    ])
+
+# Calculates the genetic diversity score for an array of COI values.
+def score_genetic_diversity(coi: np.ndarray) -> np.ndarray:
+    coi = np.asarray(coi, dtype=float)
+    return np.select([coi >= 0.125, coi >= 0.0625, coi >= 0.03125, coi >= 0.01], [0.05, 0.35, 0.65, 0.85], 1.0)
+
+# Calculates the sire-only risk penalty for every candidate.
+def sire_penalties(columns: CandidateColumns) -> np.ndarray:
+    successful = columns.successful_breedings
+    failed = columns.failed_breedings
+    penalty = np.where(columns.penalty_hereditary, 0.35, 0.0)
+    penalty += np.where(columns.penalty_health, 0.20, 0.0)
+    penalty += np.where(columns.penalty_fertility, 0.20, 0.0)
+    penalty += np.select(
+        [(failed >= 3) & (successful == 0), (failed > successful) & (failed >= 2)], [0.20, 0.10], 0.0
+    )
+    return penalty
+
+# Calculates the close-relationship penalty of every candidate sire with one dam.
+def relationship_penalties(columns: CandidateColumns, dam: Any) -> np.ndarray:
+    """0.25 per flag `detect_relationship_risks` would raise for the pair."""
+
+    ids, sire_ids, dam_ids = columns.ids, columns.sire_ids, columns.dam_ids
+    dam_sire, dam_dam = dam.sire_id or 0, dam.dam_id or 0
+    same_sire = (sire_ids != 0) & (sire_ids == dam_sire)
+    same_dam = (dam_ids != 0) & (dam_ids == dam_dam)
+    flags = (
+        (ids == dam.id).astype(int)
+        + ((ids == dam_sire) | (ids == dam_dam))
+        + ((sire_ids == dam.id) | (dam_ids == dam.id))
+        + (same_sire | same_dam)
+    )
+    return 0.25 * flags
+
+# Calculates the COI-band penalty for an array of COI values.
+def coi_penalties(coi: np.ndarray) -> np.ndarray:
+    coi = np.asarray(coi, dtype=float)
+    return np.select([coi >= 0.125, coi >= 0.0625, coi >= 0.03125], [0.40, 0.20, 0.08], 0.0)
+
+# Calculates the hereditary-risk penalty for an array of P(affected offspring) values.
+def carrier_penalties(risk: np.ndarray) -> np.ndarray:
+    risk = np.asarray(risk, dtype=float)
+    return np.select([risk >= 0.25, risk >= 0.02], [0.35, 0.10], 0.0)
+
+# Calculates final scores for every candidate sire against one dam.
+def score_candidates(
+    columns: CandidateColumns,
+    dam: Any,
+    coi: np.ndarray,
+    components: Optional[np.ndarray] = None,
+    carrier_risk: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Score every candidate sire in `columns` against `dam` given the projected
+    offspring COI per candidate. Pass `components` (from
+    `sire_component_matrix`) to reuse the sire-only work across dams, and
+    `carrier_risk` (highest P(affected offspring) per candidate) to apply
+    the hereditary-risk penalty.
+
+    Returns arrays keyed like the `evaluate_pair` fields they mirror:
+    `components` (n × 6, in `COMPONENT_ORDER`), `weighted_score`,
+    `penalty_score` and unrounded `final_score`.
+    """
+
+    if components is None:
+        components = sire_component_matrix(columns)
+
+    coi = np.broadcast_to(np.asarray(coi, dtype=float), (len(columns),))
+    matrix = np.column_stack([score_genetic_diversity(coi), components])
+    weighted_score = matrix @ WEIGHT_VECTOR
+    penalty_score = coi_penalties(coi) + relationship_penalties(columns, dam) + sire_penalties(columns)
+
+    if carrier_risk is not None:
+        penalty_score = penalty_score + carrier_penalties(carrier_risk)
+
+    penalty_score = np.clip(penalty_score, 0.0, 0.90)
+    return {
+        "components": matrix,
+        "weighted_score": weighted_score,
+        "penalty_score": penalty_score,
+        "final_score": np.clip(weighted_score - penalty_score, 0.0, 1.0),
+    }
+
+# Retrieves the indices of the best-scoring candidates.
+def top_candidates(final_score: np.ndarray, top_n: int) -> List[int]:
+    """Indices of the `top_n` highest scores, best first, ties by position."""
+
+    if top_n <= 0 or not len(final_score):
+        return []
+
+    top_n = min(top_n, len(final_score))
+    chosen = np.argpartition(-final_score, top_n - 1)[:top_n]
+    return sorted(chosen.tolist(), key=lambda index: (-final_score[index], index))
@@ -0,0 +1,295 @@
+# Backend/app/inbreeding.py: contains backend logic for the Animal Breed Registry System.
+"""
+Whole-pedigree inbreeding engine for the Animal Breed Registry System.
+
+`compute_inbreeding_coefficient` in genetics.py answers "what would the
+offspring of this pair look like?" by walking a bounded number of generations.
+This module computes the exact inbreeding coefficient F of every registered
+animal with the Meuwissen & Luo (1992) algorithm: animals are processed in
+topological order and each F is read off the diagonal of the relationship
+matrix by tracing only that animal's own ancestors. Results are stored on
+`animals.inbreeding_coefficient` so lookups are a column read.
+"""
+
+from __future__ import annotations
+import heapq
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from . import models, pedigree
+from .pedigree import PedigreeNode, get_descendant_ids, get_pedigree_index, get_pedigree_nodes
+
+# Deep enough to reach the founders of any realistic livestock pedigree.
+FULL_PEDIGREE_DEPTH = 64
+_VIRTUAL_OFFSPRING_ID = -1
+
+# Retrieves the registered parents of a pedigree node.
+def known_parents(node: PedigreeNode, nodes: Mapping[int, PedigreeNode]) -> List[int]:
+    """Parents that are themselves registered; dangling parent IDs count as unknown."""
+
+    return [parent_id for parent_id in (node.sire_id, node.dam_id) if parent_id and nodes.get(parent_id)]
+
+# Handles pedigree closure logic for this module.
+def pedigree_closure(nodes: Mapping[int, PedigreeNode], animal_ids: Iterable[int]) -> Set[int]:
+    """Return the given animals plus every registered ancestor."""
+
+    closure: Set[int] = set()
+    queue = deque(animal_id for animal_id in animal_ids if nodes.get(animal_id))
+
+    while queue:
+        animal_id = queue.popleft()
+
+        if animal_id in closure:
+            continue
+
+        closure.add(animal_id)
+        queue.extend(known_parents(nodes.get(animal_id), nodes))
+    return closure
+
+# Handles topological order logic for this module.
+def topological_order(nodes: Mapping[int, PedigreeNode], animal_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """
+    Order animals so every parent precedes its offspring.
+
+    Animals are grouped by generation number (founders are 0) and full
+    siblings end up adjacent, which the Meuwissen–Luo pass exploits. Raises
+    ValueError when the recorded parentage contains a cycle.
+    """
+
+    members = set(animal_ids) if animal_ids is not None else {node.id for node in nodes.values()}
+    members = {animal_id for animal_id in members if nodes.get(animal_id)}
+    pending: Dict[int, int] = {}
+    children: Dict[int, List[int]] = defaultdict(list)
+
+    for animal_id in members:
+        parents = [p for p in known_parents(nodes.get(animal_id), nodes) if p in members]
+        pending[animal_id] = len(parents)
+
+        for parent_id in parents:
+            children[parent_id].append(animal_id)
+
+    generation = {animal_id: 0 for animal_id, count in pending.items() if count == 0}
+    queue = deque(generation)
+
+    while queue:
+        parent_id = queue.popleft()
+
+        for child_id in children[parent_id]:
+            generation[child_id] = max(generation.get(child_id, 0), generation[parent_id] + 1)
+            pending[child_id] -= 1
+
+            if pending[child_id] == 0:
+                queue.append(child_id)
+
+    if len(generation) != len(members):
+        cyclic = sorted(members - set(generation))[:10]
+        raise ValueError(f"Pedigree contains a parentage cycle involving animals {cyclic}")
+
+    # Internal helper for sort key.
+    def sort_key(animal_id: int):
+        node = nodes.get(animal_id)
+        return (generation[animal_id], node.sire_id or 0, node.dam_id or 0, animal_id)
+
+    return sorted(members, key=sort_key)
+
+# Calculates the Mendelian sampling variance of an animal.
+def mendelian_variance(parent_f: List[float]) -> float:
+    """Diagonal D of A = TDT' given the inbreeding of the known parents."""
+
+    if len(parent_f) == 2:
+        return 0.5 - 0.25 * (parent_f[0] + parent_f[1])
+
+    if len(parent_f) == 1:
+        return 0.75 - 0.25 * parent_f[0]
+    return 1.0
+
+# Calculates inbreeding coefficients with the Meuwissen–Luo algorithm.
+def meuwissen_luo(
+    nodes: Mapping[int, PedigreeNode],
+    order: Optional[List[int]] = None,
+    stored: Optional[Mapping[int, float]] = None,
+) -> Dict[int, float]:
+    """
+    Return `{animal_db_id: F}` for every animal in `order` (default: all of
+    `nodes`, topologically sorted). `order` must contain each animal's
+    registered ancestors before the animal itself. Animals in `stored` keep
+    their known F and are not traced again.
+
+    For each animal, a_ii = Σ_j L_ij² D_j is accumulated over its ancestors
+    only, visited from youngest to oldest through a max-heap on topological
+    position; F_i = a_ii − 1. Consecutive full siblings reuse the previous F.
+    """
+
+    if order is None:
+        order = topological_order(nodes)
+
+    stored = stored or {}
+    position = {animal_id: index for index, animal_id in enumerate(order)}
+    inbreeding: Dict[int, float] = {}
+    variance: Dict[int, float] = {}
+    previous_parents = None
+
+    for animal_id in order:
+        parents = [p for p in known_parents(nodes.get(animal_id), nodes) if p in position]
+        variance[animal_id] = mendelian_variance([inbreeding[p] for p in parents])
+
+        if animal_id in stored:
+            inbreeding[animal_id] = stored[animal_id]
+            previous_parents = None
+            continue
+
+        if not parents:
+            inbreeding[animal_id] = 0.0
+            previous_parents = None
+            continue
+
+        if len(parents) == 2 and tuple(parents) == previous_parents:
+            inbreeding[animal_id] = inbreeding[order[position[animal_id] - 1]]
+            continue
+
+        weights: Dict[int, float] = {animal_id: 1.0}
+        heap = [-position[animal_id]]
+        diagonal = 0.0
+
+        while heap:
+            current_id = order[-heapq.heappop(heap)]
+            weight = weights.pop(current_id)
+            diagonal += weight * weight * variance[current_id]
+
+            for parent_id in known_parents(nodes.get(current_id), nodes):
+                if parent_id not in position:
+                    continue
+
+                if parent_id not in weights:
+                    weights[parent_id] = 0.0
+                    heapq.heappush(heap, -position[parent_id])
+
+                weights[parent_id] += 0.5 * weight
+
+        inbreeding[animal_id] = max(diagonal - 1.0, 0.0)
+        previous_parents = tuple(parents) if len(parents) == 2 else None
+    return inbreeding
+
+# Calculates the exact inbreeding coefficient of a hypothetical offspring.
+def offspring_inbreeding(nodes: Mapping[int, PedigreeNode], sire_id: int, dam_id: int) -> float:
+    """
+    F of a sire × dam offspring over the full registered pedigree, i.e. half
+    the additive relationship of the parents. Unlike the bounded path sum in
+    genetics.py this accounts for the real inbreeding of every ancestor.
+    """
+
+    closure = pedigree_closure(nodes, [sire_id, dam_id])
+    local: Dict[int, PedigreeNode] = {animal_id: nodes.get(animal_id) for animal_id in closure}
+    local[_VIRTUAL_OFFSPRING_ID] = PedigreeNode(_VIRTUAL_OFFSPRING_ID, sire_id, dam_id, "", "", None)
+    values = meuwissen_luo(local, topological_order(local))
+    return round(values[_VIRTUAL_OFFSPRING_ID], 6)
+
+# Internal helper for persist inbreeding.
+def _persist_inbreeding(db: Session, values: Mapping[int, float]) -> None:
+    if not values:
+        return
+
+    computed_at = datetime.now(timezone.utc)
+    rounded = {animal_id: round(value, 6) for animal_id, value in values.items()}
+    db.execute(
+        update(models.Animal),
+        [{"id": animal_id, "inbreeding_coefficient": value, "inbreeding_computed_at": computed_at} for animal_id, value in rounded.items()],
+    )
+    db.commit()
+
+    if pedigree.PEDIGREE_INDEX_ENABLED:
+        get_pedigree_index(db).set_inbreeding(rounded)
+
+# Handles refresh inbreeding coefficients logic for this module.
+def refresh_inbreeding_coefficients(db: Session, *, animal_type: Optional[str] = None, breed: Optional[str] = None) -> int:
+    """
+    Compute and store F for every animal of `animal_type` (and `breed` when
+    given), together with all of their registered ancestors. Returns the
+    number of animals written.
+    """
+
+    query = db.query(models.Animal.id)
+
+    if animal_type:
+        query = query.filter(models.Animal.animal_type == animal_type)
+
+    if breed:
+        query = query.filter(models.Animal.breed == breed)
+
+    target_ids = [row.id for row in query.all()]
+    nodes = get_pedigree_nodes(db, target_ids, FULL_PEDIGREE_DEPTH)
+    closure = pedigree_closure(nodes, target_ids)
+    values = meuwissen_luo(nodes, topological_order(nodes, closure))
+    _persist_inbreeding(db, values)
+    return len(values)
+
+# Retrieves the stored inbreeding coefficient, computing it on first use.
+def get_animal_inbreeding(db: Session, animal: models.Animal) -> float:
+    """
+    Return the exact F of a registered animal. Values already stored are a
+    column read; otherwise F is computed for the animal's ancestor closure
+    and stored for next time.
+    """
+
+    if animal.inbreeding_coefficient is not None:
+        return animal.inbreeding_coefficient
+
+    nodes = get_pedigree_nodes(db, [animal.id], FULL_PEDIGREE_DEPTH)
+    closure = pedigree_closure(nodes, [animal.id])
+    values = meuwissen_luo(nodes, topological_order(nodes, closure))
+    _persist_inbreeding(db, values)
+    db.refresh(animal)
+    return round(values.get(animal.id, 0.0), 6)
+
+# Handles invalidate inbreeding logic for this module.
+def invalidate_inbreeding(db: Session, animal_ids: Iterable[int], commit: bool = True) -> Set[int]:
+    """
+    Clear stored F for animals whose parentage changed and for all of their
+    descendants, whose values depend on it. Returns the cleared IDs. With
+    `commit=False` the caller commits, e.g. together with the parentage edit.
+    """
+
+    stale = get_descendant_ids(db, animal_ids)
+
+    if not stale:
+        return stale
+
+    db.query(models.Animal).filter(models.Animal.id.in_(stale)).update(
+        {models.Animal.inbreeding_coefficient: None, models.Animal.inbreeding_computed_at: None},
+        synchronize_session="fetch",
+    )
+
+    if commit:
+        db.commit()
+
+    if pedigree.PEDIGREE_INDEX_ENABLED:
+        get_pedigree_index(db).set_inbreeding({animal_id: None for animal_id in stale})
+    return stale
+
+# Handles recompute inbreeding cone logic for this module.
+def recompute_inbreeding_cone(db: Session, animal_ids: Iterable[int]) -> Dict[int, float]:
+    """
+    Recompute and store F for `animal_ids` and all of their descendants,
+    parents before offspring. Ancestors outside that cone keep their stored
+    F; the ones without a stored value are computed along the way. Returns
+    the values written.
+    """
+
+    cone = get_descendant_ids(db, animal_ids)
+
+    if not cone:
+        return {}
+
+    nodes = get_pedigree_nodes(db, cone, FULL_PEDIGREE_DEPTH)
+    closure = pedigree_closure(nodes, cone)
+    stored = {
+        animal_id: nodes.get(animal_id).inbreeding_coefficient
+        for animal_id in closure - cone
+        if nodes.get(animal_id).inbreeding_coefficient is not None
+    }
+    values = meuwissen_luo(nodes, topological_order(nodes, closure), stored=stored)
+    values = {animal_id: value for animal_id, value in values.items() if animal_id not in stored}
+    _persist_inbreeding(db, values)
+    return values
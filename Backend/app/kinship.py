@@ -0,0 +1,76 @@
+# Backend/app/kinship.py: contains backend logic for the Animal Breed Registry System.
+"""
+Kinship (coancestry) matrices for arbitrary sets of animals.
+
+The additive relationship matrix factorises as A = T D T' with
+T = (I − P)⁻¹, where P holds ½ for each known parent and D is the diagonal
+of Mendelian sampling variances. Colleau's indirect method never forms A:
+the columns of A for k selected animals are obtained from two sparse
+triangular solves against k unit vectors, each linear in the size of the
+pedigree. Only the selected animals' ancestors take part, because
+relationships among them do not depend on anyone else.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Mapping, Sequence
+import numpy as np
+from scipy.sparse import csr_matrix, identity
+from scipy.sparse.linalg import spsolve_triangular
+from .inbreeding import known_parents, mendelian_variance, meuwissen_luo, pedigree_closure, topological_order
+from .pedigree import PedigreeNode
+
+# Internal helper for closure inbreeding.
+def _closure_inbreeding(nodes: Mapping[int, PedigreeNode], order: List[int]) -> Dict[int, float]:
+    """Stored F when every animal has one; otherwise computed for the closure."""
+
+    stored = {animal_id: nodes.get(animal_id).inbreeding_coefficient for animal_id in order}
+
+    if all(value is not None for value in stored.values()):
+        return stored
+    return meuwissen_luo(nodes, order)
+
+# Calculates the kinship submatrix with Colleau's indirect method.
+def kinship_matrix(nodes: Mapping[int, PedigreeNode], animal_ids: Sequence[int]) -> np.ndarray:
+    """
+    Return the dense k × k coancestry matrix for `animal_ids`, in the given
+    order. Entry (i, j) is the kinship f_ij = a_ij / 2; the diagonal is
+    (1 + F_i) / 2, and the offspring of a pair has F = f_sire,dam.
+
+    Raises ValueError when an ID is not in `nodes`.
+    """
+
+    missing = [animal_id for animal_id in animal_ids if not nodes.get(animal_id)]
+
+    if missing:
+        raise ValueError(f"Animals not found in pedigree: {missing[:10]}")
+
+    if not animal_ids:
+        return np.zeros((0, 0))
+
+    order = topological_order(nodes, pedigree_closure(nodes, animal_ids))
+    position = {animal_id: index for index, animal_id in enumerate(order)}
+    inbreeding = _closure_inbreeding(nodes, order)
+    size = len(order)
+
+    rows: List[int] = []
+    cols: List[int] = []
+    variances = np.empty(size)
+
+    for index, animal_id in enumerate(order):
+        parents = known_parents(nodes.get(animal_id), nodes)
+        variances[index] = mendelian_variance([inbreeding[parent_id] for parent_id in parents])
+        rows.extend([index] * len(parents))
+        cols.extend(position[parent_id] for parent_id in parents)
+
+    # Parents precede offspring, so I − P is unit lower triangular.
+    P = csr_matrix((np.full(len(rows), 0.5), (rows, cols)), shape=(size, size))
+    I_minus_P = (identity(size, format="csr") - P).tocsr()
+
+    selected = [position[animal_id] for animal_id in animal_ids]
+    E = np.zeros((size, len(selected)))
+    E[selected, np.arange(len(selected))] = 1.0
+
+    # A E = T D T' E: back-substitute towards ancestors, scale, then forward towards descendants.
+    upward = spsolve_triangular(I_minus_P.T.tocsr(), E, lower=False, unit_diagonal=True)
+    columns = spsolve_triangular(I_minus_P, variances[:, None] * upward, lower=True, unit_diagonal=True)
+    return columns[selected, :] / 2.0
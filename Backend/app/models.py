@@ -1,5 +1,5 @@
 # Backend/app/models.py: contains backend logic for the Animal Breed Registry System.
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, text, Date, Text, Float, Boolean
+from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, text, Date, Text, Float, Boolean, Index
 from sqlalchemy.orm import relationship, Session
 from .database import Base
 
@@ -43,6 +43,8 @@ class Breeder(Base):
 # Defines the animal structure used by this module.
 class Animal(Base):
     __tablename__ = "animals"
+    # Candidate-sire selection filters on these columns (migrations/008).
+    __table_args__ = (Index("idx_animals_type_gender_breed", "animal_type", "gender", "breed"),)
     id = Column(Integer, primary_key=True, index=True)
     animal_id = Column(String(50), unique=True, index=True, nullable=False)
     animal_type = Column(String(50), nullable=False)
@@ -53,6 +55,10 @@ class Animal(Base):
     dam_id = Column(Integer, ForeignKey("animals.id"), nullable=True)
     breeder_id = Column(Integer, ForeignKey("breeders.id"), nullable=False)
     updated_at = Column(TIMESTAMP, nullable=True)
+    inbreeding_coefficient = Column(Float, nullable=True)
+    inbreeding_computed_at = Column(TIMESTAMP, nullable=True)
+    # Not stored: size of the descendant cone queued by the last sire/dam correction.
+    pedigree_recompute_count = None
 
     # Internal helper for latest measurement value.
     def _latest_measurement_value(self, *measurement_types):
@@ -72,127 +78,171 @@ class Animal(Base):
     @property
     # Handles birth weight logic for this module.
     def birth_weight(self):
+        if self.current_state is not None:
+            return self.current_state.birth_weight
         return self._latest_measurement_value("birth_weight")
 
     @property
     # Handles current weight logic for this module.
     def current_weight(self):
+        if self.current_state is not None:
+            return self.current_state.current_weight
         return self._latest_measurement_value("current_weight", "weight")
 
     @property
     # Handles weaning weight logic for this module.
     def weaning_weight(self):
+        if self.current_state is not None:
+            return self.current_state.weaning_weight
         return self._latest_measurement_value("weaning_weight")
 
     @property
     # Handles mature weight logic for this module.
     def mature_weight(self):
+        if self.current_state is not None:
+            return self.current_state.mature_weight
         return self._latest_measurement_value("mature_weight")
 
     @property
     # Handles body condition score logic for this module.
     def body_condition_score(self):
+        if self.current_state is not None:
+            return self.current_state.body_condition_score
         return self._latest_measurement_value("body_condition_score")
 
     @property
     # Handles health status logic for this module.
     def health_status(self):
+        if self.current_state is not None:
+            return self.current_state.health_status
         rec = self._latest_record(self.health_records)
         return rec.health_status if rec else None
 
     @property
     # Handles vaccination status logic for this module.
     def vaccination_status(self):
+        if self.current_state is not None:
+            return self.current_state.vaccination_status
         rec = self._latest_record(self.health_records)
         return rec.vaccination_status if rec else None
 
     @property
     # Handles disease history logic for this module.
     def disease_history(self):
+        if self.current_state is not None:
+            return self.current_state.disease_history
         rec = self._latest_record(self.health_records)
         return rec.disease_history if rec else None
 
     @property
     # Handles hereditary conditions logic for this module.
     def hereditary_conditions(self):
+        if self.current_state is not None:
+            return self.current_state.hereditary_conditions
         rec = self._latest_record(self.health_records)
         return rec.hereditary_conditions if rec else None
 
     @property
     # Handles vet notes logic for this module.
     def vet_notes(self):
+        if self.current_state is not None:
+            return self.current_state.vet_notes
         rec = self._latest_record(self.health_records)
         return rec.vet_notes if rec else None
 
     @property
     # Handles fertility status logic for this module.
     def fertility_status(self):
+        if self.current_state is not None:
+            return self.current_state.fertility_status
         rec = self._latest_record(self.fertility_records)
         return rec.fertility_status if rec else None
 
     @property
     # Handles age at first service months logic for this module.
     def age_at_first_service_months(self):
+        if self.current_state is not None:
+            return self.current_state.age_at_first_service_months
         rec = self._latest_record(self.fertility_records)
         return rec.age_at_first_service_months if rec else None
 
     @property
     # Handles services per conception logic for this module.
     def services_per_conception(self):
+        if self.current_state is not None:
+            return self.current_state.services_per_conception
         rec = self._latest_record(self.fertility_records)
         return rec.services_per_conception if rec else None
 
     @property
     # Handles birth interval days logic for this module.
     def birth_interval_days(self):
+        if self.current_state is not None:
+            return self.current_state.birth_interval_days
         rec = self._latest_record(self.fertility_records)
         return rec.birth_interval_days if rec else None
 
     @property
     # Handles offspring count logic for this module.
     def offspring_count(self):
+        if self.current_state is not None:
+            return self.current_state.offspring_count
         rec = self._latest_record(self.offspring_records)
         return rec.offspring_count if rec else None
 
     @property
     # Handles offspring survival rate logic for this module.
     def offspring_survival_rate(self):
+        if self.current_state is not None:
+            return self.current_state.offspring_survival_rate
         rec = self._latest_record(self.offspring_records)
         return rec.offspring_survival_rate if rec else None
 
     @property
     # Handles offspring quality score logic for this module.
     def offspring_quality_score(self):
+        if self.current_state is not None:
+            return self.current_state.offspring_quality_score
         rec = self._latest_record(self.offspring_records)
         return rec.offspring_quality_score if rec else None
 
     @property
     # Handles production type logic for this module.
     def production_type(self):
+        if self.current_state is not None:
+            return self.current_state.production_type
         rec = self._latest_record(self.production_records)
         return rec.production_type if rec else None
 
     @property
     # Handles daily milk yield logic for this module.
     def daily_milk_yield(self):
+        if self.current_state is not None:
+            return self.current_state.daily_milk_yield
         rec = self._latest_record(self.production_records)
         return rec.daily_milk_yield if rec else None
 
     @property
     # Handles milk fat percent logic for this module.
     def milk_fat_percent(self):
+        if self.current_state is not None:
+            return self.current_state.milk_fat_percent
         rec = self._latest_record(self.production_records)
         return rec.milk_fat_percent if rec else None
 
     @property
     # Handles egg count annual logic for this module.
     def egg_count_annual(self):
+        if self.current_state is not None:
+            return self.current_state.egg_count_annual
         rec = self._latest_record(self.production_records)
         return rec.egg_count_annual if rec else None
 
     @property
     # Handles average daily gain logic for this module.
     def average_daily_gain(self):
+        if self.current_state is not None:
+            return self.current_state.average_daily_gain
         rec = self._latest_record(self.production_records)
         if rec and rec.average_daily_gain is not None:
             return rec.average_daily_gain
@@ -208,6 +258,78 @@ class Animal(Base):
     production_records = relationship("AnimalProductionRecord", back_populates="animal", cascade="all, delete-orphan")
     offspring_records = relationship("AnimalOffspringRecord", back_populates="animal", cascade="all, delete-orphan")
     notes = relationship("AnimalNote", back_populates="animal", cascade="all, delete-orphan")
+    current_state = relationship("AnimalCurrentState", uselist=False, lazy="joined", viewonly=True)
+
+# Defines the animal pedigree completeness structure used by this module.
+class AnimalPedigreeCompleteness(Base):
+    """
+    Per-animal pedigree completeness maintained by Backend/app/pedigree_completeness.py.
+
+    `known_slots` and `expected_slots` hold comma-separated slot counts for
+    generations 1..COMPLETENESS_DEPTH (parents first).
+    """
+
+    __tablename__ = "animal_pedigree_completeness"
+    animal_id = Column(Integer, ForeignKey("animals.id", ondelete="CASCADE"), primary_key=True)
+    known_slots = Column(Text, nullable=False)
+    expected_slots = Column(Text, nullable=False)
+    equivalent_generations = Column(Float, nullable=False)
+    pec = Column(Float, nullable=False)
+    computed_at = Column(TIMESTAMP, nullable=True)
+
+# Defines the animal current state structure used by this module.
+class AnimalCurrentState(Base):
+    """
+    One row per animal holding the latest value from each history table.
+
+    Maintained on write by current_state.refresh_current_state in the same
+    transaction as the record it summarises; the *_date columns are the dates
+    of the records the values came from (NULL when no record exists).
+    """
+
+    __tablename__ = "animal_current_state"
+    animal_id = Column(Integer, ForeignKey("animals.id", ondelete="CASCADE"), primary_key=True)
+    latest_measured_at = Column(Date, nullable=True)
+    birth_weight = Column(Float, nullable=True)
+    current_weight = Column(Float, nullable=True)
+    weaning_weight = Column(Float, nullable=True)
+    mature_weight = Column(Float, nullable=True)
+    body_condition_score = Column(Float, nullable=True)
+    average_daily_gain = Column(Float, nullable=True)
+    health_record_date = Column(Date, nullable=True)
+    health_status = Column(String(50), nullable=True)
+    vaccination_status = Column(String(50), nullable=True)
+    disease_history = Column(Text, nullable=True)
+    hereditary_conditions = Column(Text, nullable=True)
+    vet_notes = Column(Text, nullable=True)
+    fertility_record_date = Column(Date, nullable=True)
+    fertility_status = Column(String(50), nullable=True)
+    age_at_first_service_months = Column(Float, nullable=True)
+    services_per_conception = Column(Float, nullable=True)
+    birth_interval_days = Column(Float, nullable=True)
+    production_record_date = Column(Date, nullable=True)
+    production_type = Column(String(50), nullable=True)
+    daily_milk_yield = Column(Float, nullable=True)
+    milk_fat_percent = Column(Float, nullable=True)
+    egg_count_annual = Column(Integer, nullable=True)
+    offspring_record_date = Column(Date, nullable=True)
+    offspring_count = Column(Integer, nullable=True)
+    offspring_survival_rate = Column(Float, nullable=True)
+    offspring_quality_score = Column(Float, nullable=True)
+    updated_at = Column(TIMESTAMP, nullable=True)
+
+# Defines the pedigree epoch structure used by this module.
+class PedigreeEpoch(Base):
+    """
+    Monotonic counter bumped whenever parentage changes. Scope "__all__" is
+    the global epoch; every other scope is an animal_type. Cached genetics
+    results are stamped with the epoch they were computed under.
+    """
+
+    __tablename__ = "pedigree_epochs"
+    scope = Column(String(50), primary_key=True)
+    epoch = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP, nullable=True)
 
 # Defines the animal measurement structure used by this module.
 class AnimalMeasurement(Base):
@@ -0,0 +1,598 @@
+# Backend/app/pedigree.py: contains backend logic for the Animal Breed Registry System.
+"""
+Process-level pedigree index for the genetics engine.
+
+COI, pedigree completeness and relationship checks only need each animal's
+parentage, yet they used to issue one SELECT per ancestor visited. The index
+loads `(id, sire_id, dam_id, animal_type, gender, date_of_birth)` for every
+animal once per database engine and keeps it in memory. `crud` applies
+incremental updates whenever an animal is created, edited or deleted, so the
+genetics engine can walk pedigrees without touching the database.
+
+Each worker process holds its own copy. Deployments running several workers
+can bound staleness with `PEDIGREE_INDEX_MAX_AGE_SECONDS`, which forces a full
+reload once the copy is older than the configured age.
+
+The index also mirrors the pedigree epochs (`pedigree_epochs` table): one
+counter for the whole registry and one per animal_type, bumped in the same
+transaction as any create, delete or parentage change. Cached genetics
+results are stamped with the epoch they were computed under, so an entry is
+valid exactly while its epoch is current. `get_pedigree_epoch` reads the
+epoch row on every call; when another worker has moved it, the index
+reloads that animal_type before the epoch is handed out.
+
+Registries too large to hold in memory can set `PEDIGREE_INDEX_ENABLED=false`.
+Pedigree walks then use `load_ancestor_nodes`, which fetches the whole ancestor
+set of one or more roots in a single recursive CTE.
+"""
+
+from __future__ import annotations
+import os
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Set, Tuple
+from sqlalchemy import bindparam, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from . import models
+
+PEDIGREE_INDEX_ENABLED = os.getenv("PEDIGREE_INDEX_ENABLED", "true").lower() not in {"0", "false", "no"}
+PEDIGREE_INDEX_MAX_AGE_SECONDS = float(os.getenv("PEDIGREE_INDEX_MAX_AGE_SECONDS", "0"))
+GLOBAL_EPOCH_SCOPE = "__all__"
+
+@dataclass(frozen=True)
+
+# Defines the pedigree node structure used by this module.
+class PedigreeNode:
+    """Parentage columns of one animal, shaped like the ORM attributes it mirrors."""
+
+    id: int
+    sire_id: Optional[int]
+    dam_id: Optional[int]
+    animal_type: Optional[str]
+    gender: Optional[str]
+    date_of_birth: Optional[date]
+    inbreeding_coefficient: Optional[float] = None
+
+@dataclass(frozen=True)
+
+# Defines the pedigree completeness structure used by this module.
+class PedigreeCompleteness:
+    """
+    Stored completeness of one animal (see pedigree_completeness.py):
+    known and expected ancestor slots per generation, starting with the
+    parents, plus equivalent complete generations and the MacCluer index.
+    """
+
+    known_slots: Tuple[int, ...]
+    expected_slots: Tuple[int, ...]
+    equivalent_generations: float
+    pec: float
+
+# Internal helper for node query.
+def _node_query(db: Session):
+    return db.query(
+        models.Animal.id,
+        models.Animal.sire_id,
+        models.Animal.dam_id,
+        models.Animal.animal_type,
+        models.Animal.gender,
+        models.Animal.date_of_birth,
+        models.Animal.inbreeding_coefficient,
+    )
+
+# Internal helper for stored epoch.
+def _stored_epoch(db: Session, scope: Optional[str]) -> int:
+    """One primary-key read of `pedigree_epochs`; 0 before the first bump."""
+
+    epoch = (
+        db.query(models.PedigreeEpoch.epoch)
+        .filter(models.PedigreeEpoch.scope == (scope or GLOBAL_EPOCH_SCOPE))
+        .scalar()
+    )
+    return epoch or 0
+
+# Internal helper for node from animal.
+def _node_from_animal(animal: Any) -> PedigreeNode:
+    return PedigreeNode(
+        id=animal.id,
+        sire_id=animal.sire_id,
+        dam_id=animal.dam_id,
+        animal_type=animal.animal_type,
+        gender=animal.gender,
+        date_of_birth=animal.date_of_birth,
+        inbreeding_coefficient=getattr(animal, "inbreeding_coefficient", None),
+    )
+
+# Builds a completeness record from a stored row.
+def completeness_from_row(row: Any) -> PedigreeCompleteness:
+    return PedigreeCompleteness(
+        known_slots=tuple(int(value) for value in row.known_slots.split(",")),
+        expected_slots=tuple(int(value) for value in row.expected_slots.split(",")),
+        equivalent_generations=row.equivalent_generations,
+        pec=row.pec,
+    )
+
+# Defines the pedigree index structure used by this module.
+class PedigreeIndex:
+    """In-memory `{animal_db_id: PedigreeNode}` map for one database engine."""
+
+    # Internal helper for init.
+    def __init__(self) -> None:
+        self._nodes: Dict[int, PedigreeNode] = {}
+        self._children: Dict[int, Set[int]] = defaultdict(set)
+        self._epochs: Dict[str, int] = {}
+        self._completeness: Dict[int, PedigreeCompleteness] = {}
+        self._completeness_missing: Set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    @property
+
+    # Handles loaded logic for this module.
+    def loaded(self) -> bool:
+        if self._loaded_at is None:
+            return False
+
+        if PEDIGREE_INDEX_MAX_AGE_SECONDS > 0 and time.monotonic() - self._loaded_at > PEDIGREE_INDEX_MAX_AGE_SECONDS:
+            return False
+        return True
+
+    # Loads every animal's parentage in a single query.
+    def load(self, db: Session) -> None:
+        # Epochs first: a write landing during the load leaves the mirror behind, never ahead.
+        epochs = {row.scope: row.epoch for row in db.query(models.PedigreeEpoch.scope, models.PedigreeEpoch.epoch).all()}
+        rows = _node_query(db).all()
+        nodes = {row.id: _node_from_animal(row) for row in rows}
+        children: Dict[int, Set[int]] = defaultdict(set)
+
+        for node in nodes.values():
+            for parent_id in (node.sire_id, node.dam_id):
+                if parent_id:
+                    children[parent_id].add(node.id)
+
+        completeness = {row.animal_id: completeness_from_row(row) for row in db.query(models.AnimalPedigreeCompleteness).all()}
+
+        with self._lock:
+            self._nodes = nodes
+            self._children = children
+            self._epochs = epochs
+            self._completeness = completeness
+            self._completeness_missing = set()
+            self._loaded_at = time.monotonic()
+
+    # Reloads the nodes of one animal_type after another worker changed them.
+    def load_animal_type(self, db: Session, animal_type: str) -> None:
+        """
+        Replace every node and completeness record of `animal_type` and take
+        that type's epoch from the database. Other types keep their nodes and
+        epochs, so they are still checked on their own.
+        """
+
+        epoch = _stored_epoch(db, animal_type)
+        rows = _node_query(db).filter(models.Animal.animal_type == animal_type).all()
+        table = models.AnimalPedigreeCompleteness
+        completeness = {
+            row.animal_id: completeness_from_row(row)
+            for row in db.query(table).join(models.Animal, models.Animal.id == table.animal_id).filter(models.Animal.animal_type == animal_type).all()
+        }
+
+        with self._lock:
+            for animal_id in [node.id for node in self._nodes.values() if node.animal_type == animal_type]:
+                self._unlink_parents(self._nodes.pop(animal_id))
+                self._completeness.pop(animal_id, None)
+                self._completeness_missing.discard(animal_id)
+
+            for row in rows:
+                node = _node_from_animal(row)
+                self._unlink_parents(self._nodes.get(node.id))
+                self._nodes[node.id] = node
+
+                for parent_id in (node.sire_id, node.dam_id):
+                    if parent_id:
+                        self._children[parent_id].add(node.id)
+
+            self._completeness.update(completeness)
+            self._epochs[animal_type] = epoch
+
+    # Handles invalidate logic for this module.
+    def invalidate(self) -> None:
+        """Drop the cached copy; the next reader reloads it from the database."""
+
+        with self._lock:
+            self._nodes = {}
+            self._children = defaultdict(set)
+            self._epochs = {}
+            self._completeness = {}
+            self._completeness_missing = set()
+            self._loaded_at = None
+
+    # Internal helper for unlink parents.
+    def _unlink_parents(self, node: Optional[PedigreeNode]) -> None:
+        if not node:
+            return
+
+        for parent_id in (node.sire_id, node.dam_id):
+            if parent_id:
+                self._children[parent_id].discard(node.id)
+
+    # Handles upsert logic for this module.
+    def upsert(self, animal: Any, epochs: Optional[Mapping[str, int]] = None) -> None:
+        """Apply the node, then advance `epochs`, so no reader pairs the new epoch with old parentage."""
+
+        with self._lock:
+            if self._loaded_at is None:
+                return
+
+            node = _node_from_animal(animal)
+            self._unlink_parents(self._nodes.get(node.id))
+            self._nodes[node.id] = node
+            self._completeness_missing.discard(node.id)
+
+            for parent_id in (node.sire_id, node.dam_id):
+                if parent_id:
+                    self._children[parent_id].add(node.id)
+            self.advance_epochs(epochs)
+
+    # Removes the selected animal from the index.
+    def remove(self, animal_id: int, epochs: Optional[Mapping[str, int]] = None) -> None:
+        with self._lock:
+            self._unlink_parents(self._nodes.pop(animal_id, None))
+            self._children.pop(animal_id, None)
+            self._completeness.pop(animal_id, None)
+            self._completeness_missing.discard(animal_id)
+            self.advance_epochs(epochs)
+
+    # Updates stored inbreeding coefficients without touching parentage.
+    def set_inbreeding(self, values: Mapping[int, Optional[float]]) -> None:
+        with self._lock:
+            for animal_id, value in values.items():
+                node = self._nodes.get(animal_id)
+
+                if node:
+                    self._nodes[animal_id] = replace(node, inbreeding_coefficient=value)
+
+    # Updates stored pedigree completeness records; None drops a record.
+    def set_completeness(self, values: Mapping[int, Optional[PedigreeCompleteness]]) -> None:
+        with self._lock:
+            for animal_id, value in values.items():
+                self._completeness_missing.discard(animal_id)
+
+                if value is None:
+                    self._completeness.pop(animal_id, None)
+
+                elif animal_id in self._nodes:
+                    self._completeness[animal_id] = value
+
+    # Records animals whose completeness row was looked up and not found.
+    def mark_completeness_missing(self, animal_ids: Iterable[int]) -> None:
+        """
+        Remembered until the animal's type reloads or the animal is saved or
+        given a record, so a miss costs one query. Until then it falls back to
+        the pedigree walk, which gives the same values.
+        """
+
+        with self._lock:
+            self._completeness_missing.update(animal_id for animal_id in animal_ids if animal_id in self._nodes)
+
+    # Handles completeness missing logic for this module.
+    def completeness_missing(self, animal_id: Optional[int]) -> bool:
+        return animal_id in self._completeness_missing
+
+    # Retrieves the stored pedigree completeness of one animal.
+    def completeness(self, animal_id: Optional[int]) -> Optional[PedigreeCompleteness]:
+        if animal_id is None:
+            return None
+        return self._completeness.get(animal_id)
+
+    # Retrieves the pedigree epoch seen by this index.
+    def epoch(self, animal_type: Optional[str] = None) -> int:
+        return self._epochs.get(animal_type or GLOBAL_EPOCH_SCOPE, 0)
+
+    # Advances the mirrored epochs to the values a local parentage change committed.
+    def advance_epochs(self, epochs: Optional[Mapping[str, int]]) -> None:
+        with self._lock:
+            for scope, epoch in (epochs or {}).items():
+                self._epochs[scope] = max(self._epochs.get(scope, 0), epoch)
+
+    # Retrieves direct offspring from the index.
+    def children(self, animal_id: int) -> Set[int]:
+        return set(self._children.get(animal_id, ()))
+
+    # Retrieves every descendant of the given animals.
+    def descendants(self, animal_ids: Iterable[int], include_self: bool = True) -> Set[int]:
+        roots = {animal_id for animal_id in animal_ids if animal_id}
+        seen: Set[int] = set(roots) if include_self else set()
+        queue = deque(roots)
+
+        while queue:
+            for child_id in self._children.get(queue.popleft(), ()):
+                if child_id not in seen:
+                    seen.add(child_id)
+                    queue.append(child_id)
+        return seen
+
+    # Retrieves a node from the index.
+    def get(self, animal_id: Optional[int]) -> Optional[PedigreeNode]:
+        if animal_id is None:
+            return None
+        return self._nodes.get(animal_id)
+
+    # Retrieves parents from the index.
+    def parents(self, animal_id: Optional[int]) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        node = self.get(animal_id)
+        return (node.sire_id, node.dam_id) if node else None
+
+    # Internal helper for contains.
+    def __contains__(self, animal_id: object) -> bool:
+        return animal_id in self._nodes
+
+    # Internal helper for len.
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    # Internal helper for iter.
+    def __iter__(self) -> Iterator[PedigreeNode]:
+        return iter(list(self._nodes.values()))
+
+    # Handles graph logic for this module.
+    def graph(self, root_id: int, max_depth: int = 8) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+        return ancestor_graph(self._nodes, root_id, max_depth)
+
+# Handles ancestor graph logic for this module.
+def ancestor_graph(
+    nodes: Mapping[int, PedigreeNode],
+    root_id: int,
+    max_depth: int = 8,
+
+) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """
+    Return `{animal_db_id: (sire_db_id, dam_db_id)}` for `root_id` and its
+    ancestors up to `max_depth` generations, exactly like the BFS the
+    genetics engine used to run against the database.
+    """
+
+    graph: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+    queue = deque([(root_id, 0)])
+    visited: set = set()
+
+    while queue:
+        animal_id, depth = queue.popleft()
+
+        if animal_id in visited or depth > max_depth:
+            continue
+
+        visited.add(animal_id)
+
+        node = nodes.get(animal_id)
+
+        if not node:
+            continue
+
+        graph[animal_id] = (node.sire_id, node.dam_id)
+
+        if depth < max_depth:
+            if node.sire_id:
+                queue.append((node.sire_id, depth + 1))
+
+            if node.dam_id:
+                queue.append((node.dam_id, depth + 1))
+    return graph
+
+_INDEXES: "weakref.WeakKeyDictionary[Any, PedigreeIndex]" = weakref.WeakKeyDictionary()
+_INDEXES_LOCK = threading.Lock()
+
+# Internal helper for index for bind.
+def _index_for(db: Session) -> PedigreeIndex:
+    bind = db.get_bind()
+
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(bind)
+
+        if index is None:
+            index = PedigreeIndex()
+            _INDEXES[bind] = index
+    return index
+
+# Retrieves the pedigree index for the session's engine, loading it on first use.
+def get_pedigree_index(db: Session) -> PedigreeIndex:
+    index = _index_for(db)
+
+    if not index.loaded:
+        index.load(db)
+    return index
+
+# Handles record animal saved logic for this module.
+def record_animal_saved(db: Session, animal: Any, epochs: Optional[Mapping[str, int]] = None) -> None:
+    """
+    Apply a created or edited animal's parentage to a loaded index after
+    commit, advancing the mirrored epochs to `epochs` (as returned by
+    `bump_pedigree_epoch`) in the same locked step.
+    """
+
+    _index_for(db).upsert(animal, epochs)
+
+# Handles record animal deleted logic for this module.
+def record_animal_deleted(db: Session, animal_id: int, epochs: Optional[Mapping[str, int]] = None) -> None:
+    _index_for(db).remove(animal_id, epochs)
+
+# Internal helper for epoch scopes.
+def _epoch_scopes(animal_types: Iterable[Optional[str]]) -> Tuple[str, ...]:
+    return (GLOBAL_EPOCH_SCOPE,) + tuple(sorted({animal_type for animal_type in animal_types if animal_type}))
+
+# Updates the pedigree epochs for a parentage change.
+def bump_pedigree_epoch(db: Session, animal_types: Iterable[Optional[str]]) -> Dict[str, int]:
+    """
+    Advance the global epoch and the epoch of each affected animal_type.
+
+    Call before committing an animal create, delete or parentage change so
+    the bump lands in the same transaction. The index mirror is not touched
+    here: pass the returned epochs to `record_animal_saved` or
+    `record_animal_deleted` after commit, which apply the change and the
+    epochs together. A mirror that already reloaded inside the transaction
+    is not advanced twice.
+    """
+
+    scopes = _epoch_scopes(animal_types)
+    now = datetime.now(timezone.utc)
+
+    for scope in scopes:
+        increment = (
+            update(models.PedigreeEpoch)
+            .where(models.PedigreeEpoch.scope == scope)
+            .values(epoch=models.PedigreeEpoch.epoch + 1, updated_at=now)
+        )
+
+        if db.execute(increment).rowcount:
+            continue
+
+        try:
+            with db.begin_nested():
+                db.add(models.PedigreeEpoch(scope=scope, epoch=1, updated_at=now))
+
+        except IntegrityError:
+            # Another worker created the row first.
+            db.execute(increment)
+
+    rows = db.query(models.PedigreeEpoch.scope, models.PedigreeEpoch.epoch).filter(models.PedigreeEpoch.scope.in_(scopes)).all()
+    return {scope: epoch for scope, epoch in rows}
+
+# Retrieves the current pedigree epoch.
+def get_pedigree_epoch(db: Session, animal_type: Optional[str] = None) -> int:
+    """
+    Epoch for `animal_type`, or the global epoch when omitted, always read
+    from `pedigree_epochs` (one primary-key lookup) so writes made by other
+    workers are seen. When it differs from the index mirror, the index
+    first reloads that animal_type (everything for the global scope),
+    so callers never pair a new epoch with old parentage.
+    """
+
+    epoch = _stored_epoch(db, animal_type)
+
+    if PEDIGREE_INDEX_ENABLED:
+        index = get_pedigree_index(db)
+
+        if index.epoch(animal_type) != epoch:
+            if animal_type:
+                index.load_animal_type(db, animal_type)
+
+            else:
+                index.load(db)
+    return epoch
+
+# Deepest single-root load that may use db.sql's `get_animal_ancestry`. The
+# function follows every path (UNION ALL), so its rows grow as 2^depth.
+ANCESTRY_FUNCTION_MAX_DEPTH = 8
+
+ANCESTRY_FUNCTION_SQL = """
+SELECT anc.id, anc.sire_id, anc.dam_id, a.animal_type, anc.gender, anc.date_of_birth, a.inbreeding_coefficient
+FROM animals r
+CROSS JOIN LATERAL public.get_animal_ancestry(r.animal_id, :max_depth) anc
+JOIN animals a ON a.id = anc.id
+WHERE r.id IN :root_ids
+"""
+
+ANCESTRY_CTE_SQL = """
+WITH RECURSIVE ancestry(id, sire_id, dam_id, generation) AS (
+    SELECT a.id, a.sire_id, a.dam_id, 0
+    FROM animals a
+    WHERE a.id IN :root_ids
+
+    UNION
+
+    SELECT parent.id, parent.sire_id, parent.dam_id, an.generation + 1
+    FROM ancestry an
+    JOIN animals parent ON parent.id = an.sire_id OR parent.id = an.dam_id
+    WHERE an.generation < :max_depth
+)
+SELECT DISTINCT a.id, a.sire_id, a.dam_id, a.animal_type, a.gender, a.date_of_birth, a.inbreeding_coefficient
+FROM ancestry an
+JOIN animals a ON a.id = an.id
+"""
+
+_ANCESTRY_FUNCTION_AVAILABLE: "weakref.WeakKeyDictionary[Any, bool]" = weakref.WeakKeyDictionary()
+
+# Internal helper for has ancestry function.
+def _has_ancestry_function(db: Session) -> bool:
+    """Whether the Postgres `get_animal_ancestry` function from db.sql is installed."""
+
+    bind = db.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        return False
+
+    if bind not in _ANCESTRY_FUNCTION_AVAILABLE:
+        installed = db.execute(
+            text("SELECT to_regprocedure('public.get_animal_ancestry(character varying, integer)') IS NOT NULL")
+        ).scalar()
+        _ANCESTRY_FUNCTION_AVAILABLE[bind] = bool(installed)
+    return _ANCESTRY_FUNCTION_AVAILABLE[bind]
+
+# Loads ancestor nodes with a single recursive query.
+def load_ancestor_nodes(db: Session, root_ids: Iterable[Optional[int]], max_depth: int = 8) -> Dict[int, PedigreeNode]:
+    """
+    Fetch every root in `root_ids` and all of their ancestors up to
+    `max_depth` generations in one round-trip.
+
+    PostgreSQL deployments built from db.sql reuse `get_animal_ancestry` for
+    one root up to ANCESTRY_FUNCTION_MAX_DEPTH generations. Deeper or
+    multi-root loads, and every other database (including SQLite), run a
+    portable `WITH RECURSIVE` query that keeps each ancestor once per
+    generation instead of once per path. Passing several roots, for example
+    a sire and a dam or a whole candidate pool, still costs a single query.
+    """
+
+    roots = sorted({root_id for root_id in root_ids if root_id})
+
+    if not roots:
+        return {}
+
+    shallow_single_root = len(roots) == 1 and max_depth <= ANCESTRY_FUNCTION_MAX_DEPTH
+    sql = ANCESTRY_FUNCTION_SQL if shallow_single_root and _has_ancestry_function(db) else ANCESTRY_CTE_SQL
+    statement = text(sql).bindparams(bindparam("root_ids", expanding=True))
+    rows = db.execute(statement, {"root_ids": roots, "max_depth": max_depth}).all()
+    return {row.id: _node_from_animal(row) for row in rows}
+
+# Retrieves pedigree nodes covering the requested roots.
+def get_pedigree_nodes(db: Session, root_ids: Iterable[Optional[int]], max_depth: int = 8) -> Mapping[int, PedigreeNode]:
+    """
+    Return a `{animal_db_id: PedigreeNode}` mapping that covers `root_ids`
+    and their ancestors up to `max_depth`: the shared index when enabled,
+    otherwise a one-query recursive CTE load.
+    """
+
+    if PEDIGREE_INDEX_ENABLED:
+        return get_pedigree_index(db)
+    return load_ancestor_nodes(db, root_ids, max_depth)
+
+DESCENDANTS_CTE_SQL = """
+WITH RECURSIVE descendants(id) AS (
+    SELECT a.id FROM animals a WHERE a.id IN :root_ids
+
+    UNION
+
+    SELECT child.id
+    FROM descendants d
+    JOIN animals child ON child.sire_id = d.id OR child.dam_id = d.id
+)
+SELECT id FROM descendants
+"""
+
+# Retrieves the descendant cone of the given animals.
+def get_descendant_ids(db: Session, root_ids: Iterable[Optional[int]]) -> Set[int]:
+    """Return the roots plus every registered descendant, from the index when enabled."""
+
+    roots = sorted({root_id for root_id in root_ids if root_id})
+
+    if not roots:
+        return set()
+
+    if PEDIGREE_INDEX_ENABLED:
+        return get_pedigree_index(db).descendants(roots)
+
+    statement = text(DESCENDANTS_CTE_SQL).bindparams(bindparam("root_ids", expanding=True))
+    return {row.id for row in db.execute(statement, {"root_ids": roots})}
@@ -0,0 +1,68 @@
+# Backend/app/pedigree_changes.py: contains backend logic for the Animal Breed Registry System.
+"""
+Recomputation after a pedigree correction.
+
+Changing an animal's sire or dam changes the stored F and pedigree
+completeness of that animal and of every descendant, and of nothing else.
+`crud.update_animal` clears those values for the whole descendant cone in
+the same transaction as the edit, so no stale number is served in between:
+F is recomputed on first read and completeness falls back to the pedigree
+walk.
+`recompute_descendant_cone` then rebuilds just that cone, parents before
+offspring, seeded with the stored values of the ancestors outside it. The
+cone comes from the pedigree index's child links, or from one recursive
+query when the index is disabled.
+
+Routes run the rebuild as a background task through `run_cone_recompute`,
+which opens its own session because the request session is closed by then.
+"""
+
+from __future__ import annotations
+import logging
+from typing import Iterable, Set
+from sqlalchemy.orm import Session
+from . import inbreeding, pedigree_completeness
+from .pedigree import get_descendant_ids
+
+logger = logging.getLogger(__name__)
+
+# Handles invalidate descendant cone logic for this module.
+def invalidate_descendant_cone(db: Session, animal_ids: Iterable[int], commit: bool = True) -> Set[int]:
+    """
+    Clear stored F and completeness for the animals and their descendants;
+    returns the cone. With `commit=False` the clearing joins the caller's
+    transaction, so other workers never see the new epoch with old values.
+    """
+
+    cone = inbreeding.invalidate_inbreeding(db, animal_ids, commit=False)
+    pedigree_completeness.invalidate_pedigree_completeness(db, cone, commit=False)
+
+    if commit:
+        db.commit()
+    return cone
+
+# Handles recompute descendant cone logic for this module.
+def recompute_descendant_cone(db: Session, animal_ids: Iterable[int]) -> Set[int]:
+    """Recompute and store F and completeness for the animals and their descendants; returns the cone."""
+
+    animal_ids = list(animal_ids)
+    cone = get_descendant_ids(db, animal_ids)
+
+    if cone:
+        inbreeding.recompute_inbreeding_cone(db, cone)
+        pedigree_completeness.update_pedigree_completeness(db, cone)
+    return cone
+
+# Handles run cone recompute logic for this module.
+def run_cone_recompute(bind, animal_ids: Iterable[int]) -> None:
+    """Background entry point: recompute the cone in a fresh session on `bind`."""
+
+    db = Session(bind=bind)
+
+    try:
+        recompute_descendant_cone(db, animal_ids)
+    except Exception:
+        db.rollback()
+        logger.exception("Descendant cone recompute failed; stored values stay cleared until the next refresh.")
+    finally:
+        db.close()
@@ -0,0 +1,277 @@
+# Backend/app/pedigree_completeness.py: contains backend logic for the Animal Breed Registry System.
+"""
+Stored pedigree completeness for every registered animal.
+
+`analyze_pedigree_completeness` used to walk each animal's ancestors on every
+call, once per candidate sire in `recommend_sires`. Completeness only depends
+on the parents' own completeness, so it can be computed for the whole
+registry in one topological pass:
+
+    known_1    = number of recorded parent IDs
+    expected_1 = 2
+    known_g    = Σ known_(g−1) of the registered parents   (same for expected)
+
+The counts follow the slot convention of the path walk: a missing parent is
+an empty slot, and only a registered ancestor opens slots for the next
+generation. From the same pass we keep
+
+* equivalent complete generations, ECG = Σ_g known_g / 2^g over the whole
+  registered pedigree (a parent adds ½ · (1 + its own ECG));
+* the MacCluer et al. (1983) index PEC = 2·C_s·C_d / (C_s + C_d), where C is
+  the mean share of known ancestors per generation on the paternal and
+  maternal lines over `PEC_GENERATIONS` generations.
+
+Records are stored in `animal_pedigree_completeness` and mirrored by the
+pedigree index, so completeness of a sire or a pair is a dictionary lookup.
+A new animal or a parentage change only recomputes the animal and its
+descendants, seeded with the stored records of their other parents.
+"""
+
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from . import models, pedigree
+from .inbreeding import FULL_PEDIGREE_DEPTH, known_parents, pedigree_closure, topological_order
+from .pedigree import (
+    PedigreeCompleteness, PedigreeNode, completeness_from_row, get_descendant_ids, get_pedigree_index, get_pedigree_nodes,
+)
+
+# Generations of slot counts kept per animal; deeper requests walk the pedigree.
+COMPLETENESS_DEPTH = 8
+PEC_GENERATIONS = 5
+_WRITE_BATCH_SIZE = 1000
+
+# Calculates the completeness of one parental line.
+def line_completeness(parent_known: Optional[Sequence[int]], generations: int) -> float:
+    """
+    Mean share of known ancestors per generation on one parental line, over
+    `generations` generations counted from the offspring. `parent_known` is
+    None when the parent is unknown, otherwise the parent's own known slots
+    per generation (empty for a recorded but unregistered parent).
+    """
+
+    if parent_known is None or generations <= 0:
+        return 0.0
+
+    known = 1.0 + sum(count / 2 ** generation for generation, count in enumerate(parent_known[:generations - 1], start=1))
+    return known / generations
+
+# Calculates the MacCluer pedigree completeness index.
+def maccluer_pec(sire_line: float, dam_line: float) -> float:
+    """Harmonic mean of the paternal and maternal line completeness."""
+
+    total = sire_line + dam_line
+    return 2.0 * sire_line * dam_line / total if total else 0.0
+
+# Internal helper for completeness record.
+def _completeness_record(node: PedigreeNode, parent_records: Mapping[int, PedigreeCompleteness]) -> PedigreeCompleteness:
+    known = [0] * COMPLETENESS_DEPTH
+    expected = [0] * COMPLETENESS_DEPTH
+    expected[0] = 2
+    equivalent_generations = 0.0
+    lines: List[Optional[Sequence[int]]] = []
+
+    for parent_id in (node.sire_id, node.dam_id):
+        if not parent_id:
+            lines.append(None)
+            continue
+
+        known[0] += 1
+        record = parent_records.get(parent_id)
+
+        if record is None:
+            equivalent_generations += 0.5
+            lines.append(())
+            continue
+
+        for generation in range(1, COMPLETENESS_DEPTH):
+            known[generation] += record.known_slots[generation - 1]
+            expected[generation] += record.expected_slots[generation - 1]
+
+        equivalent_generations += 0.5 * (1.0 + record.equivalent_generations)
+        lines.append(record.known_slots)
+
+    pec = maccluer_pec(*(line_completeness(line, PEC_GENERATIONS) for line in lines))
+    return PedigreeCompleteness(
+        known_slots=tuple(known),
+        expected_slots=tuple(expected),
+        equivalent_generations=round(equivalent_generations, 6),
+        pec=round(pec, 6),
+    )
+
+# Calculates completeness records in one topological pass.
+def compute_completeness(
+    nodes: Mapping[int, PedigreeNode],
+    order: Sequence[int],
+    stored: Optional[Mapping[int, PedigreeCompleteness]] = None,
+) -> Dict[int, PedigreeCompleteness]:
+    """
+    Return a record for every animal in `order`, which must list parents
+    before offspring. Registered parents outside `order` are read from
+    `stored`; a ValueError is raised when one has no record there.
+    """
+
+    stored = stored or {}
+    records: Dict[int, PedigreeCompleteness] = {}
+
+    for animal_id in order:
+        node = nodes.get(animal_id)
+        parent_records: Dict[int, PedigreeCompleteness] = {}
+
+        for parent_id in known_parents(node, nodes):
+            record = records.get(parent_id) or stored.get(parent_id)
+
+            if record is None:
+                raise ValueError(f"Parent {parent_id} of animal {animal_id} has no completeness record")
+
+            parent_records[parent_id] = record
+
+        records[animal_id] = _completeness_record(node, parent_records)
+    return records
+
+# Retrieves the stored completeness of one animal from the pedigree index.
+def indexed_completeness(db: Session, animal_id: Optional[int]) -> Optional[PedigreeCompleteness]:
+    """
+    Stored record of one animal, or None when the index is disabled or no
+    record is stored. The caller checks the animal_type's epoch first (once
+    per request, e.g. with `pedigree_result_version`), which reloads the
+    index after another worker changed parentage. A record the mirror lacks
+    is read from `animal_pedigree_completeness` once: a hit is kept, which
+    picks up records written after the last reload (a new animal, or a cone
+    rebuilt in the background); a miss is remembered until the next reload.
+    """
+
+    if not pedigree.PEDIGREE_INDEX_ENABLED or not animal_id:
+        return None
+
+    index = get_pedigree_index(db)
+    record = index.completeness(animal_id)
+
+    if record is None and not index.completeness_missing(animal_id):
+        row = db.query(models.AnimalPedigreeCompleteness).filter(models.AnimalPedigreeCompleteness.animal_id == animal_id).first()
+
+        if row is None:
+            index.mark_completeness_missing([animal_id])
+
+        else:
+            record = completeness_from_row(row)
+            index.set_completeness({animal_id: record})
+    return record
+
+# Retrieves stored completeness records for the given animals.
+def get_stored_completeness(db: Session, animal_ids: Iterable[int]) -> Dict[int, PedigreeCompleteness]:
+    ids = sorted({animal_id for animal_id in animal_ids if animal_id})
+
+    if pedigree.PEDIGREE_INDEX_ENABLED:
+        index = get_pedigree_index(db)
+        return {animal_id: record for animal_id in ids if (record := index.completeness(animal_id)) is not None}
+
+    records: Dict[int, PedigreeCompleteness] = {}
+    table = models.AnimalPedigreeCompleteness
+
+    for start in range(0, len(ids), _WRITE_BATCH_SIZE):
+        for row in db.query(table).filter(table.animal_id.in_(ids[start:start + _WRITE_BATCH_SIZE])).all():
+            records[row.animal_id] = completeness_from_row(row)
+    return records
+
+# Internal helper for persist completeness.
+def _persist_completeness(db: Session, records: Mapping[int, PedigreeCompleteness]) -> None:
+    if not records:
+        return
+
+    computed_at = datetime.now(timezone.utc)
+    ids = list(records)
+    table = models.AnimalPedigreeCompleteness
+
+    for start in range(0, len(ids), _WRITE_BATCH_SIZE):
+        batch = ids[start:start + _WRITE_BATCH_SIZE]
+        db.query(table).filter(table.animal_id.in_(batch)).delete(synchronize_session=False)
+        db.execute(insert(table), [
+            {
+                "animal_id": animal_id,
+                "known_slots": ",".join(str(count) for count in records[animal_id].known_slots),
+                "expected_slots": ",".join(str(count) for count in records[animal_id].expected_slots),
+                "equivalent_generations": records[animal_id].equivalent_generations,
+                "pec": records[animal_id].pec,
+                "computed_at": computed_at,
+            }
+            for animal_id in batch
+        ])
+
+    db.commit()
+
+    if pedigree.PEDIGREE_INDEX_ENABLED:
+        get_pedigree_index(db).set_completeness(records)
+
+# Handles refresh pedigree completeness logic for this module.
+def refresh_pedigree_completeness(db: Session, *, animal_type: Optional[str] = None, breed: Optional[str] = None) -> int:
+    """
+    Compute and store completeness for every animal of `animal_type` (and
+    `breed` when given) and all of their registered ancestors. Returns the
+    number of animals written.
+    """
+
+    query = db.query(models.Animal.id)
+
+    if animal_type:
+        query = query.filter(models.Animal.animal_type == animal_type)
+
+    if breed:
+        query = query.filter(models.Animal.breed == breed)
+
+    target_ids = [row.id for row in query.all()]
+    nodes = get_pedigree_nodes(db, target_ids, FULL_PEDIGREE_DEPTH)
+    records = compute_completeness(nodes, topological_order(nodes, pedigree_closure(nodes, target_ids)))
+    _persist_completeness(db, records)
+    return len(records)
+
+# Updates stored completeness after an animal is added or its parentage changes.
+def update_pedigree_completeness(db: Session, animal_ids: Iterable[int]) -> Set[int]:
+    """
+    Recompute the records of `animal_ids` and all of their descendants, in
+    topological order, from the stored records of the parents outside that
+    cone. When a parent has never been computed, its whole ancestry is
+    computed with the cone. Returns the recomputed IDs.
+    """
+
+    cone = get_descendant_ids(db, animal_ids)
+
+    if not cone:
+        return cone
+
+    nodes = get_pedigree_nodes(db, cone, 1)
+    cone = {animal_id for animal_id in cone if nodes.get(animal_id)}
+    outside = {parent_id for animal_id in cone for parent_id in known_parents(nodes.get(animal_id), nodes)} - cone
+    stored = get_stored_completeness(db, outside)
+
+    if len(stored) == len(outside):
+        records = compute_completeness(nodes, topological_order(nodes, cone), stored)
+
+    else:
+        nodes = get_pedigree_nodes(db, cone, FULL_PEDIGREE_DEPTH)
+        records = compute_completeness(nodes, topological_order(nodes, pedigree_closure(nodes, cone)))
+
+    _persist_completeness(db, records)
+    return set(records)
+
+# Handles invalidate pedigree completeness logic for this module.
+def invalidate_pedigree_completeness(db: Session, animal_ids: Iterable[int], commit: bool = True) -> None:
+    """
+    Drop stored records that no longer match the parentage, so lookups fall
+    back to the pedigree walk until `update_pedigree_completeness` runs.
+    With `commit=False` the caller commits.
+    """
+
+    ids = sorted({animal_id for animal_id in animal_ids if animal_id})
+    table = models.AnimalPedigreeCompleteness
+
+    for start in range(0, len(ids), _WRITE_BATCH_SIZE):
+        db.query(table).filter(table.animal_id.in_(ids[start:start + _WRITE_BATCH_SIZE])).delete(synchronize_session=False)
+
+    if commit:
+        db.commit()
+
+    if pedigree.PEDIGREE_INDEX_ENABLED:
+        get_pedigree_index(db).set_completeness({animal_id: None for animal_id in ids})
@@ -1,5 +1,5 @@
 # Routes for breeder account management, animal registration, and breeding events
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, timezone, timedelta
@@ -321,6 +321,7 @@ def update_animal_for_breeder(
     breeder_id: int,
     animal_db_id: int,
     animal: schemas.AnimalUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(database.get_db),
     current_breeder: models.Breeder = Depends(get_current_breeder),
 
@@ -331,6 +332,7 @@ def update_animal_for_breeder(
         breeder_id=breeder_id,
         animal_db_id=animal_db_id,
         animal=animal,
+        background_tasks=background_tasks,
     )
 
     audit_service.record_action(db, actor_type="breeder", actor_id=current_breeder.id, actor_name=current_breeder.full_name, action="UPDATE_ANIMAL", target_type="Animal", target_id=updated.id, detail={"animal_id": updated.animal_id})
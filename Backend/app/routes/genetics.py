@@ -1,18 +1,24 @@
 # Backend/app/routes/genetics.py: contains backend logic for the Animal Breed Registry System.
-from fastapi import APIRouter, Depends, HTTPException, Query
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
-from .. import models, database
+from .. import models, database, schemas
 from ..auth import get_current_breeder
 from ..genetics import (
     compute_inbreeding_coefficient,
     classify_coi,
-    recommend_sires,
     get_gestation_days,
     combine_pedigree_completeness,
     analyze_pedigree_completeness,
     detect_relationship_risks,
+    PedigreeTraversal,
 )
+from ..genetics_candidates import SireCandidateFilter
+from ..inbreeding import get_animal_inbreeding
+from ..services import genetics_service
 
 router = APIRouter(prefix="/api/genetics", tags=["genetics"])
 
@@ -46,9 +52,11 @@ def get_coi(
     if dam.gender != "female":
         raise HTTPException(status_code=400, detail="Dam must be female")
 
-    coi = compute_inbreeding_coefficient(sire_id, dam_id, db)
+    # One read and one walk of both pedigrees serves COI and completeness
+    traversal = PedigreeTraversal(db, [sire_id, dam_id], max_depth=8)
+    coi = compute_inbreeding_coefficient(sire_id, dam_id, db, traversal=traversal)
     classification = classify_coi(coi)
-    pedigree_completeness = combine_pedigree_completeness(sire_id, dam_id, db, max_depth=4)
+    pedigree_completeness = combine_pedigree_completeness(sire_id, dam_id, db, max_depth=4, traversal=traversal)
     relationship_flags = detect_relationship_risks(sire, dam)
     recommendation = (
 
@@ -85,7 +93,8 @@ def get_animal_coi(
     current_breeder: models.Breeder = Depends(get_current_breeder),
 ):
     """
-    Calculates the COI of an existing animal by looking up its sire and dam.
+    Returns the stored COI of an existing animal, computing it over the full
+    registered pedigree on first request.
     Note: Completeness of the registry affects accuracy.
     """
     animal = db.query(models.Animal).filter(models.Animal.id == animal_db_id).first()
@@ -107,14 +116,15 @@ def get_animal_coi(
             "data_notice": "Pedigree-based estimate only. Not DNA or laboratory verification.",
         }
 
-    # Calculate using registered lineage
-    coi = compute_inbreeding_coefficient(animal.sire_id, animal.dam_id, db)
+    # Stored whole-pedigree value, computed from registered lineage when missing
+    coi = get_animal_inbreeding(db, animal)
     classification = classify_coi(coi)
     pedigree_completeness = analyze_pedigree_completeness(animal.id, db, max_depth=4)
     return {
         "animal_id":   animal.animal_id,
         "coi":         coi,
         "coi_percent": round(coi * 100, 2),
+        "coi_computed_at": animal.inbreeding_computed_at,
         "risk_level":  classification["level"],
         "risk_color":  classification["color"],
         "description": classification["description"],
@@ -125,28 +135,148 @@ def get_animal_coi(
         "data_notice": "Pedigree-based estimate only. Not DNA or laboratory verification.",
     }
 
+# Kinship (coancestry) matrix for an arbitrary set of animals
+@router.post("/kinship")
+
+# Retrieves kinship matrix records from the database.
+def get_kinship(
+    payload: schemas.KinshipRequest,
+    db: Session = Depends(database.get_db),
+    current_breeder: models.Breeder = Depends(get_current_breeder),
+):
+    """
+    Pairwise kinship for the given animals, computed over the full registered
+    pedigree. The offspring COI of any sire × dam pair equals their kinship.
+    """
+
+    animals, matrix = genetics_service.get_kinship_matrix(db, animal_db_ids=payload.animal_ids)
+    return {
+        "animal_db_ids": [animal.id for animal in animals],
+        "animal_ids":    [animal.animal_id for animal in animals],
+        "kinship":       [[round(value, 6) for value in row] for row in matrix.tolist()],
+        "data_notice":   "Pedigree-based estimate only. Not DNA or laboratory verification.",
+    }
+
+# Top sires for many dams from one shared dams × sires matrix
+@router.post("/recommend-sires/batch")
+
+# Retrieves batch sire recommendations records from the database.
+def get_batch_sire_recommendations(
+    payload: schemas.BatchRecommendationRequest,
+    db: Session = Depends(database.get_db),
+    current_breeder: models.Breeder = Depends(get_current_breeder),
+):
+    """
+    Top-N sires for each listed dam. The sire pool, sire-only scores and the
+    dams × sires coancestry matrix are computed once per animal type, so each
+    dam costs one vector sort instead of a full /recommend-sires call.
+    """
+
+    result = genetics_service.batch_recommend_sires(db, payload=payload)
+    return {**result, "data_notice": "Pedigree-based estimate only. Not DNA or laboratory verification."}
+
+# Allocate sires across a breeder's open dams under per-sire usage caps
+@router.post("/mate-allocation")
+
+# Handles mate allocation logic for this module.
+def allocate_mates(
+    payload: schemas.MateAllocationRequest,
+    db: Session = Depends(database.get_db),
+    current_breeder: models.Breeder = Depends(get_current_breeder),
+):
+    """
+    Assign one sire to each of the breeder's open dams (or the listed dams),
+    using each sire at most its cap, to maximise the total recommendation
+    score or minimise mean offspring COI. Close relatives and pairs above
+    `max_coi` are never assigned.
+    """
+
+    result = genetics_service.allocate_herd_mates(db, breeder=current_breeder, payload=payload)
+    return {**result, "data_notice": "Pedigree-based estimate only. Not DNA or laboratory verification."}
+
+# Breed-level optimal contributions under a rate-of-inbreeding target
+@router.post("/optimal-contributions")
+
+# Calculates optimal contributions for selection candidates.
+def get_optimal_contributions(
+    payload: schemas.OptimalContributionRequest,
+    db: Session = Depends(database.get_db),
+    current_breeder: models.Breeder = Depends(get_current_breeder),
+):
+    """
+    Share of the next generation each candidate should parent to maximise
+    merit while keeping the rate of inbreeding at `delta_f` (or the group
+    coancestry at `max_coancestry`). Only candidates with a non-zero share
+    are listed.
+    """
+
+    result = genetics_service.optimal_contribution_selection(db, breeder=current_breeder, payload=payload)
+    return {**result, "data_notice": "Pedigree-based estimate only. Not DNA or laboratory verification."}
+
+# Internal helper for sire candidate filters.
+def _sire_candidate_filters(
+    breed: Optional[List[str]] = Query(default=None, description="Only sires of these breeds"),
+    min_age_months: Optional[int] = Query(default=None, ge=0),
+    max_age_months: Optional[int] = Query(default=None, ge=0),
+    county: Optional[str] = Query(default=None, description="Only sires from breeders in this county"),
+    approved_only: bool = Query(default=False, description="Only sires of approved breeders"),
+    exclude_close_relatives: bool = Query(default=False, description="Drop the dam's parents, offspring and siblings"),
+):
+    """Candidate-pool filters shared by the recommendation endpoints; applied in SQL."""
+    if min_age_months is not None and max_age_months is not None and min_age_months > max_age_months:
+        raise HTTPException(status_code=400, detail="min_age_months cannot exceed max_age_months")
+    return SireCandidateFilter(
+        breeds=tuple(breed or ()),
+        min_age_months=min_age_months,
+        max_age_months=max_age_months,
+        county=county,
+        approved_breeders_only=approved_only,
+        exclude_close_relatives=exclude_close_relatives,
+    )
+
 # Suggest suitable sires for a specific dam based on genetics and performance
 @router.get("/recommend-sires/{dam_db_id}")
 
 # Retrieves sire recommendations records from the database.
 def get_sire_recommendations(
     dam_db_id: int,
+    request: Request,
+    response: Response,
     top_n: int = Query(default=10, ge=1, le=20),
+    budget_ms: Optional[int] = Query(default=None, ge=1, le=60000),
+    filters: SireCandidateFilter = Depends(_sire_candidate_filters),
     db: Session = Depends(database.get_db),
     current_breeder: models.Breeder = Depends(get_current_breeder),
 ):
     """
     Provides a list of potential mates ranked by a weighted multi-factor score.
     The scoring model considers genetic distance, recorded health, and productivity.
+
+    Responses carry an ETag derived from the pedigree epoch and the latest
+    record change in the candidate pool; a matching If-None-Match gets 304.
+
+    With `budget_ms` the search stops computing full-depth COI once the
+    budget is spent; later candidates use a shallow pedigree and are marked
+    `coi_exact: false`. Approximate rankings are not cached and carry no ETag.
+
+    Breed, age, county, approved-breeder and close-relative filters narrow
+    the candidate pool in SQL before any scoring.
     """
-    dam = db.query(models.Animal).filter(models.Animal.id == dam_db_id).first()
-    if not dam:
-        raise HTTPException(status_code=404, detail="Dam not found")
-    if dam.gender != "female":
-        raise HTTPException(status_code=400, detail="Selected animal is not female")
+    dam = _get_dam_or_error(db, dam_db_id)
+    version = genetics_service.get_recommendation_version(db, dam=dam, top_n=top_n, filters=filters)
+    cache_headers = {"ETag": version.etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), version.etag):
+        return Response(status_code=304, headers=cache_headers)
 
-    # Execute the scoring engine
-    recommendations = recommend_sires(dam_db_id, db, top_n=top_n)
+    # Execute the scoring engine, or reuse the ranking if nothing changed
+    payload, cached = genetics_service.get_cached_recommendations(
+        db, dam=dam, top_n=top_n, version=version, budget_ms=budget_ms, filters=filters
+    )
+    if payload["search_stats"].get("exact", True):
+        response.headers.update(cache_headers)
+    else:
+        response.headers["Cache-Control"] = "no-store"
+    recommendations = payload["recommendations"]
     return {
         "dam_animal_id":    dam.animal_id,
         "dam_breed":        dam.breed,
@@ -162,9 +292,62 @@ def get_sire_recommendations(
             "note": "Final score is reduced by relationship, COI, hereditary, health, fertility and pedigree-completeness risk warnings. Results are pedigree-based decision support, not DNA verification.",
         },
 
+        "search_stats":     payload["search_stats"],
+        "cached":           cached,
         "recommendations":  recommendations,
     }
 
+# Stream sire recommendations as they are scored
+@router.get("/recommend-sires/{dam_db_id}/stream")
+
+# Retrieves sire recommendations as a progressive event stream.
+def stream_sire_recommendations(
+    dam_db_id: int,
+    top_n: int = Query(default=10, ge=1, le=20),
+    format: str = Query(default="ndjson", pattern="^(ndjson|sse)$"),
+    budget_ms: Optional[int] = Query(default=None, ge=1, le=60000),
+    filters: SireCandidateFilter = Depends(_sire_candidate_filters),
+    db: Session = Depends(database.get_db),
+    current_breeder: models.Breeder = Depends(get_current_breeder),
+):
+    """
+    Opt-in streaming variant of /recommend-sires. Emits a `start` event, one
+    `candidate` event per scored sire (same fields as a recommendation, in
+    evaluation order) and a `final` event with the ordered top-N, as NDJSON
+    lines or Server-Sent Events (`format=sse`).
+    """
+    dam = _get_dam_or_error(db, dam_db_id)
+    version = genetics_service.get_recommendation_version(db, dam=dam, top_n=top_n, filters=filters)
+    events = genetics_service.stream_recommendations(
+        db, dam=dam, top_n=top_n, version=version, budget_ms=budget_ms, filters=filters
+    )
+
+    if format == "sse":
+        body = (f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n" for event in events)
+        media_type = "text/event-stream"
+    else:
+        body = (json.dumps(event, default=str) + "\n" for event in events)
+        media_type = "application/x-ndjson"
+    return StreamingResponse(body, media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Internal helper for get dam or error.
+def _get_dam_or_error(db, dam_db_id):
+    dam = db.query(models.Animal).filter(models.Animal.id == dam_db_id).first()
+    if not dam:
+        raise HTTPException(status_code=404, detail="Dam not found")
+    if dam.gender != "female":
+        raise HTTPException(status_code=400, detail="Selected animal is not female")
+    return dam
+
+# Internal helper for etag matches.
+def _etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
 # Dashboard utility to track current pregnancies and projected birth dates
 @router.get("/pregnancy-monitor/{breeder_id}")
 
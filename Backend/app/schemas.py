@@ -1,6 +1,6 @@
 # Backend/app/schemas.py: contains backend logic for the Animal Breed Registry System.
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
-from typing import Optional, Literal, List
+from typing import Dict, Optional, Literal, List
 from datetime import datetime, date
 
 # Defines the breeder base structure used by this module.
@@ -213,6 +213,8 @@ class AnimalResponse(AnimalBase):
     updated_at: Optional[datetime] = None
     sire_id: Optional[int] = None
     dam_id: Optional[int] = None
+    # Animals queued for F and completeness recompute by a sire/dam correction.
+    pedigree_recompute_count: Optional[int] = None
     model_config = {
 
     "from_attributes": True
@@ -449,3 +451,52 @@ class ForgotPasswordRequest(BaseModel):
 class ResetPasswordRequest(BaseModel):
     token: str
     password: str = Field(..., min_length=8)
+
+# Defines the kinship request structure used by this module.
+class KinshipRequest(BaseModel):
+    animal_ids: List[int] = Field(..., min_length=1, description="Database IDs of the animals to compare")
+
+# Defines the mate allocation request structure used by this module.
+class MateAllocationRequest(BaseModel):
+    animal_type: Optional[str] = Field(default=None, description="Defaults to the breeder's animal type")
+    dam_ids: Optional[List[int]] = Field(default=None, description="Dams to allocate; defaults to every open dam of the breeder")
+    sire_ids: Optional[List[int]] = Field(default=None, description="Candidate sires; defaults to the filtered registry pool")
+    default_cap: int = Field(default=10, ge=0, description="Maximum dams per sire unless overridden")
+    sire_caps: Dict[int, int] = Field(default_factory=dict, description="Per-sire usage caps keyed by sire database ID")
+    objective: Literal["score", "coi"] = "score"
+    coi_method: Literal["paths", "kinship"] = "paths"
+    max_coi: Optional[float] = Field(default=None, ge=0, le=1)
+    breeds: List[str] = Field(default_factory=list)
+    county: Optional[str] = None
+    approved_only: bool = False
+
+    @field_validator("sire_caps")
+
+    @classmethod
+
+    # Handles sire caps not negative logic for this module.
+    def sire_caps_not_negative(cls, value: Dict[int, int]) -> Dict[int, int]:
+        if any(cap < 0 for cap in value.values()):
+            raise ValueError("Sire caps cannot be negative")
+        return value
+
+# Defines the batch recommendation request structure used by this module.
+class BatchRecommendationRequest(BaseModel):
+    dam_ids: List[int] = Field(..., min_length=1, description="Database IDs of the dams to rank sires for")
+    top_n: int = Field(default=5, ge=1, le=20)
+    coi_method: Literal["paths", "kinship"] = "kinship"
+    breeds: List[str] = Field(default_factory=list)
+    min_age_months: Optional[int] = Field(default=None, ge=0)
+    max_age_months: Optional[int] = Field(default=None, ge=0)
+    county: Optional[str] = None
+    approved_only: bool = False
+    exclude_close_relatives: bool = False
+
+# Defines the optimal contribution request structure used by this module.
+class OptimalContributionRequest(BaseModel):
+    animal_type: Optional[str] = Field(default=None, description="Defaults to the breeder's animal type")
+    animal_ids: Optional[List[int]] = Field(default=None, description="Candidates; defaults to every animal of the type and breeds")
+    breeds: List[str] = Field(default_factory=list)
+    delta_f: float = Field(default=0.01, gt=0, lt=1, description="Target rate of inbreeding per generation")
+    max_coancestry: Optional[float] = Field(default=None, gt=0, le=1, description="Explicit group coancestry target; overrides delta_f")
+    offspring: Optional[int] = Field(default=None, ge=1, description="Planned offspring, to turn contributions into matings")
@@ -7,9 +7,10 @@ rules easier to test and maintain.
 """
 
 from __future__ import annotations
-from fastapi import HTTPException, status
+from typing import Optional
+from fastapi import BackgroundTasks, HTTPException, status
 from sqlalchemy.orm import Session
-from .. import crud, models, schemas
+from .. import crud, models, pedigree, pedigree_changes, schemas
 
 PARENT_GENDER = {
     "sire_id": "male",
@@ -128,12 +129,41 @@ def update_animal_for_breeder(
     breeder_id: int,
     animal_db_id: int,
     animal: schemas.AnimalUpdate,
+    background_tasks: Optional[BackgroundTasks] = None,
 
 ) -> models.Animal:
+    """
+    A sire or dam correction also queues the F and completeness recompute
+    for the animal's descendant cone; its size is set on the returned
+    animal as `pedigree_recompute_count`.
+    """
+
     db_animal = get_owned_animal_or_404(db, breeder_id=breeder_id, animal_db_id=animal_db_id)
 
     validate_animal_update(db, breeder_id=breeder_id, animal_db_id=animal_db_id, animal=animal)
-    return crud.update_animal(db=db, db_animal=db_animal, animal=animal)
+    previous_parents = (db_animal.sire_id, db_animal.dam_id)
+    updated = crud.update_animal(db=db, db_animal=db_animal, animal=animal)
+
+    if (updated.sire_id, updated.dam_id) != previous_parents:
+        updated.pedigree_recompute_count = schedule_cone_recompute(db, updated.id, background_tasks)
+    return updated
+
+# Schedules the F and completeness recompute after a pedigree correction.
+def schedule_cone_recompute(db: Session, animal_db_id: int, background_tasks: Optional[BackgroundTasks] = None) -> int:
+    """
+    Queue the descendant-cone rebuild to run after the response, or run it
+    inline when no `background_tasks` is given. Returns the number of
+    animals in the cone, the edited animal included.
+    """
+
+    cone = pedigree.get_descendant_ids(db, [animal_db_id])
+
+    if background_tasks is None:
+        pedigree_changes.recompute_descendant_cone(db, [animal_db_id])
+
+    else:
+        background_tasks.add_task(pedigree_changes.run_cone_recompute, db.get_bind(), [animal_db_id])
+    return len(cone)
 
 # Creates and stores a new measurement for animal record.
 def create_measurement_for_animal(
@@ -184,8 +214,10 @@ def delete_animal_for_breeder(db: Session, *, breeder_id: int, animal_db_id: int
             detail=f"Cannot delete {animal_to_delete.animal_id} as it is part of a breeding event history.",
         )
 
+    epochs = pedigree.bump_pedigree_epoch(db, [animal_to_delete.animal_type])
     db.delete(animal_to_delete)
     db.commit()
+    pedigree.record_animal_deleted(db, animal_db_id, epochs)
 
 # Retrieves animal full profile for breeder records from the database.
 def get_animal_full_profile_for_breeder(db: Session, *, breeder_id: int, animal_db_id: int):
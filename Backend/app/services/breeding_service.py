@@ -6,7 +6,7 @@ from datetime import date, datetime, timezone, timedelta
 from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from .. import crud, models, schemas
+from .. import crud, current_state, models, schemas
 from ..genetics import get_gestation_days
 
 ACTIVE_STATUSES = {"planned", "served", "confirmed_pregnant"}
@@ -246,6 +246,7 @@ def _sync_reproductive_records_from_event(db: Session, event: models.BreedingEve
                 notes=existing_note,
             ))
 
+    current_state.refresh_current_state(db, [event.dam_id])
     db.commit()
 
 # Retrieves breeding alerts records from the database.
@@ -0,0 +1,533 @@
+# Backend/app/services/genetics_service.py: contains backend logic for the Animal Breed Registry System.
+"""Business rules for multi-animal genetics queries.
+
+Route handlers in routes/genetics.py stay thin; this module validates the
+requested animals and hands the pedigree work to the genetics engines.
+"""
+
+from __future__ import annotations
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .. import genetics_vectorized, models, schemas
+from ..carrier_probabilities import get_carrier_probabilities, hereditary_records_query
+from ..genetics import build_animal_breeding_profiles, iter_sire_recommendations, recommend_sires
+from ..genetics_allocation import allocate_mates, build_pair_score_matrix, rank_sires_per_dam
+from ..genetics_candidates import SireCandidateFilter, candidate_sires_query, sire_pool_query
+from ..genetics_cache import get_recommendation_cache, memoize_by_epoch
+from ..genetics_ocs import coancestry_target, merit_vector, optimal_contributions
+from ..inbreeding import FULL_PEDIGREE_DEPTH
+from ..kinship import kinship_matrix
+from ..pedigree import get_pedigree_epoch, get_pedigree_nodes
+
+MAX_KINSHIP_ANIMALS = 500
+# Upper bound on dams × expanded sire slots for one mate-allocation solve.
+MAX_ALLOCATION_CELLS = 25_000_000
+ALLOCATION_MAX_DEPTH = 8
+MAX_BATCH_DAMS = 1000
+# Upper bounds on one batch-ranking group: dams × sire pool cells, and animals
+# (kinship columns) in its coancestry solve.
+MAX_BATCH_CELLS = 5_000_000
+MAX_BATCH_KINSHIP_ANIMALS = 5000
+MAX_OCS_CANDIDATES = 5000
+
+# Retrieves the kinship matrix for a set of animals.
+def get_kinship_matrix(db: Session, *, animal_db_ids: List[int]) -> Tuple[List[models.Animal], np.ndarray]:
+    """
+    Return the requested animals (in request order, duplicates removed) and
+    their dense kinship matrix. All animals must exist and share one
+    animal_type. Matrices are memoized per pedigree epoch of that type.
+    """
+
+    animal_db_ids = list(dict.fromkeys(animal_db_ids))
+
+    if len(animal_db_ids) > MAX_KINSHIP_ANIMALS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_KINSHIP_ANIMALS} animals can be compared at once",
+        )
+
+    animals = {animal.id: animal for animal in db.query(models.Animal).filter(models.Animal.id.in_(animal_db_ids)).all()}
+    missing = [animal_db_id for animal_db_id in animal_db_ids if animal_db_id not in animals]
+
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Animals not found: {missing}")
+
+    if len({animal.animal_type for animal in animals.values()}) > 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="All animals must be the same animal type")
+
+    nodes = get_pedigree_nodes(db, animal_db_ids, FULL_PEDIGREE_DEPTH)
+    animal_type = animals[animal_db_ids[0]].animal_type
+    matrix = memoize_by_epoch(
+        db, ("kinship", tuple(animal_db_ids)), lambda: _read_only(kinship_matrix(nodes, animal_db_ids)), animal_type
+    )
+    return [animals[animal_db_id] for animal_db_id in animal_db_ids], matrix
+
+# Internal helper for read only.
+def _read_only(matrix: np.ndarray) -> np.ndarray:
+    """Cached matrices are shared between requests, so callers must not modify them."""
+
+    matrix.setflags(write=False)
+    return matrix
+
+@dataclass
+
+# Defines the recommendation version structure used by this module.
+class RecommendationVersion:
+    """Cache key, state version and HTTP entity tag of one ranked list."""
+
+    key: Tuple[Hashable, ...]
+    version: Tuple[Any, ...]
+    etag: str
+
+# Retrieves the state version of a dam's recommendation list.
+def get_recommendation_version(
+    db: Session,
+    *,
+    dam: models.Animal,
+    top_n: int,
+    filters: Optional[SireCandidateFilter] = None,
+) -> RecommendationVersion:
+    """
+    Everything the ranking depends on, read with one aggregate query: the
+    pedigree epoch of the animal_type, the size, ID sum and latest record
+    change of the (filtered) candidate pool, the latest breeding event
+    written for any of those sires, the dam's own last change, and the
+    count and latest ID of the type's hereditary-condition records (carrier
+    probabilities move with any relative's record). The ID sum catches
+    sires entering or leaving the pool through breeder edits.
+    """
+
+    today = date.today()
+    changed_at = func.coalesce(models.Animal.updated_at, models.Animal.created_at)
+    event_changed_at = func.coalesce(models.BreedingEvent.updated_at, models.BreedingEvent.created_at)
+    pool = candidate_sires_query(db, dam, filters, today=today).order_by(None)
+    hereditary = hereditary_records_query(db, dam.animal_type)
+    events = db.query(models.BreedingEvent).filter(
+        models.BreedingEvent.sire_id.in_(pool.with_entities(models.Animal.id).scalar_subquery())
+    )
+
+    row = db.query(
+        pool.with_entities(func.count(models.Animal.id)).scalar_subquery(),
+        pool.with_entities(func.max(changed_at)).scalar_subquery(),
+        pool.with_entities(func.sum(models.Animal.id)).scalar_subquery(),
+        events.with_entities(func.count(models.BreedingEvent.id)).scalar_subquery(),
+        events.with_entities(func.max(event_changed_at)).scalar_subquery(),
+        hereditary.with_entities(func.count(models.AnimalHealthRecord.id)).scalar_subquery(),
+        hereditary.with_entities(func.max(models.AnimalHealthRecord.id)).scalar_subquery(),
+    ).one()
+
+    filter_key = filters.cache_key(today) if filters else ()
+    key = (dam.id, top_n, dam.animal_type, filter_key)
+    version = (get_pedigree_epoch(db, dam.animal_type), *(str(value) for value in row), str(dam.updated_at))
+    digest = hashlib.sha1(repr((key, version)).encode("utf-8")).hexdigest()[:24]
+    return RecommendationVersion(key=key, version=version, etag=f'"rs-{digest}"')
+
+# Retrieves ranked sire recommendations, reusing the cached list when still valid.
+def get_cached_recommendations(
+    db: Session,
+    *,
+    dam: models.Animal,
+    top_n: int,
+    version: RecommendationVersion,
+    budget_ms: Optional[float] = None,
+    filters: Optional[SireCandidateFilter] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Return `({"recommendations": [...], "search_stats": {...}}, cached)`.
+    The list is recomputed only when `version` differs from the stored one.
+    Only exact rankings are cached, so a budget-limited request never
+    replaces or shadows a complete one.
+    """
+
+    cache = get_recommendation_cache(db)
+    payload = cache.get(version.key, version.version)
+
+    if payload is not None:
+        return payload, True
+
+    search_stats: Dict[str, Any] = {}
+    recommendations = recommend_sires(dam.id, db, top_n=top_n, stats=search_stats, budget_ms=budget_ms, filters=filters)
+    payload = {"recommendations": recommendations, "search_stats": search_stats}
+
+    if search_stats.get("exact", True):
+        cache.put(version.key, version.version, payload)
+    return payload, False
+
+# Handles stream recommendations logic for this module.
+def stream_recommendations(
+    db: Session,
+    *,
+    dam: models.Animal,
+    top_n: int,
+    version: RecommendationVersion,
+    budget_ms: Optional[float] = None,
+    filters: Optional[SireCandidateFilter] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Progress events from `iter_sire_recommendations`. A still-valid cached
+    ranking is replayed as start + final; a completed exact stream fills the
+    cache.
+    """
+
+    cache = get_recommendation_cache(db)
+    payload = cache.get(version.key, version.version)
+
+    if payload is not None:
+        yield {"event": "start", "candidates": payload["search_stats"].get("candidates", 0), "top_n": top_n}
+        yield {"event": "final", **payload}
+        return
+
+    for event in iter_sire_recommendations(dam.id, db, top_n=top_n, budget_ms=budget_ms, filters=filters):
+        if event["event"] == "final" and event["search_stats"]["exact"]:
+            cache.put(version.key, version.version, {"recommendations": event["recommendations"], "search_stats": event["search_stats"]})
+
+        yield event
+
+# Retrieves the breeder's open dams.
+def get_open_dams(db: Session, *, breeder_id: int, animal_type: str) -> List[models.Animal]:
+    """Females of the breeder with no served or confirmed pregnancy still awaiting an outcome."""
+
+    open_pregnancy = (
+        db.query(models.BreedingEvent.id)
+        .filter(
+            models.BreedingEvent.dam_id == models.Animal.id,
+            models.BreedingEvent.status.in_(["served", "confirmed_pregnant"]),
+            models.BreedingEvent.outcome.is_(None),
+        )
+        .exists()
+    )
+    return (
+        db.query(models.Animal)
+        .filter(
+            models.Animal.breeder_id == breeder_id,
+            models.Animal.animal_type == animal_type,
+            models.Animal.gender == "female",
+            ~open_pregnancy,
+        )
+        .order_by(models.Animal.id)
+        .all()
+    )
+
+# Handles allocate herd mates logic for this module.
+def allocate_herd_mates(db: Session, *, breeder: models.Breeder, payload: schemas.MateAllocationRequest) -> Dict[str, Any]:
+    """
+    Pair a breeder's dams with a sire pool under per-sire usage caps. Dams
+    must belong to the breeder; sires may come from any farm. Problems larger
+    than MAX_ALLOCATION_CELLS (dams × expanded sire slots) are rejected.
+    """
+
+    started = time.perf_counter()
+    animal_type = payload.animal_type or breeder.animal_type
+
+    if payload.dam_ids is None:
+        dams = get_open_dams(db, breeder_id=breeder.id, animal_type=animal_type)
+
+    else:
+        dam_ids = list(dict.fromkeys(payload.dam_ids))
+        found = {dam.id: dam for dam in db.query(models.Animal).filter(models.Animal.id.in_(dam_ids)).all()}
+        invalid = [
+            dam_id for dam_id in dam_ids
+            if dam_id not in found or found[dam_id].breeder_id != breeder.id
+            or found[dam_id].gender != "female" or found[dam_id].animal_type != animal_type
+        ]
+
+        if invalid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid dam IDs: {invalid}")
+        dams = [found[dam_id] for dam_id in dam_ids]
+
+    if payload.sire_ids is None:
+        filters = SireCandidateFilter(
+            breeds=tuple(payload.breeds), county=payload.county, approved_breeders_only=payload.approved_only
+        )
+        sires = [sire for sire, _ in sire_pool_query(db, animal_type, filters).all()]
+
+    else:
+        sire_ids = list(dict.fromkeys(payload.sire_ids))
+        found = {sire.id: sire for sire in db.query(models.Animal).filter(models.Animal.id.in_(sire_ids)).all()}
+        invalid = [
+            sire_id for sire_id in sire_ids
+            if sire_id not in found or found[sire_id].gender != "male" or found[sire_id].animal_type != animal_type
+        ]
+
+        if invalid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid sire IDs: {invalid}")
+        sires = [found[sire_id] for sire_id in sire_ids]
+
+    caps = [payload.sire_caps.get(sire.id, payload.default_cap) for sire in sires]
+    cells = len(dams) * sum(min(cap, len(dams)) for cap in caps)
+
+    if cells > MAX_ALLOCATION_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Allocation problem is too large; narrow the sire pool or lower the usage caps",
+        )
+
+    depth = FULL_PEDIGREE_DEPTH if payload.coi_method == "kinship" else ALLOCATION_MAX_DEPTH
+    pedigree = get_pedigree_nodes(db, [dam.id for dam in dams] + [sire.id for sire in sires], depth)
+    profiles = build_animal_breeding_profiles(sires, db)
+    matrix = build_pair_score_matrix(
+        dams, [profiles[sire.id] for sire in sires], pedigree, max_depth=ALLOCATION_MAX_DEPTH, coi_method=payload.coi_method,
+        carriers=get_carrier_probabilities(db, animal_type),
+    )
+    scored = time.perf_counter()
+    allocation = allocate_mates(matrix, caps, objective=payload.objective, max_coi=payload.max_coi)
+    solved = time.perf_counter()
+
+    dams_by_id = {dam.id: dam for dam in dams}
+    sires_by_id = {sire.id: sire for sire in sires}
+    dam_rows = {dam_id: row for row, dam_id in enumerate(matrix.dam_ids)}
+    sire_columns = {sire_id: column for column, sire_id in enumerate(matrix.sire_ids)}
+    assignments = []
+
+    for dam_id, sire_id in allocation.assignments:
+        row, column = dam_rows[dam_id], sire_columns[sire_id]
+        coi = float(matrix.coi[row, column])
+        assignments.append({
+            "dam_id": dam_id,
+            "dam_animal_id": dams_by_id[dam_id].animal_id,
+            "sire_id": sire_id,
+            "sire_animal_id": sires_by_id[sire_id].animal_id,
+            "coi": round(coi, 6),
+            "coi_percent": round(coi * 100, 2),
+            "final_score": round(float(matrix.final_score[row, column]), 4),
+        })
+    return {
+        "animal_type": animal_type,
+        "objective": payload.objective,
+        "coi_method": payload.coi_method,
+        "dams": len(dams),
+        "sires": len(sires),
+        "assignments": assignments,
+        "unassigned_dam_ids": allocation.unassigned_dam_ids,
+        "sire_usage": [
+            {"sire_id": sire.id, "sire_animal_id": sire.animal_id, "used": allocation.sire_usage.get(sire.id, 0), "cap": cap}
+            for sire, cap in zip(sires, caps)
+        ],
+        "total_score": round(allocation.total_score, 4),
+        "mean_coi": round(allocation.mean_coi, 6) if allocation.mean_coi is not None else None,
+        "timing_ms": {
+            "score_matrix": round((scored - started) * 1000, 1),
+            "assignment": round((solved - scored) * 1000, 1),
+        },
+    }
+
+# Retrieves top sires for many dams from one shared score matrix.
+def batch_recommend_sires(db: Session, *, payload: schemas.BatchRecommendationRequest) -> Dict[str, Any]:
+    """
+    Per-dam top-N sire rankings for up to MAX_BATCH_DAMS dams. Dams are
+    grouped by animal_type; each group loads its sire pool, profiles and
+    pedigree once and builds one dams × sires COI and score matrix, so a
+    dam's ranking is a sort of its matrix row. Groups larger than
+    MAX_BATCH_CELLS (dams × sire pool), or than MAX_BATCH_KINSHIP_ANIMALS
+    dams and sires for the kinship method, are rejected.
+    """
+
+    started = time.perf_counter()
+    dam_ids = list(dict.fromkeys(payload.dam_ids))
+
+    if len(dam_ids) > MAX_BATCH_DAMS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_BATCH_DAMS} dams can be ranked at once")
+
+    if payload.min_age_months is not None and payload.max_age_months is not None and payload.min_age_months > payload.max_age_months:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="min_age_months cannot exceed max_age_months")
+
+    dams = {dam.id: dam for dam in db.query(models.Animal).filter(models.Animal.id.in_(dam_ids)).all()}
+    missing = [dam_id for dam_id in dam_ids if dam_id not in dams]
+
+    if missing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Dams not found: {missing}")
+
+    not_female = [dam_id for dam_id in dam_ids if dams[dam_id].gender != "female"]
+
+    if not_female:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Not female: {not_female}")
+
+    filters = SireCandidateFilter(
+        breeds=tuple(payload.breeds),
+        min_age_months=payload.min_age_months,
+        max_age_months=payload.max_age_months,
+        county=payload.county,
+        approved_breeders_only=payload.approved_only,
+    )
+    groups: Dict[str, List[models.Animal]] = {}
+
+    for dam_id in dam_ids:
+        groups.setdefault(dams[dam_id].animal_type, []).append(dams[dam_id])
+
+    rankings: Dict[int, List[Dict[str, Any]]] = {}
+    candidates: Dict[str, int] = {}
+
+    for animal_type, group in groups.items():
+        max_pool = MAX_BATCH_CELLS // len(group)
+
+        if payload.coi_method == "kinship":
+            max_pool = max(min(max_pool, MAX_BATCH_KINSHIP_ANIMALS - len(group)), 0)
+
+        # One row past the limit is enough to reject without loading an oversized pool.
+        pool = sire_pool_query(db, animal_type, filters).limit(max_pool + 1).all()
+
+        if len(pool) > max_pool:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many {animal_type} sires or dams to rank at once; narrow the sire pool or send fewer dams",
+            )
+
+        candidates[animal_type] = len(pool)
+        sires = [sire for sire, _ in pool]
+        depth = FULL_PEDIGREE_DEPTH if payload.coi_method == "kinship" else ALLOCATION_MAX_DEPTH
+        pedigree = get_pedigree_nodes(db, [dam.id for dam in group] + [sire.id for sire in sires], depth)
+        profiles = build_animal_breeding_profiles(sires, db)
+        matrix = build_pair_score_matrix(
+            group, [profiles[sire.id] for sire in sires], pedigree, max_depth=ALLOCATION_MAX_DEPTH, coi_method=payload.coi_method,
+            carriers=get_carrier_probabilities(db, animal_type),
+        )
+
+        for row, columns in enumerate(rank_sires_per_dam(matrix, payload.top_n, exclude_related=payload.exclude_close_relatives)):
+            rankings[matrix.dam_ids[row]] = [_batch_entry(matrix, row, column, *pool[column]) for column in columns]
+
+    return {
+        "coi_method": payload.coi_method,
+        "top_n": payload.top_n,
+        "candidates": candidates,
+        "dams": [
+            {
+                "dam_id": dam_id,
+                "dam_animal_id": dams[dam_id].animal_id,
+                "animal_type": dams[dam_id].animal_type,
+                "recommendations": rankings[dam_id],
+            }
+            for dam_id in dam_ids
+        ],
+        "timing_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+# Internal helper for batch entry.
+def _batch_entry(matrix, row: int, column: int, sire: models.Animal, breeder: Optional[models.Breeder]) -> Dict[str, Any]:
+    coi = float(matrix.coi[row, column])
+    performance, health, fertility, offspring, confidence = matrix.sire_components[column].tolist()
+    return {
+        "sire_id": sire.id,
+        "sire_animal_id": sire.animal_id,
+        "breed": sire.breed,
+        "farm_name": breeder.farm_name if breeder else "Unknown",
+        "coi": round(coi, 6),
+        "coi_percent": round(coi * 100, 2),
+        "genetic_diversity_score": round(float(genetics_vectorized.score_genetic_diversity(coi)) * 100, 1),
+        "performance_score": round(performance * 100, 1),
+        "health_score": round(health * 100, 1),
+        "fertility_score": round(fertility * 100, 1),
+        "offspring_score": round(offspring * 100, 1),
+        "confidence_score": round(confidence * 100, 1),
+        "penalty_score": round(float(matrix.penalty_score[row, column]) * 100, 1),
+        "close_relative": bool(matrix.related[row, column]),
+        "final_score": round(float(matrix.final_score[row, column]), 4),
+    }
+
+# Calculates optimal contributions for a breed's selection candidates.
+def optimal_contribution_selection(
+    db: Session, *, breeder: models.Breeder, payload: schemas.OptimalContributionRequest
+) -> Dict[str, Any]:
+    """
+    Solve optimal contribution selection over the listed animals, or over
+    every animal of the type (and breeds) in the registry. Merit comes from
+    the recommendation score components; kinship from the full pedigree.
+    At most MAX_OCS_CANDIDATES animals are accepted.
+    """
+
+    started = time.perf_counter()
+    animal_type = payload.animal_type or breeder.animal_type
+
+    if payload.animal_ids is None:
+        query = db.query(models.Animal).filter(
+            models.Animal.animal_type == animal_type, models.Animal.gender.in_(["male", "female"])
+        )
+
+        if payload.breeds:
+            query = query.filter(models.Animal.breed.in_(payload.breeds))
+        animals = query.order_by(models.Animal.id).limit(MAX_OCS_CANDIDATES + 1).all()
+
+    else:
+        animal_ids = list(dict.fromkeys(payload.animal_ids))
+        found = {animal.id: animal for animal in db.query(models.Animal).filter(models.Animal.id.in_(animal_ids)).all()}
+        invalid = [
+            animal_id for animal_id in animal_ids
+            if animal_id not in found or found[animal_id].animal_type != animal_type
+            or found[animal_id].gender not in ("male", "female")
+        ]
+
+        if invalid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid animal IDs: {invalid}")
+        animals = [found[animal_id] for animal_id in animal_ids]
+
+    if len(animals) > MAX_OCS_CANDIDATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_OCS_CANDIDATES} candidates can be optimised at once; narrow the breeds or list the animals",
+        )
+
+    is_male = np.array([animal.gender == "male" for animal in animals], dtype=bool)
+
+    if not is_male.any() or is_male.all():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Candidates must include both males and females")
+
+    animal_ids = [animal.id for animal in animals]
+    nodes = get_pedigree_nodes(db, animal_ids, FULL_PEDIGREE_DEPTH)
+    kinship = memoize_by_epoch(
+        db,
+        ("kinship", tuple(animal_ids)),
+        lambda: _read_only(kinship_matrix(nodes, animal_ids)),
+        animal_type,
+    )
+    profiles = build_animal_breeding_profiles(animals, db)
+    merit = merit_vector([profiles[animal_id] for animal_id in animal_ids])
+    prepared = time.perf_counter()
+
+    target = payload.max_coancestry if payload.max_coancestry is not None else coancestry_target(kinship, is_male, payload.delta_f)
+    result = optimal_contributions(kinship, merit, is_male, target)
+    solved = time.perf_counter()
+
+    selected = []
+
+    for position in np.flatnonzero(result.contributions > 0):
+        animal = animals[position]
+        contribution = float(result.contributions[position])
+        entry = {
+            "animal_db_id": animal.id,
+            "animal_id": animal.animal_id,
+            "gender": animal.gender,
+            "breed": animal.breed,
+            "contribution": round(contribution, 6),
+            "merit": round(float(merit[position]), 4),
+        }
+
+        if payload.offspring is not None:
+            # Every offspring has one sire and one dam, so a parent's share is 2c.
+            entry["expected_offspring"] = round(2 * contribution * payload.offspring, 1)
+        selected.append(entry)
+
+    selected.sort(key=lambda entry: (entry["gender"] != "male", -entry["contribution"], entry["animal_db_id"]))
+    return {
+        "animal_type": animal_type,
+        "candidates": len(animals),
+        "males": int(is_male.sum()),
+        "females": int((~is_male).sum()),
+        "delta_f": payload.delta_f if payload.max_coancestry is None else None,
+        "target_coancestry": round(result.target_coancestry, 6),
+        "group_coancestry": round(result.group_coancestry, 6),
+        "minimum_coancestry": round(result.minimum_coancestry, 6),
+        "feasible": result.feasible,
+        "constraint_binding": result.constraint_binding,
+        "expected_merit": round(result.expected_merit, 4),
+        "selected": selected,
+        "timing_ms": {
+            "kinship_and_merit": round((prepared - started) * 1000, 1),
+            "solve": round((solved - prepared) * 1000, 1),
+        },
+    }
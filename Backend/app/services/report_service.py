@@ -10,7 +10,7 @@ from __future__ import annotations
 from collections import Counter, defaultdict
 from datetime import date, timedelta
 from statistics import mean
-from typing import Iterable
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from .. import models
 from . import breeding_service
@@ -45,26 +45,6 @@ def _pct(numerator: int | float, denominator: int | float) -> float:
         return 0.0
     return round((float(numerator) / float(denominator)) * 100, 1)
 
-# Internal helper for latest by animal.
-def _latest_by_animal(records: Iterable, date_attr: str) -> dict[int, object]:
-    latest: dict[int, object] = {}
-
-    for rec in records:
-        animal_id = getattr(rec, "animal_id", None)
-
-        rec_date = getattr(rec, date_attr, None)
-
-        if animal_id is None:
-            continue
-
-        current = latest.get(animal_id)
-
-        current_date = getattr(current, date_attr, None) if current else None
-
-        if current is None or (rec_date and (not current_date or rec_date > current_date)):
-            latest[animal_id] = rec
-    return latest
-
 # Internal helper for animal age months.
 def _animal_age_months(animal: models.Animal, today: date) -> int | None:
     if not animal.date_of_birth:
@@ -79,11 +59,18 @@ def get_breeder_report_summary(db: Session, *, breeder_id: int) -> dict:
     breeder = db.query(models.Breeder).filter(models.Breeder.id == breeder_id).first()
     animals = db.query(models.Animal).filter(models.Animal.breeder_id == breeder_id).all()
     events = db.query(models.BreedingEvent).filter(models.BreedingEvent.breeder_id == breeder_id).all()
-    health_records = db.query(models.AnimalHealthRecord).filter(models.AnimalHealthRecord.breeder_id == breeder_id).all()
-    fertility_records = db.query(models.AnimalFertilityRecord).filter(models.AnimalFertilityRecord.breeder_id == breeder_id).all()
-    production_records = db.query(models.AnimalProductionRecord).filter(models.AnimalProductionRecord.breeder_id == breeder_id).all()
-    measurements = db.query(models.AnimalMeasurement).filter(models.AnimalMeasurement.breeder_id == breeder_id).all()
-    offspring_records = db.query(models.AnimalOffspringRecord).filter(models.AnimalOffspringRecord.breeder_id == breeder_id).all()
+    # Latest health, fertility, production and weight come from the current-state rows
+    # joined to each animal; history is only aggregated for the herd production averages.
+    states = {a.id: a.current_state for a in animals if a.current_state is not None}
+    production_averages = (
+        db.query(
+            func.avg(models.AnimalProductionRecord.daily_milk_yield),
+            func.avg(models.AnimalProductionRecord.average_daily_gain),
+            func.avg(models.AnimalProductionRecord.egg_count_annual),
+        )
+        .filter(models.AnimalProductionRecord.breeder_id == breeder_id)
+        .one()
+    )
     animal_by_id = {a.id: a for a in animals}
     gender_counts = Counter((a.gender or "unknown").lower() for a in animals)
     breed_counts = Counter(a.breed or "Unknown" for a in animals)
@@ -105,10 +92,10 @@ def get_breeder_report_summary(db: Session, *, breeder_id: int) -> dict:
     live_offspring_total = sum(int(e.live_offspring_count or e.offspring_count or (1 if e.offspring_id else 0)) for e in live_birth_events)
     total_offspring_recorded = sum(int(e.offspring_count or e.live_offspring_count or (1 if e.offspring_id else 0)) for e in live_birth_events)
     survival_rate = _pct(live_offspring_total, total_offspring_recorded)
-    latest_health = _latest_by_animal(health_records, "record_date")
-    latest_fertility = _latest_by_animal(fertility_records, "record_date")
-    latest_production = _latest_by_animal(production_records, "record_date")
-    latest_measurements = _latest_by_animal(measurements, "measured_at")
+    latest_health = {animal_id for animal_id, state in states.items() if state.health_record_date is not None}
+    latest_fertility = {animal_id for animal_id, state in states.items() if state.fertility_record_date is not None}
+    latest_production = {animal_id for animal_id, state in states.items() if state.production_record_date is not None}
+    latest_measurements = {animal_id for animal_id, state in states.items() if state.latest_measured_at is not None}
     animals_with_weight = sum(1 for a in animals if a.current_weight is not None or a.id in latest_measurements)
     animals_with_health = sum(1 for a in animals if a.health_status or a.id in latest_health)
     animals_with_fertility = sum(1 for a in animals if a.fertility_status or a.id in latest_fertility)
@@ -128,11 +115,10 @@ def get_breeder_report_summary(db: Session, *, breeder_id: int) -> dict:
     health_watchlist = []
 
     for animal in animals:
-        rec = latest_health.get(animal.id)
-        status = (getattr(rec, "health_status", None) or animal.health_status or "unknown").lower()
+        status = (animal.health_status or "unknown").lower()
         health_status_counter[_title(status)] += 1
-        disease = getattr(rec, "disease_history", None) or animal.disease_history
-        hereditary = getattr(rec, "hereditary_conditions", None) or animal.hereditary_conditions
+        disease = animal.disease_history
+        hereditary = animal.hereditary_conditions
 
         if status in NEGATIVE_HEALTH or disease or hereditary:
             health_watchlist.append({
@@ -246,9 +232,7 @@ def get_breeder_report_summary(db: Session, *, breeder_id: int) -> dict:
         else:
             herd_age_groups["24+ months"] += 1
 
-    daily_milk_values = [r.daily_milk_yield for r in production_records if r.daily_milk_yield is not None]
-    adg_values = [r.average_daily_gain for r in production_records if r.average_daily_gain is not None]
-    egg_values = [r.egg_count_annual for r in production_records if r.egg_count_annual is not None]
+    average_milk, average_gain, average_eggs = production_averages
     recommended_actions = []
 
     if overdue:
@@ -338,9 +322,9 @@ def get_breeder_report_summary(db: Session, *, breeder_id: int) -> dict:
 
         "production_report": {
             "animals_with_production_records": animals_with_production,
-            "average_daily_milk_yield": round(mean(daily_milk_values), 2) if daily_milk_values else None,
-            "average_daily_gain": round(mean(adg_values), 2) if adg_values else None,
-            "average_annual_egg_count": round(mean(egg_values), 2) if egg_values else None,
+            "average_daily_milk_yield": round(float(average_milk), 2) if average_milk is not None else None,
+            "average_daily_gain": round(float(average_gain), 2) if average_gain is not None else None,
+            "average_annual_egg_count": round(float(average_eggs), 2) if average_eggs is not None else None,
         },
 
         "recommended_actions": recommended_actions,
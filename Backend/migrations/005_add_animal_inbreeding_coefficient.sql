@@ -0,0 +1,7 @@
+-- Stores exact per-animal inbreeding coefficients computed by the batch engine in Backend/app/inbreeding.py.
+-- Safe to run multiple times on PostgreSQL. For SQLite/dev, SQLAlchemy create_all will create these on new databases.
+
+-- Updates an existing table structure safely.
+ALTER TABLE animals ADD COLUMN IF NOT EXISTS inbreeding_coefficient DOUBLE PRECISION;
+-- Updates an existing table structure safely.
+ALTER TABLE animals ADD COLUMN IF NOT EXISTS inbreeding_computed_at TIMESTAMP;
@@ -0,0 +1,36 @@
+-- Denormalized latest-value row per animal, maintained on write by Backend/app/current_state.py.
+-- Safe to run multiple times on PostgreSQL. Backfill afterwards with:
+--     python -m Backend.app.cli rebuild-current-state
+
+-- Creates a database table used by the application.
+CREATE TABLE IF NOT EXISTS animal_current_state (
+    animal_id INTEGER PRIMARY KEY REFERENCES animals(id) ON DELETE CASCADE,
+    latest_measured_at DATE,
+    birth_weight FLOAT,
+    current_weight FLOAT,
+    weaning_weight FLOAT,
+    mature_weight FLOAT,
+    body_condition_score FLOAT,
+    average_daily_gain FLOAT,
+    health_record_date DATE,
+    health_status VARCHAR(50),
+    vaccination_status VARCHAR(50),
+    disease_history TEXT,
+    hereditary_conditions TEXT,
+    vet_notes TEXT,
+    fertility_record_date DATE,
+    fertility_status VARCHAR(50),
+    age_at_first_service_months FLOAT,
+    services_per_conception FLOAT,
+    birth_interval_days FLOAT,
+    production_record_date DATE,
+    production_type VARCHAR(50),
+    daily_milk_yield FLOAT,
+    milk_fat_percent FLOAT,
+    egg_count_annual INTEGER,
+    offspring_record_date DATE,
+    offspring_count INTEGER,
+    offspring_survival_rate FLOAT,
+    offspring_quality_score FLOAT,
+    updated_at TIMESTAMP
+);
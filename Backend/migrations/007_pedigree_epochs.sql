@@ -0,0 +1,9 @@
+-- Pedigree epochs for genetics result caching, bumped on write by Backend/app/pedigree.py.
+-- Safe to run multiple times on PostgreSQL. For SQLite/dev, SQLAlchemy create_all will create this on new databases.
+
+-- Creates a database table used by the application.
+CREATE TABLE IF NOT EXISTS pedigree_epochs (
+    scope VARCHAR(50) PRIMARY KEY,
+    epoch INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP
+);
@@ -0,0 +1,5 @@
+-- Composite index behind the candidate-sire prefilter in Backend/app/genetics_candidates.py.
+-- Safe to run multiple times on PostgreSQL. For SQLite/dev, SQLAlchemy create_all will create this on new databases.
+
+-- Creates an index used by candidate sire selection (animal_type, gender, breed).
+CREATE INDEX IF NOT EXISTS idx_animals_type_gender_breed ON animals(animal_type, gender, breed);
@@ -0,0 +1,13 @@
+-- Stored per-animal pedigree completeness, maintained by Backend/app/pedigree_completeness.py.
+-- Safe to run multiple times on PostgreSQL. Backfill afterwards with:
+--     python -m Backend.app.cli refresh-completeness
+
+-- Creates a database table used by the application.
+CREATE TABLE IF NOT EXISTS animal_pedigree_completeness (
+    animal_id INTEGER PRIMARY KEY REFERENCES animals(id) ON DELETE CASCADE,
+    known_slots TEXT NOT NULL,
+    expected_slots TEXT NOT NULL,
+    equivalent_generations DOUBLE PRECISION NOT NULL,
+    pec DOUBLE PRECISION NOT NULL,
+    computed_at TIMESTAMP
+);
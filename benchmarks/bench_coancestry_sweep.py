@@ -0,0 +1,45 @@
+# benchmarks/bench_coancestry_sweep.py: contains backend logic for the Animal Breed Registry System.
+"""
+Compare pairwise COI with the one-dam coancestry sweep used by recommend_sires.
+
+Run from the repository root:
+
+    python benchmarks/bench_coancestry_sweep.py --generations 12 --max-depth 8
+"""
+
+from __future__ import annotations
+import argparse
+import time
+
+from synthetic_pedigree import interbred_pedigree
+from Backend.app.genetics import CoancestrySweep, compute_inbreeding_coefficient
+
+# Handles main logic for this module.
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--generations", type=int, default=12)
+    parser.add_argument("--per-generation", type=int, default=40)
+    parser.add_argument("--max-depth", type=int, default=8)
+    args = parser.parse_args()
+
+    nodes = interbred_pedigree(generations=args.generations, per_generation=args.per_generation)
+    dam_id = max(a for a in nodes if nodes[a].gender == "female")
+    sires = [a for a in nodes if nodes[a].gender == "male"]
+
+    started = time.perf_counter()
+    pairwise = [compute_inbreeding_coefficient(s, dam_id, None, args.max_depth, pedigree=nodes) for s in sires]
+    pairwise_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sweep = CoancestrySweep(nodes, dam_id, args.max_depth)
+    swept = [sweep.coi(s) for s in sires]
+    sweep_seconds = time.perf_counter() - started
+
+    assert pairwise == swept, "coancestry sweep diverged from pairwise COI"
+    print(f"pedigree: {len(nodes)} animals, {len(sires)} candidate sires, max_depth={args.max_depth}")
+    print(f"pairwise COI : {pairwise_seconds * 1000:9.1f} ms")
+    print(f"sweep        : {sweep_seconds * 1000:9.1f} ms")
+    print(f"speedup      : {pairwise_seconds / max(sweep_seconds, 1e-9):9.1f}x")
+
+if __name__ == "__main__":
+    main()
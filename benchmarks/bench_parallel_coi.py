@@ -0,0 +1,61 @@
+# benchmarks/bench_parallel_coi.py: contains backend logic for the Animal Breed Registry System.
+"""
+Measure COI throughput of the process-pool executor against worker count.
+
+Run from the repository root:
+
+    python benchmarks/bench_parallel_coi.py --generations 14 --dams 8 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import time
+
+from synthetic_pedigree import interbred_pedigree
+from Backend.app.genetics_parallel import ProcessCoiExecutor, SequentialCoiExecutor, build_pedigree_snapshot, shutdown_coi_pool
+
+# Handles main logic for this module.
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--generations", type=int, default=14)
+    parser.add_argument("--per-generation", type=int, default=400)
+    parser.add_argument("--max-depth", type=int, default=8)
+    parser.add_argument("--dams", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    nodes = interbred_pedigree(generations=args.generations, per_generation=args.per_generation)
+    females = [a for a in nodes if nodes[a].gender == "female"]
+    dams = females[-args.dams:]
+    sires = [a for a in nodes if nodes[a].gender == "male"]
+    pairs = [(sire_id, dam_id) for dam_id in dams for sire_id in sires]
+    print(f"pedigree: {len(nodes)} animals, {len(sires)} sires x {len(dams)} dams = {len(pairs)} pairs, "
+          f"max_depth={args.max_depth}, cpu_count={os.cpu_count()}")
+
+    started = time.perf_counter()
+    expected = SequentialCoiExecutor(nodes).pair_coi(pairs, args.max_depth)
+    baseline = time.perf_counter() - started
+    print(f"sequential     : {baseline * 1000:9.1f} ms")
+
+    for workers in args.workers:
+        if workers <= 1:
+            continue
+
+        snapshot = build_pedigree_snapshot(nodes, dams + sires, args.max_depth)
+
+        # The first pass starts the pool and ships the snapshot; later passes reuse both.
+        for label in ("cold", "warm"):
+            started = time.perf_counter()
+
+            with ProcessCoiExecutor(nodes, snapshot, workers) as executor:
+                values = executor.pair_coi(pairs, args.max_depth)
+
+            seconds = time.perf_counter() - started
+            assert values == expected, "worker results diverged from sequential COI"
+            print(f"{workers:2d} workers {label}: {seconds * 1000:9.1f} ms  speedup {baseline / seconds:5.2f}x")
+
+        shutdown_coi_pool()
+
+if __name__ == "__main__":
+    main()
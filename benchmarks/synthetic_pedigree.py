@@ -0,0 +1,94 @@
+# benchmarks/synthetic_pedigree.py: contains backend logic for the Animal Breed Registry System.
+"""Synthetic pedigrees and breeding profiles shared by the genetics benchmarks."""
+
+from __future__ import annotations
+import random
+from datetime import date
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from Backend.app.pedigree import PedigreeNode
+
+# Builds a closed, deeply interbred pedigree.
+def interbred_pedigree(
+    founders: int = 6,
+    generations: int = 10,
+    per_generation: int = 12,
+    seed: int = 7,
+    animal_type: str = "cattle",
+) -> Dict[int, PedigreeNode]:
+    """
+    Return `{animal_db_id: PedigreeNode}` for a small closed herd where every
+    generation is bred from the previous two, so most animals share many
+    ancestors through many paths.
+    """
+
+    rng = random.Random(seed)
+    nodes: Dict[int, PedigreeNode] = {}
+    next_id = 1
+    previous = []
+
+    for index in range(founders):
+        gender = "male" if index % 2 == 0 else "female"
+        nodes[next_id] = PedigreeNode(next_id, None, None, animal_type, gender, date(2000, 1, 1))
+        previous.append(next_id)
+        next_id += 1
+
+    history = [previous]
+
+    for generation in range(1, generations + 1):
+        pool = [animal_id for group in history[-2:] for animal_id in group]
+        males = [a for a in pool if nodes[a].gender == "male"]
+        females = [a for a in pool if nodes[a].gender == "female"]
+        current = []
+
+        for index in range(per_generation):
+            gender = "male" if index % 2 == 0 else "female"
+            nodes[next_id] = PedigreeNode(
+                next_id, rng.choice(males), rng.choice(females), animal_type, gender, date(2000 + generation, 1, 1),
+            )
+            current.append(next_id)
+            next_id += 1
+
+        history.append(current)
+    return nodes
+
+# Builds random breeding profiles with realistic gaps in the records.
+def synthetic_profiles(count: int, seed: int = 7, animal_type: str = "cattle") -> List[SimpleNamespace]:
+    """
+    Return `count` profile-like objects carrying every attribute the scoring
+    functions read. Each value is missing about a third of the time.
+    """
+
+    rng = random.Random(seed)
+
+    # Internal helper for maybe.
+    def maybe(value):
+        return value if rng.random() > 0.35 else None
+
+    profiles = []
+
+    for animal_id in range(1, count + 1):
+        profiles.append(SimpleNamespace(
+            id=animal_id, animal_type=animal_type, sire_id=maybe(rng.randint(1, count)), dam_id=maybe(rng.randint(1, count)),
+            birth_weight=maybe(rng.uniform(20, 45)), current_weight=maybe(rng.uniform(200, 900)),
+            weaning_weight=maybe(rng.uniform(120, 260)), body_condition_score=maybe(rng.uniform(1, 5)),
+            average_daily_gain=maybe(rng.uniform(0.2, 2.2)), daily_milk_yield=maybe(rng.uniform(5, 40)),
+            milk_fat_percent=maybe(rng.uniform(2.5, 6)), egg_count_annual=None,
+            health_status=maybe(rng.choice(["good", "excellent", "poor", "fair"])),
+            vaccination_status=maybe(rng.choice(["complete", "partial", "missing"])),
+            disease_history=maybe(rng.choice(["none", "recurrent mastitis", "treated once"])),
+            hereditary_conditions=maybe(rng.choice(["none", "carrier"])),
+            fertility_status=maybe(rng.choice(["proven", "fertile", "poor"])),
+            age_at_first_service_months=maybe(rng.uniform(12, 30)), services_per_conception=maybe(rng.uniform(1, 4)),
+            birth_interval_days=maybe(rng.uniform(330, 500)), offspring_count=maybe(rng.randint(0, 20)),
+            offspring_survival_rate=maybe(rng.uniform(60, 100)), offspring_quality_score=maybe(rng.uniform(40, 95)),
+            successful_breedings=rng.randint(0, 5), failed_breedings=rng.randint(0, 3),
+            last_breeding_status=None, last_breeding_outcome=None,
+            data_sources=["animal_measurements", "animal_health_records"],
+        ))
+    return profiles
@@ -59,3 +59,114 @@ def test_fertility_score_uses_breeding_outcome_history():
     repeated_failures = animal(fertility_status='proven', successful_breedings=0, failed_breedings=3)
     from Backend.app.genetics import score_fertility
     assert score_fertility(proven) > score_fertility(repeated_failures)
+
+# Handles test path count coi matches path enumeration logic for this module.
+def test_path_count_coi_matches_path_enumeration():
+    import random
+    from Backend.app.genetics import _get_ancestors_with_paths, compute_inbreeding_coefficient
+    from Backend.app.pedigree import PedigreeNode, ancestor_graph
+
+    rng = random.Random(3)
+    nodes = {i: PedigreeNode(i, None, None, 'cattle', 'male' if i % 2 else 'female', None) for i in range(1, 5)}
+    for i in range(5, 80):
+        pool = list(range(max(1, i - 16), i))
+        nodes[i] = PedigreeNode(i, rng.choice([a for a in pool if a % 2]), rng.choice([a for a in pool if not a % 2]), 'cattle', 'male' if i % 2 else 'female', None)
+
+    for sire_id, dam_id in [(79, 78), (77, 74), (61, 70)]:
+        sire_paths = _get_ancestors_with_paths(sire_id, ancestor_graph(nodes, sire_id, 8), 0, 8)
+        dam_paths = _get_ancestors_with_paths(dam_id, ancestor_graph(nodes, dam_id, 8), 0, 8)
+        expected = 0.0
+        for ancestor_id in set(sire_paths) & set(dam_paths):
+            for l1 in sire_paths[ancestor_id]:
+                for l2 in dam_paths[ancestor_id]:
+                    expected += 0.5 ** (l1 + l2 + 1)
+        assert compute_inbreeding_coefficient(sire_id, dam_id, None, 8, pedigree=nodes) == round(min(expected, 1.0), 6)
+
+# Handles test coancestry sweep matches pairwise coi logic for this module.
+def test_coancestry_sweep_matches_pairwise_coi():
+    import random
+    from Backend.app.genetics import CoancestrySweep, compute_inbreeding_coefficient
+    from Backend.app.pedigree import PedigreeNode
+
+    rng = random.Random(11)
+    nodes = {i: PedigreeNode(i, None, None, 'cattle', 'male' if i % 2 else 'female', None) for i in range(1, 7)}
+    for i in range(7, 150):
+        pool = list(range(max(1, i - 24), i))
+        sire_id = rng.choice([a for a in pool if a % 2] + [None])
+        nodes[i] = PedigreeNode(i, sire_id, rng.choice([a for a in pool if not a % 2]), 'cattle', 'male' if i % 2 else 'female', None)
+
+    for depth in (0, 3, 8):
+        sweep = CoancestrySweep(nodes, 148, depth)
+        for sire_id in [a for a in nodes if a % 2]:
+            assert sweep.coi(sire_id) == compute_inbreeding_coefficient(sire_id, 148, None, depth, pedigree=nodes)
+
+# Handles test vectorized scores match per animal scoring logic for this module.
+def test_vectorized_scores_match_per_animal_scoring():
+    import random
+    import numpy as np
+    from Backend.app import genetics, genetics_vectorized
+
+    rng = random.Random(5)
+    pick = lambda *options: rng.choice(options)
+    dam = animal(id=500, sire_id=7, dam_id=8)
+    sires = []
+    for i in range(1, 400):
+        sires.append(animal(
+            id=i, animal_type=pick('cattle', 'goat', 'pig', 'poultry', 'camel', None),
+            sire_id=pick(None, 7, 9, 500), dam_id=pick(None, 8, 10),
+            birth_weight=pick(None, 30.0), current_weight=pick(None, 0, 3.5, 95.0, 420.0, 900.0),
+            weaning_weight=pick(None, 12.0, 180.0), body_condition_score=pick(None, 0.5, 3.0, 6.0),
+            average_daily_gain=pick(None, 0.8, 2.5), daily_milk_yield=pick(None, 20.0),
+            milk_fat_percent=pick(None, 1.0, 4.2), egg_count_annual=pick(None, 250),
+            health_status=pick(None, '', 'Good', 'poor', 'quarantined', 'ok'),
+            vaccination_status=pick(None, 'complete', 'Missing', 'partial'),
+            disease_history=pick(None, 'chronic mastitis', 'none'),
+            hereditary_conditions=pick(None, 'carrier', 'hereditary risk', '  '),
+            fertility_status=pick(None, 'proven', 'infertile', 'unknown problem', 'average'),
+            services_per_conception=pick(None, 1.0, 2.5, 6.0), birth_interval_days=pick(None, 300, 400, 900),
+            age_at_first_service_months=pick(None, 14, 40), offspring_count=pick(None, 0, 4, 15),
+            offspring_survival_rate=pick(None, 0.9, 85, 140), offspring_quality_score=pick(None, 70, 130),
+            successful_breedings=pick(0, 1, 4), failed_breedings=pick(0, 2, 3),
+            data_sources=pick(['animals_legacy_fields'], ['animal_measurements', 'animal_health_records']),
+        ))
+    coi = np.array([rng.choice([0.0, 0.02, 0.04, 0.07, 0.2]) for _ in sires])
+
+    columns = genetics_vectorized.build_candidate_columns(sires)
+    result = genetics_vectorized.score_candidates(columns, dam, coi)
+
+    for row, sire in enumerate(sires):
+        confidence, _ = genetics.score_data_confidence(sire)
+        scores = {
+            'genetic_diversity': genetics.score_genetic_diversity(coi[row]),
+            'performance': genetics.score_performance(sire),
+            'health': genetics.score_health(sire),
+            'fertility': genetics.score_fertility(sire),
+            'offspring': genetics.score_offspring(sire),
+            'confidence': confidence,
+        }
+        weighted = sum(scores[key] * weight for key, weight in genetics.SCORING_WEIGHTS.items())
+        penalty, _ = genetics.build_risk_penalties(sire, dam, coi[row], genetics.detect_relationship_risks(sire, dam))
+        expected = [scores[name] for name in genetics_vectorized.COMPONENT_ORDER]
+        assert np.allclose(result['components'][row], expected, atol=1e-12)
+        assert abs(result['final_score'][row] - genetics._clamp(weighted - penalty)) < 1e-9
+
+# Handles test process executor matches sequential coi logic for this module.
+def test_process_executor_matches_sequential_coi():
+    import random
+    from Backend.app.genetics_parallel import ProcessCoiExecutor, SequentialCoiExecutor, build_pedigree_snapshot, open_coi_executor
+    from Backend.app.pedigree import PedigreeNode
+
+    rng = random.Random(17)
+    nodes = {i: PedigreeNode(i, None, None, 'cattle', 'male' if i % 2 else 'female', None) for i in range(1, 7)}
+    for i in range(7, 200):
+        pool = list(range(max(1, i - 30), i))
+        nodes[i] = PedigreeNode(i, rng.choice([a for a in pool if a % 2]), rng.choice([a for a in pool if not a % 2]), 'cattle', 'male' if i % 2 else 'female', None)
+    sire_ids = [a for a in nodes if a % 2]
+    pairs = [(s, d) for d in (198, 150) for s in sire_ids]
+
+    expected = SequentialCoiExecutor(nodes).pair_coi(pairs, 6)
+    snapshot = build_pedigree_snapshot(nodes, [198, 150] + sire_ids, 6)
+    with ProcessCoiExecutor(nodes, snapshot, workers=2, chunk_size=16) as executor:
+        assert executor.pair_coi(pairs, 6) == expected
+    with open_coi_executor(nodes, sire_ids, 6, workers=4, min_candidates=10_000) as executor:
+        assert executor.workers == 1
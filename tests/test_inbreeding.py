@@ -0,0 +1,225 @@
+# tests/test_inbreeding.py: contains backend logic for the Animal Breed Registry System.
+from datetime import date
+from pathlib import Path
+import sys
+import types
+
+passlib_module = types.ModuleType('passlib')
+passlib_context_module = types.ModuleType('passlib.context')
+# Defines the crypt context structure used by this module.
+class CryptContext:
+    # Internal helper for init.
+    def __init__(self, *args, **kwargs): pass
+    # Handles hash logic for this module.
+    def hash(self, value): return value
+    # Handles verify logic for this module.
+    def verify(self, plain, hashed): return plain == hashed
+passlib_context_module.CryptContext = CryptContext
+sys.modules.setdefault('passlib', passlib_module)
+sys.modules.setdefault('passlib.context', passlib_context_module)
+
+jose_module = types.ModuleType('jose')
+# Defines the jwterror structure used by this module.
+class JWTError(Exception): pass
+# Defines the dummy jwt structure used by this module.
+class DummyJWT:
+    # Handles encode logic for this module.
+    def encode(self, *args, **kwargs): return 'token'
+    # Handles decode logic for this module.
+    def decode(self, *args, **kwargs): return {}
+jose_module.JWTError = JWTError
+jose_module.jwt = DummyJWT()
+sys.modules.setdefault('jose', jose_module)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from Backend.app.database import Base
+from Backend.app import models, schemas, crud, inbreeding, pedigree
+from Backend.app.pedigree import PedigreeNode, get_pedigree_index
+
+
+# Handles make session logic for this module.
+def make_session():
+    engine = create_engine('sqlite:///:memory:', connect_args={'check_same_thread': False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+# Handles register logic for this module.
+def register(db, breeder, gender, sire=None, dam=None):
+    return crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Boran', gender=gender, date_of_birth=date(2020, 1, 1),
+        sire_id=sire.animal_id if sire else None, dam_id=dam.animal_id if dam else None,
+    ), breeder.id)
+
+# Creates and stores a new breeder record.
+def create_breeder(db):
+    breeder = models.Breeder(
+        full_name='Inbreeding Breeder', national_id='556', animal_type='cattle', farm_name='Farm',
+        farm_prefix='INB', farm_location='Nakuru', county='Nakuru', phone='0700000000',
+        email='inbreeding@example.com', password_hash='hash', status='approved'
+    )
+    db.add(breeder); db.commit(); db.refresh(breeder); return breeder
+
+# Handles node logic for this module.
+def node(animal_id, sire_id=None, dam_id=None):
+    return PedigreeNode(animal_id, sire_id, dam_id, 'cattle', 'male', None)
+
+# Handles test meuwissen luo matches textbook values logic for this module.
+def test_meuwissen_luo_matches_textbook_values():
+    # 1, 2 founders; 3 and 4 full sibs; 5 = 3 x 4; 6 = 5 x 3 (parent-offspring on an inbred animal).
+    nodes = {
+        1: node(1), 2: node(2), 3: node(3, 1, 2), 4: node(4, 1, 2),
+        5: node(5, 3, 4), 6: node(6, 3, 5), 7: node(7, 2),
+    }
+    order = inbreeding.topological_order(nodes)
+    values = inbreeding.meuwissen_luo(nodes, order)
+
+    assert order.index(3) < order.index(5) < order.index(6)
+    assert values[3] == values[4] == values[7] == 0.0
+    assert values[5] == 0.25
+    assert abs(values[6] - 0.375) < 1e-12
+
+# Handles test topological order rejects cycles logic for this module.
+def test_topological_order_rejects_cycles():
+    nodes = {1: node(1, 2), 2: node(2, 1)}
+
+    try:
+        inbreeding.topological_order(nodes)
+    except ValueError as exc:
+        assert 'cycle' in str(exc)
+    else:
+        raise AssertionError('cyclic pedigree was accepted')
+
+# Handles test refresh stores f and exact pair f uses ancestor f logic for this module.
+def test_refresh_stores_f_and_exact_pair_f_uses_ancestor_f():
+    db = make_session()
+    breeder = create_breeder(db)
+    founder_sire = register(db, breeder, 'male')
+    founder_dam = register(db, breeder, 'female')
+    brother = register(db, breeder, 'male', sire=founder_sire, dam=founder_dam)
+    sister = register(db, breeder, 'female', sire=founder_sire, dam=founder_dam)
+    inbred_sire = register(db, breeder, 'male', sire=brother, dam=sister)
+    daughter = register(db, breeder, 'female', sire=inbred_sire)
+    son = register(db, breeder, 'male', sire=inbred_sire)
+
+    assert inbreeding.refresh_inbreeding_coefficients(db, animal_type='cattle') == 7
+
+    db.refresh(inbred_sire)
+    assert inbred_sire.inbreeding_coefficient == 0.25
+    assert inbred_sire.inbreeding_computed_at is not None
+    assert get_pedigree_index(db).get(inbred_sire.id).inbreeding_coefficient == 0.25
+    # Half sibs through an ancestor with F = 0.25: 0.125 x (1 + 0.25).
+    assert inbreeding.offspring_inbreeding(get_pedigree_index(db), son.id, daughter.id) == 0.15625
+
+# Handles test parentage change clears stored f for descendants logic for this module.
+def test_parentage_change_clears_stored_f_for_descendants():
+    db = make_session()
+    breeder = create_breeder(db)
+    sire = register(db, breeder, 'male')
+    dam = register(db, breeder, 'female')
+    brother = register(db, breeder, 'male', sire=sire, dam=dam)
+    sister = register(db, breeder, 'female', sire=sire, dam=dam)
+    calf = register(db, breeder, 'female', sire=brother, dam=sister)
+
+    assert inbreeding.get_animal_inbreeding(db, calf) == 0.25
+    assert calf.inbreeding_coefficient == 0.25
+
+    crud.update_animal(db, sister, schemas.AnimalUpdate(sire_id=None))
+    db.refresh(calf)
+    assert calf.inbreeding_coefficient is None
+    assert get_pedigree_index(db).get(calf.id).inbreeding_coefficient is None
+    assert inbreeding.get_animal_inbreeding(db, calf) == 0.125
+
+# Handles test sire correction recomputes only the descendant cone in the background logic for this module.
+def test_sire_correction_recomputes_only_the_descendant_cone_in_the_background():
+    from fastapi import BackgroundTasks
+    from Backend.app.routes.breeders import update_animal_for_breeder
+
+    db = make_session()
+    breeder = create_breeder(db)
+    sire = register(db, breeder, 'male')
+    dam = register(db, breeder, 'female')
+    other_sire = register(db, breeder, 'male')
+    brother = register(db, breeder, 'male', sire=sire, dam=dam)
+    sister = register(db, breeder, 'female', sire=sire, dam=dam)
+    calf = register(db, breeder, 'female', sire=brother, dam=sister)
+    bystander = register(db, breeder, 'male', sire=brother, dam=dam)
+    inbreeding.refresh_inbreeding_coefficients(db, animal_type='cattle')
+    calf_id, bystander_id = calf.id, bystander.id
+    bystander_computed_at = bystander.inbreeding_computed_at
+    assert calf.inbreeding_coefficient == 0.25
+
+    tasks = BackgroundTasks()
+    body = update_animal_for_breeder(
+        breeder.id, sister.id, schemas.AnimalUpdate(sire_id=other_sire.animal_id), tasks, db=db, current_breeder=breeder
+    )
+    # The sister and her calf; values are cleared until the task runs after the response.
+    assert body.pedigree_recompute_count == 2
+    assert len(tasks.tasks) == 1
+    assert get_pedigree_index(db).get(calf_id).inbreeding_coefficient is None
+    assert get_pedigree_index(db).completeness(calf_id) is None
+
+    for task in tasks.tasks:
+        task.func(*task.args, **task.kwargs)
+
+    db.expire_all()
+    # Now half sibs through the dam.
+    assert db.get(models.Animal, calf_id).inbreeding_coefficient == 0.125
+    assert get_pedigree_index(db).completeness(calf_id).known_slots[:2] == (2, 4)
+    assert db.get(models.Animal, bystander_id).inbreeding_computed_at == bystander_computed_at
+    assert db.get(models.Animal, bystander_id).inbreeding_coefficient == 0.25
+
+# Handles test colleau kinship matches meuwissen luo logic for this module.
+def test_colleau_kinship_matches_meuwissen_luo():
+    import random
+    from Backend.app.kinship import kinship_matrix
+
+    rng = random.Random(5)
+    nodes = {i: node(i) for i in range(1, 7)}
+    for i in range(7, 120):
+        pool = list(range(max(1, i - 20), i))
+        nodes[i] = node(i, rng.choice(pool), rng.choice([None] + pool))
+
+    animals = [119, 118, 111, 97, 64, 3]
+    matrix = kinship_matrix(nodes, animals)
+    values = inbreeding.meuwissen_luo(nodes)
+
+    assert matrix.shape == (6, 6)
+    assert abs(matrix - matrix.T).max() < 1e-12
+    for i, animal_id in enumerate(animals):
+        assert abs(matrix[i, i] - (1 + values[animal_id]) / 2) < 1e-9
+    assert abs(matrix[0, 1] - inbreeding.offspring_inbreeding(nodes, 119, 118)) < 1e-6
+    assert round(matrix[2, 3], 6) == inbreeding.offspring_inbreeding(nodes, 111, 97)
+
+# Handles test gene dropping matches exact f and ballou ancestral inbreeding logic for this module.
+def test_gene_dropping_matches_exact_f_and_ballou_ancestral_inbreeding():
+    from Backend.app.gene_dropping import gene_drop, gene_drop_breed
+    from Backend.app.kinship import kinship_matrix
+
+    nodes = {
+        1: node(1), 2: node(2), 3: node(3, 1, 2), 4: node(4, 1, 2),
+        5: node(5, 3, 4), 6: node(6, 3, 5), 7: node(7, 2),
+    }
+    result = gene_drop(nodes, [5, 6, 7], replicates=20000, seed=11)
+
+    assert sorted(result.founder_ids) == [1, 2, 7]
+    assert result.founder_alleles == 5
+    assert abs(result.inbreeding[5] - 0.25) < 0.01
+    assert abs(result.inbreeding[6] - 0.375) < 0.01
+    # Ballou: F_a = ½[F_a,s + (1 − F_a,s)F_s + F_a,d + (1 − F_a,d)F_d]; only 6 has an inbred parent.
+    assert result.ancestral_inbreeding[5] == 0.0
+    assert abs(result.ancestral_inbreeding[6] - 0.125) < 0.01
+    kinship = kinship_matrix(nodes, [5, 6, 7])
+    assert abs(result.founder_genome_equivalents - 1 / (2 * kinship.mean())) < 0.05
+    assert 0 < result.allele_retention < 1 and abs(sum(result.founder_contributions.values()) - 1) < 1e-9
+
+    db = make_session()
+    breeder = create_breeder(db)
+    sire = register(db, breeder, 'male')
+    dam = register(db, breeder, 'female')
+    calves = [register(db, breeder, gender, sire=sire, dam=dam) for gender in ('male', 'female')]
+    breed = gene_drop_breed(db, animal_type='cattle', breed='Boran', replicates=200, seed=1)
+    assert set(breed.reference_ids) == {sire.id, dam.id} | {calf.id for calf in calves}
+    assert breed.founder_ids == sorted([sire.id, dam.id]) and breed.allele_retention == 1.0
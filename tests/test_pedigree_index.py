@@ -0,0 +1,380 @@
+# tests/test_pedigree_index.py: contains backend logic for the Animal Breed Registry System.
+from datetime import date
+from pathlib import Path
+import sys
+import types
+
+passlib_module = types.ModuleType('passlib')
+passlib_context_module = types.ModuleType('passlib.context')
+# Defines the crypt context structure used by this module.
+class CryptContext:
+    # Internal helper for init.
+    def __init__(self, *args, **kwargs): pass
+    # Handles hash logic for this module.
+    def hash(self, value): return value
+    # Handles verify logic for this module.
+    def verify(self, plain, hashed): return plain == hashed
+passlib_context_module.CryptContext = CryptContext
+sys.modules.setdefault('passlib', passlib_module)
+sys.modules.setdefault('passlib.context', passlib_context_module)
+
+jose_module = types.ModuleType('jose')
+# Defines the jwterror structure used by this module.
+class JWTError(Exception): pass
+# Defines the dummy jwt structure used by this module.
+class DummyJWT:
+    # Handles encode logic for this module.
+    def encode(self, *args, **kwargs): return 'token'
+    # Handles decode logic for this module.
+    def decode(self, *args, **kwargs): return {}
+jose_module.JWTError = JWTError
+jose_module.jwt = DummyJWT()
+sys.modules.setdefault('jose', jose_module)
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from Backend.app.database import Base
+from Backend.app import models, schemas, crud, genetics, pedigree
+from Backend.app.pedigree import get_pedigree_index
+
+# Handles make session logic for this module.
+def make_session():
+    engine = create_engine('sqlite:///:memory:', connect_args={'check_same_thread': False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+# Handles count queries logic for this module.
+def count_queries(db):
+    counter = {'count': 0, 'statements': []}
+
+    # Handles before cursor execute logic for this module.
+    def before_cursor_execute(conn, cursor, statement, *args, **kwargs):
+        counter['count'] += 1
+        counter['statements'].append(statement)
+
+    event.listen(db.get_bind(), 'before_cursor_execute', before_cursor_execute)
+    return counter
+
+# Handles register logic for this module.
+def register(db, breeder, gender, sire=None, dam=None):
+    return crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Boran', gender=gender, date_of_birth=date(2020, 1, 1),
+        sire_id=sire.animal_id if sire else None, dam_id=dam.animal_id if dam else None,
+    ), breeder.id)
+
+# Creates and stores a new breeder record.
+def create_breeder(db):
+    breeder = models.Breeder(
+        full_name='Pedigree Breeder', national_id='555', animal_type='cattle', farm_name='Farm',
+        farm_prefix='PED', farm_location='Nakuru', county='Nakuru', phone='0700000000',
+        email='pedigree@example.com', password_hash='hash', status='approved'
+    )
+    db.add(breeder); db.commit(); db.refresh(breeder); return breeder
+
+# Handles half sibling pedigree logic for this module.
+def half_sibling_pedigree(db):
+    breeder = create_breeder(db)
+    grand_sire = register(db, breeder, 'male')
+    dam_a = register(db, breeder, 'female')
+    dam_b = register(db, breeder, 'female')
+    sire = register(db, breeder, 'male', sire=grand_sire, dam=dam_a)
+    dam = register(db, breeder, 'female', sire=grand_sire, dam=dam_b)
+    return breeder, sire, dam
+
+# Handles test coi reads parentage from index and only the epoch row logic for this module.
+def test_coi_reads_parentage_from_index_and_only_the_epoch_row():
+    db = make_session()
+    _, sire, dam = half_sibling_pedigree(db)
+    sire_id, dam_id = sire.id, dam.id
+    get_pedigree_index(db)
+    counter = count_queries(db)
+
+    coi = genetics.compute_inbreeding_coefficient(sire_id, dam_id, db)
+    completeness = genetics.analyze_pedigree_completeness(sire_id, db, max_depth=4)
+
+    assert coi == 0.125
+    assert completeness['known_ancestor_slots'] == 2
+    # Parentage comes from the index; only the epoch row is read.
+    assert counter['count'] > 0
+    assert all('pedigree_epochs' in statement for statement in counter['statements'])
+
+# Handles test recommendation queries do not grow with the sire pool logic for this module.
+def test_recommendation_queries_do_not_grow_with_the_sire_pool():
+    counts = []
+
+    for pool_size in (5, 40):
+        db = make_session()
+        breeder, sire, dam = half_sibling_pedigree(db)
+
+        for _ in range(pool_size):
+            register(db, breeder, 'male', sire=sire)
+        dam_id = dam.id
+        get_pedigree_index(db)
+        counter = count_queries(db)
+
+        assert len(genetics.recommend_sires(dam_id, db, top_n=50)) == pool_size + 2
+        # The epoch is read once per request, not once per sire's completeness lookup.
+        assert sum('pedigree_epochs' in statement for statement in counter['statements']) <= 2
+        counts.append(counter['count'])
+
+    assert counts[0] == counts[1]
+
+# Handles test index applies parentage changes from crud logic for this module.
+def test_index_applies_parentage_changes_from_crud():
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    index = get_pedigree_index(db)
+    assert genetics.compute_inbreeding_coefficient(sire.id, dam.id, db) == 0.125
+
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+    assert index.parents(dam.id)[0] is None
+    assert genetics.compute_inbreeding_coefficient(sire.id, dam.id, db) == 0.0
+
+    calf = register(db, breeder, 'female', sire=sire, dam=dam)
+    assert index.parents(calf.id) == (sire.id, dam.id)
+
+# Handles test epoch reads see writes from another worker logic for this module.
+def test_epoch_reads_see_writes_from_another_worker():
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    sire_id, dam_id, grand_sire_id = sire.id, dam.id, dam.sire_id
+    bind = db.get_bind()
+    worker_a = get_pedigree_index(db)
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.125
+    epoch = pedigree.get_pedigree_epoch(db, 'cattle')
+
+    # A second worker process: its own index on the same database.
+    worker_b = pedigree.PedigreeIndex()
+    pedigree._INDEXES[bind] = worker_b
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+    calf = register(db, breeder, 'female', sire=sire, dam=dam)
+    assert worker_b.parents(dam_id)[0] is None
+    assert worker_a.parents(dam_id)[0] == grand_sire_id
+    assert calf.id not in worker_a
+
+    pedigree._INDEXES[bind] = worker_a
+    assert pedigree.get_pedigree_epoch(db, 'cattle') == epoch + 2
+    assert worker_a.parents(dam_id)[0] is None
+    assert worker_a.parents(calf.id) == (sire_id, dam_id)
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.0
+    assert pedigree.get_pedigree_epoch(db) == worker_a.epoch() == worker_b.epoch()
+
+# Handles test index epoch advances only with the committed parentage logic for this module.
+def test_index_epoch_advances_only_with_the_committed_parentage(monkeypatch):
+    from Backend.app.services import animal_service
+
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    calf = register(db, breeder, 'female', sire=sire, dam=dam)
+    dam_id, calf_id, grand_sire_id = dam.id, calf.id, dam.sire_id
+    index = get_pedigree_index(db)
+    epoch = index.epoch('cattle')
+    seen_at_commit = []
+    commit = db.commit
+
+    # Records what another thread could read from the mirror while the write commits.
+    def observed_commit():
+        seen_at_commit.append((index.epoch('cattle'), index.parents(dam_id)[0], calf_id in index))
+        commit()
+
+    monkeypatch.setattr(db, 'commit', observed_commit)
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+    assert seen_at_commit[-1] == (epoch, grand_sire_id, True)
+    assert (index.epoch('cattle'), index.parents(dam_id)[0]) == (epoch + 1, None)
+
+    animal_service.delete_animal_for_breeder(db, breeder_id=breeder.id, animal_db_id=calf_id)
+    assert seen_at_commit[-1] == (epoch + 1, None, True)
+    assert index.epoch('cattle') == epoch + 2 and calf_id not in index
+    assert pedigree.get_pedigree_epoch(db, 'cattle') == index.epoch('cattle')
+
+# Handles test recommendations after another worker's correction use the new parentage logic for this module.
+def test_recommendations_after_another_workers_correction_use_the_new_parentage():
+    db = make_session()
+    _, sire, dam = half_sibling_pedigree(db)
+    sire_id, dam_id = sire.id, dam.id
+    bind = db.get_bind()
+    worker_a = get_pedigree_index(db)
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.125
+
+    worker_b = pedigree.PedigreeIndex()
+    pedigree._INDEXES[bind] = worker_b
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+
+    # Worker A's first call after the correction is a ranking pass.
+    pedigree._INDEXES[bind] = worker_a
+    ranked = {r['sire_id']: r['coi'] for r in genetics.recommend_sires(dam_id, db)}
+    assert ranked[sire_id] == 0.0
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.0
+    assert {r['sire_id']: r['coi'] for r in genetics.recommend_sires(dam_id, db)}[sire_id] == 0.0
+
+# Handles test recursive cte loads both pedigrees in one query logic for this module.
+def test_recursive_cte_loads_both_pedigrees_in_one_query(monkeypatch):
+    db = make_session()
+    _, sire, dam = half_sibling_pedigree(db)
+    sire_id, dam_id, grand_sire_id = sire.id, dam.id, sire.sire_id
+    monkeypatch.setattr(pedigree, 'PEDIGREE_INDEX_ENABLED', False)
+    counter = count_queries(db)
+
+    nodes = pedigree.load_ancestor_nodes(db, [sire_id, dam_id], max_depth=8)
+    assert counter['count'] == 1
+    assert {sire_id, dam_id, grand_sire_id} <= set(nodes)
+    assert pedigree.ancestor_graph(nodes, sire_id, 8) == genetics.build_pedigree_graph(db, sire_id, 8)
+
+    counter['count'] = 0
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.125
+    assert counter['count'] == 1
+
+    # With db.sql's path-walking function installed, multi-root and deep loads still use the CTE.
+    monkeypatch.setattr(pedigree, '_has_ancestry_function', lambda db: True)
+    counter['statements'].clear()
+    assert pedigree.load_ancestor_nodes(db, [sire_id, dam_id], max_depth=8) == nodes
+    assert set(pedigree.load_ancestor_nodes(db, [sire_id], max_depth=64)) == {sire_id, grand_sire_id, sire.dam_id}
+    assert all('WITH RECURSIVE' in statement for statement in counter['statements'])
+
+# Handles test pedigree epoch versions cached coi logic for this module.
+def test_pedigree_epoch_versions_cached_coi():
+    from Backend.app.genetics_cache import get_pedigree_result_cache
+
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    sire_id, dam_id = sire.id, dam.id
+    index = get_pedigree_index(db)
+    stored = {row.scope: row.epoch for row in db.query(models.PedigreeEpoch).all()}
+    assert stored == {'__all__': 5, 'cattle': 5}
+    assert pedigree.get_pedigree_epoch(db) == index.epoch('cattle') == 5
+
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.125
+    cache = get_pedigree_result_cache(db)
+    hits = cache.hits
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.125
+    assert cache.hits == hits + 1
+
+    crud.update_animal(db, dam, schemas.AnimalUpdate(breed='Sahiwal'))
+    crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='goat', breed='Galla', gender='male', date_of_birth=date(2020, 1, 1)
+    ), breeder.id)
+    assert pedigree.get_pedigree_epoch(db, 'cattle') == 5
+    assert pedigree.get_pedigree_epoch(db, 'goat') == 1
+    assert pedigree.get_pedigree_epoch(db) == 6
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.125
+    assert cache.hits == hits + 2
+
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+    assert pedigree.get_pedigree_epoch(db, 'cattle') == 6
+    size = len(cache)
+    assert genetics.compute_inbreeding_coefficient(sire_id, dam_id, db) == 0.0
+    assert len(cache) == size
+    assert db.query(models.PedigreeEpoch).filter_by(scope='cattle').one().epoch == 6
+
+# Handles test shared traversal matches path walk and reads pedigree once logic for this module.
+def test_shared_traversal_matches_path_walk_and_reads_pedigree_once(monkeypatch):
+    from collections import deque
+    from Backend.app.routes.genetics import get_coi
+
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    # Line-breed a few more generations so ancestors are reached by several paths.
+    bull = register(db, breeder, 'male', sire=sire, dam=dam)
+    cow = register(db, breeder, 'female', sire=sire, dam=register(db, breeder, 'female', sire=bull, dam=dam))
+    bull_id, cow_id = bull.id, cow.id
+    nodes = pedigree.load_ancestor_nodes(db, [bull_id, cow_id], max_depth=8)
+
+    # Handles path walk logic for this module.
+    def path_walk(animal_id, max_depth):
+        known = expected = deepest = 0
+        queue = deque([(animal_id, 0)])
+        while queue:
+            current_id, generation = queue.popleft()
+            node = nodes.get(current_id)
+            if generation >= max_depth or not node:
+                continue
+            for parent_id in (node.sire_id, node.dam_id):
+                expected += 1
+                if parent_id:
+                    known += 1; deepest = max(deepest, generation + 1)
+                    queue.append((parent_id, generation + 1))
+        return known, expected, deepest
+
+    traversal = genetics.PedigreeTraversal(None, [bull_id, cow_id], 8, pedigree=nodes)
+    traversal.coi(bull_id, cow_id)
+    for animal_id in (bull_id, cow_id):
+        for depth in (1, 2, 4, 8):
+            result = traversal.completeness(animal_id, depth)
+            assert (result['known_ancestor_slots'], result['expected_ancestor_slots'], result['generations_available']) == path_walk(animal_id, depth)
+        assert traversal.graph(animal_id, 4) == pedigree.ancestor_graph(nodes, animal_id, 4)
+    # Completeness at every depth reused the two COI histograms.
+    assert sorted(traversal.counter._memo) == sorted([(bull_id, 8), (cow_id, 8)])
+
+    monkeypatch.setattr(pedigree, 'PEDIGREE_INDEX_ENABLED', False)
+    counter = count_queries(db)
+    body = get_coi(sire_id=bull_id, dam_id=cow_id, db=db, current_breeder=breeder)
+    # Sire lookup, dam lookup and one recursive CTE for both pedigrees.
+    assert counter['count'] == 3
+    assert body['coi'] == genetics.compute_inbreeding_coefficient(bull_id, cow_id, db, pedigree=nodes)
+    assert body['pedigree_completeness']['sire']['known_ancestor_slots'] == path_walk(bull_id, 4)[0]
+
+# Handles test stored completeness matches path walk and follows parentage changes logic for this module.
+def test_stored_completeness_matches_path_walk_and_follows_parentage_changes():
+    from Backend.app import pedigree_changes
+    from Backend.app.pedigree_completeness import refresh_pedigree_completeness
+
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    bull = register(db, breeder, 'male', sire=sire, dam=dam)
+    cow = register(db, breeder, 'female', sire=sire, dam=register(db, breeder, 'female', sire=bull, dam=dam))
+    bull_id, cow_id = bull.id, cow.id
+    index = get_pedigree_index(db)
+
+    # Handles assert matches walk logic for this module.
+    def assert_matches_walk():
+        traversal = genetics.PedigreeTraversal(None, [bull_id, cow_id], 8, pedigree=dict((node.id, node) for node in index))
+        for node in index:
+            for depth in (1, 2, 4, 8):
+                assert genetics.analyze_pedigree_completeness(node.id, db, max_depth=depth) == traversal.completeness(node.id, depth)
+        assert genetics.combine_pedigree_completeness(bull_id, cow_id, db, max_depth=4) == \
+            genetics.combine_pedigree_completeness(bull_id, cow_id, None, max_depth=4, traversal=traversal)
+
+    assert index.completeness(sire.id) == pedigree.PedigreeCompleteness((2, 0, 0, 0, 0, 0, 0, 0), (2, 4, 0, 0, 0, 0, 0, 0), 1.0, 0.2)
+    counter = count_queries(db)
+    assert_matches_walk()
+    # No pedigree walk against the database: only epoch checks.
+    assert all('pedigree_epochs' in statement for statement in counter['statements'])
+
+    # A parentage change clears the descendant cone; lookups walk the pedigree until it is rebuilt.
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+    assert index.completeness(cow_id) is None
+    assert genetics.analyze_pedigree_completeness(cow_id, db, max_depth=4)['known_by_generation'] == [2, 4, 3, 3]
+    pedigree_changes.recompute_descendant_cone(db, [dam.id])
+    assert index.completeness(cow_id).known_slots[:4] == (2, 4, 3, 3)
+    assert_matches_walk()
+
+    incremental = {node.id: index.completeness(node.id) for node in index}
+    assert refresh_pedigree_completeness(db, animal_type='cattle') == len(incremental)
+    assert {node.id: index.completeness(node.id) for node in index} == incremental
+
+# Handles test stored completeness follows corrections made by another worker logic for this module.
+def test_stored_completeness_follows_corrections_made_by_another_worker():
+    from Backend.app import pedigree_changes
+
+    db = make_session()
+    breeder, sire, dam = half_sibling_pedigree(db)
+    calf = register(db, breeder, 'female', sire=sire, dam=dam)
+    calf_id, dam_id = calf.id, dam.id
+    bind = db.get_bind()
+    worker_a = get_pedigree_index(db)
+    before = genetics.analyze_pedigree_completeness(calf_id, db, max_depth=4)
+    assert before['known_by_generation'][:2] == [2, 4]
+
+    worker_b = pedigree.PedigreeIndex()
+    pedigree._INDEXES[bind] = worker_b
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=None))
+    pedigree_changes.recompute_descendant_cone(db, [dam_id])
+
+    # Worker A reloads on the new epoch and reads the rebuilt rows it has not seen yet.
+    pedigree._INDEXES[bind] = worker_a
+    after = genetics.analyze_pedigree_completeness(calf_id, db, max_depth=4)
+    assert after['known_by_generation'][:2] == [2, 3]
+    assert worker_a.completeness(calf_id) == worker_b.completeness(calf_id)
+
@@ -94,3 +94,643 @@ def test_breeding_event_no_longer_assumes_success_until_outcome_recorded():
     assert failed.status == 'failed'
     assert failed.outcome == 'failed_conception'
     assert failed.pregnancy_confirmed is False
+
+# Handles test bulk breeding profiles use fixed query count logic for this module.
+def test_bulk_breeding_profiles_use_fixed_query_count():
+    from sqlalchemy import event
+    from Backend.app import genetics
+
+    db = make_session(); breeder = create_breeder(db)
+    dam = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2021, 1, 1)
+    ), breeder.id)
+    sires = []
+    for index in range(6):
+        sire = crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Friesian', gender='male', date_of_birth=date(2020, 1, 1)
+        ), breeder.id)
+        for day in (1, 2):
+            crud.create_animal_measurement(db, sire, schemas.AnimalMeasurementCreate(value=400 + index * 10 + day, measured_at=date(2026, 3, day)))
+        crud.create_fertility_record(db, sire, schemas.AnimalFertilityRecordCreate(record_date=date(2026, 1, 1), fertility_status='proven'))
+        crud.create_production_record(db, sire, schemas.AnimalProductionRecordCreate(record_date=date(2026, 1, 1), average_daily_gain=0.5 + index / 10))
+        sires.append(sire)
+    crud.create_breeding_event(db, schemas.BreedingEventCreate(
+        breeding_method='ai', dam_id=dam.id, sire_id=sires[0].id, breeding_date=date(2026, 5, 4)
+    ), breeder.id)
+
+    expected = {sire.id: genetics._legacy_profile(crud.get_animal(db, sire.id)) for sire in sires}
+    db.expire_all()
+    queries = {'count': 0}
+    event.listen(db.get_bind(), 'before_cursor_execute', lambda *args, **kwargs: queries.__setitem__('count', queries['count'] + 1))
+
+    animals = db.query(models.Animal).filter(models.Animal.gender == 'male').all()
+    queries['count'] = 0
+    profiles = genetics.build_animal_breeding_profiles(animals, db)
+    assert queries['count'] == 2
+
+    for sire in sires:
+        profile, legacy = profiles[sire.id], expected[sire.id]
+        assert profile.current_weight == legacy.current_weight
+        assert profile.average_daily_gain == legacy.average_daily_gain
+        assert profile.fertility_status == 'proven'
+    assert profiles[sires[0].id].last_breeding_status == 'served'
+    assert 'breeding_events' not in profiles[sires[1].id].data_sources
+
+# Handles test current state row follows writes and rebuild logic for this module.
+def test_current_state_row_follows_writes_and_rebuild():
+    from Backend.app import current_state
+
+    db = make_session(); breeder = create_breeder(db)
+    animal = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2024, 1, 1), current_weight=210
+    ), breeder.id)
+    crud.create_health_record(db, animal, schemas.AnimalHealthRecordCreate(record_date=date(2026, 5, 4), health_status='good'))
+    crud.create_health_record(db, animal, schemas.AnimalHealthRecordCreate(record_date=date(2026, 1, 4), health_status='sick'))
+    crud.create_animal_measurement(db, animal, schemas.AnimalMeasurementCreate(value=260, measured_at=date(2026, 2, 1)))
+
+    state = db.get(models.AnimalCurrentState, animal.id)
+    assert state.health_status == 'good'
+    assert state.health_record_date == date(2026, 5, 4)
+    assert state.current_weight == 260
+    assert animal.current_weight == 260
+
+    db.query(models.AnimalCurrentState).delete(); db.commit()
+    assert crud.get_animal(db, animal.id).health_status == 'good'
+    assert current_state.rebuild_current_state(db) == 1
+    assert db.get(models.AnimalCurrentState, animal.id).current_weight == 260
+
+# Handles test sire components are cached until sire records change logic for this module.
+def test_sire_components_are_cached_until_sire_records_change(monkeypatch):
+    from Backend.app import genetics
+    from Backend.app.genetics_cache import get_sire_cache
+
+    db = make_session(); breeder = create_breeder(db)
+    dams = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2021, 1, 1)
+    ), breeder.id) for _ in range(2)]
+    sire = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='male', date_of_birth=date(2020, 1, 1)
+    ), breeder.id)
+    cache = get_sire_cache(db)
+
+    first = genetics.recommend_sires(dams[0].id, db)
+    assert cache.misses == 1 and cache.hits == 0
+    second = genetics.recommend_sires(dams[1].id, db)
+    assert cache.hits == 1
+    assert first[0]['final_score'] == second[0]['final_score']
+
+    crud.create_health_record(db, sire, schemas.AnimalHealthRecordCreate(record_date=date(2026, 5, 4), health_status='sick'))
+    flagged = genetics.recommend_sires(dams[0].id, db)
+    assert cache.misses == 2
+    assert 'Sire health status is not suitable for breeding.' in flagged[0]['risk_flags']
+
+    crud.create_breeding_event(db, schemas.BreedingEventCreate(
+        breeding_method='ai', dam_id=dams[1].id, sire_id=sire.id, breeding_date=date(2026, 5, 4)
+    ), breeder.id)
+    assert genetics.recommend_sires(dams[0].id, db)[0]['last_breeding_status'] == 'served'
+    assert cache.misses == 3
+
+    # Another worker's write never reaches this process's LRU; the bumped updated_at still invalidates it.
+    event = db.query(models.BreedingEvent).one()
+    monkeypatch.setattr(crud.genetics_cache, 'record_breeding_event_written', lambda *args: None)
+    crud.update_breeding_event(db, event, schemas.BreedingEventUpdate(pregnancy_confirmed=True))
+    assert genetics.recommend_sires(dams[0].id, db)[0]['last_breeding_status'] == 'confirmed_pregnant'
+    assert cache.misses == 4
+
+# Handles test pruned top n matches full ranking logic for this module.
+def test_pruned_top_n_matches_full_ranking():
+    from Backend.app import genetics
+
+    db = make_session(); breeder = create_breeder(db)
+    dam = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2021, 1, 1)
+    ), breeder.id)
+    sires = []
+    for index in range(30):
+        extra = {}
+        if index % 3 == 0:
+            extra = {'current_weight': 300 + index * 10, 'health_status': 'good', 'fertility_status': 'proven'}
+        if index % 7 == 0:
+            extra['hereditary_conditions'] = 'carrier'
+        sires.append(crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Friesian', gender='male', date_of_birth=date(2020, 1, 1),
+            sire_id=sires[index - 3].animal_id if index >= 3 and index % 2 else None, **extra
+        ), breeder.id))
+    crud.update_animal(db, dam, schemas.AnimalUpdate(sire_id=sires[4].animal_id))
+
+    full = []
+    for index, sire in enumerate(sires):
+        full.append((genetics.evaluate_pair(sire, dam, db, max_depth=8), index))
+    full.sort(key=lambda item: (item[0]['final_score'], item[0]['confidence_score'], -item[0]['coi']), reverse=True)
+
+    for top_n in (1, 5, 20):
+        stats = {}
+        ranked = genetics.recommend_sires(dam.id, db, top_n=top_n, stats=stats)
+        assert [r['sire_id'] for r in ranked] == [sires[i].id for _, i in full[:top_n]]
+        assert [r['final_score'] for r in ranked] == [e['final_score'] for e, _ in full[:top_n]]
+        assert stats['candidates'] == 30
+        assert stats['evaluated'] + stats['pruned'] == 30
+    small = {}
+    genetics.recommend_sires(dam.id, db, top_n=1, stats=small)
+    assert small['pruned'] > 0
+
+# Handles test vectorized scoring matches evaluate pair logic for this module.
+def test_vectorized_scoring_matches_evaluate_pair():
+    import numpy as np
+    from Backend.app import genetics, genetics_vectorized
+    from Backend.app.carrier_probabilities import get_carrier_probabilities
+
+    db = make_session(); breeder = create_breeder(db)
+    sires = []
+    for index in range(12):
+        extra = {'current_weight': 250 + index * 40, 'health_status': 'good'} if index % 2 else {'fertility_status': 'poor'}
+        if index % 5 == 0:
+            extra['hereditary_conditions'] = 'carrier'
+        sires.append(crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Boran', gender='male', date_of_birth=date(2020, 1, 1),
+            sire_id=sires[0].animal_id if index in (3, 4) else None, **extra
+        ), breeder.id))
+    dam = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Boran', gender='female', date_of_birth=date(2021, 1, 1), sire_id=sires[0].animal_id
+    ), breeder.id)
+
+    evaluations = [genetics.evaluate_pair(sire, dam, db, max_depth=6) for sire in sires]
+    profiles = genetics.build_animal_breeding_profiles(sires, db)
+    columns = genetics_vectorized.build_candidate_columns([profiles[sire.id] for sire in sires])
+    coi = np.array([e['coi'] for e in evaluations])
+    carriers = get_carrier_probabilities(db, 'cattle')
+    result = genetics_vectorized.score_candidates(
+        columns, dam, coi, carrier_risk=carriers.risk_matrix([dam.id], [sire.id for sire in sires], coi)[0]
+    )
+
+    assert np.allclose(np.round(result['final_score'], 4), [e['final_score'] for e in evaluations], atol=1e-9)
+    assert np.allclose(np.round(result['penalty_score'] * 100, 1), [e['penalty_score'] for e in evaluations])
+    assert genetics_vectorized.top_candidates(result['final_score'], 3)[0] == int(np.argmax(result['final_score']))
+
+# Handles test recommend sires on worker processes matches sequential logic for this module.
+def test_recommend_sires_on_worker_processes_matches_sequential(monkeypatch):
+    from Backend.app import genetics, genetics_parallel, pedigree
+
+    db = make_session(); breeder = create_breeder(db)
+    founders = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='goat', breed='Galla', gender=gender, date_of_birth=date(2018, 1, 1)
+    ), breeder.id) for gender in ('male', 'female', 'male', 'female')]
+    sires = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='goat', breed='Galla', gender='male', date_of_birth=date(2020, 1, 1),
+        sire_id=founders[index % 2 * 2].animal_id, dam_id=founders[1 + index % 3 // 2 * 2].animal_id,
+        current_weight=40 + index,
+    ), breeder.id) for index in range(16)]
+    dam = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='goat', breed='Galla', gender='female', date_of_birth=date(2021, 1, 1),
+        sire_id=sires[0].animal_id, dam_id=founders[3].animal_id,
+    ), breeder.id)
+
+    sequential = genetics.recommend_sires(dam.id, db, top_n=6, workers=1)
+    monkeypatch.setattr(genetics_parallel, 'GENETICS_PARALLEL_MIN_CANDIDATES', 2)
+    parallel = genetics.recommend_sires(dam.id, db, top_n=6, workers=2)
+    assert [(r['sire_id'], r['coi'], r['final_score']) for r in parallel] == [(r['sire_id'], r['coi'], r['final_score']) for r in sequential]
+
+    # The pool outlives the request; workers keep the goat snapshot until the goat epoch moves.
+    pool, index = genetics_parallel._POOL, pedigree.get_pedigree_index(db)
+    key = genetics_parallel._TYPE_SNAPSHOTS[index]['goat'][1]
+    genetics.recommend_sires(dam.id, db, top_n=6, workers=2)
+    assert genetics_parallel._POOL is pool and genetics_parallel._TYPE_SNAPSHOTS[index]['goat'][1] == key
+    crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='goat', breed='Galla', gender='male', date_of_birth=date(2022, 1, 1), sire_id=sires[1].animal_id,
+    ), breeder.id)
+    refreshed = genetics.recommend_sires(dam.id, db, top_n=6, workers=2)
+    assert genetics_parallel._POOL is pool and genetics_parallel._TYPE_SNAPSHOTS[index]['goat'][1] != key
+    assert refreshed == genetics.recommend_sires(dam.id, db, top_n=6, workers=1)
+
+# Handles test recommendations are cached and revalidated with etag logic for this module.
+def test_recommendations_are_cached_and_revalidated_with_etag():
+    from starlette.requests import Request
+    from starlette.responses import Response
+    from Backend.app.routes.genetics import get_sire_recommendations
+
+    db = make_session(); breeder = create_breeder(db)
+    dam = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2021, 1, 1)
+    ), breeder.id)
+    sires = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='male', date_of_birth=date(2020, 1, 1), current_weight=300 + index
+    ), breeder.id) for index in range(3)]
+
+    # Handles fetch logic for this module.
+    def fetch(etag=None):
+        headers = [(b'if-none-match', etag.encode())] if etag else []
+        response = Response()
+        body = get_sire_recommendations(dam.id, Request({'type': 'http', 'headers': headers}), response, top_n=2, budget_ms=None, filters=None, db=db, current_breeder=breeder)
+        return (body, response) if not isinstance(body, Response) else (None, body)
+
+    first, response = fetch()
+    etag = response.headers['etag']
+    assert first['cached'] is False and len(first['recommendations']) == 2
+    second, response = fetch()
+    assert second['cached'] is True and response.headers['etag'] == etag
+    assert second['recommendations'] == first['recommendations']
+    assert fetch(etag)[1].status_code == 304
+
+    crud.create_health_record(db, sires[2], schemas.AnimalHealthRecordCreate(record_date=date(2026, 5, 4), health_status='poor'))
+    third, response = fetch(etag)
+    assert third['cached'] is False and response.headers['etag'] != etag
+
+    etag = response.headers['etag']
+    crud.create_breeding_event(db, schemas.BreedingEventCreate(
+        breeding_method='ai', dam_id=dam.id, sire_id=sires[0].id, breeding_date=date(2026, 5, 4)
+    ), breeder.id)
+    assert fetch(etag)[1].headers['etag'] != etag
+
+# Handles test streamed recommendations end with the ranked top n logic for this module.
+def test_streamed_recommendations_end_with_the_ranked_top_n():
+    import asyncio
+    import json
+    from Backend.app import genetics
+    from Backend.app.routes.genetics import stream_sire_recommendations
+
+    db = make_session(); breeder = create_breeder(db)
+    dam = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='sheep', breed='Dorper', gender='female', date_of_birth=date(2021, 1, 1)
+    ), breeder.id)
+    for index in range(6):
+        crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='sheep', breed='Dorper', gender='male', date_of_birth=date(2020, 1, 1),
+            current_weight=40 + index * 10, health_status='good' if index % 2 else 'poor',
+        ), breeder.id)
+
+    # Handles collect logic for this module.
+    def collect(format):
+        response = stream_sire_recommendations(dam.id, top_n=3, format=format, budget_ms=None, filters=None, db=db, current_breeder=breeder)
+
+        # Handles read logic for this module.
+        async def read():
+            return ''.join([chunk async for chunk in response.body_iterator])
+        return response.media_type, asyncio.run(read())
+
+    media_type, body = collect('ndjson')
+    events = [json.loads(line) for line in body.splitlines()]
+    assert media_type == 'application/x-ndjson'
+    assert events[0] == {'event': 'start', 'candidates': 6, 'top_n': 3}
+    candidates = [event for event in events if event['event'] == 'candidate']
+    assert len(candidates) == events[-1]['search_stats']['evaluated']
+    assert set(candidates[0]['recommendation']) >= {'sire_id', 'coi', 'final_score', 'risk_flags', 'explanation'}
+    assert events[-1]['event'] == 'final'
+    assert [r['sire_id'] for r in events[-1]['recommendations']] == [r['sire_id'] for r in genetics.recommend_sires(dam.id, db, top_n=3)]
+
+    media_type, body = collect('sse')
+    assert media_type == 'text/event-stream'
+    assert body.startswith('event: start\ndata: ') and 'event: final\ndata: ' in body
+
+# Handles test budgeted recommendations flag approximate coi logic for this module.
+def test_budgeted_recommendations_flag_approximate_coi():
+    from Backend.app import genetics
+
+    db = make_session(); breeder = create_breeder(db)
+    # Sire and dam share a founder five generations back, beyond the approximate depth.
+    founder = crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Boran', gender='male', date_of_birth=date(2000, 1, 1)
+    ), breeder.id)
+    lines = []
+    for gender in ('female', 'male'):
+        parent = founder
+        for generation in range(5):
+            parent = crud.create_animal(db, schemas.AnimalCreate(
+                animal_type='cattle', breed='Boran', gender=gender if generation == 4 else 'male',
+                date_of_birth=date(2001 + generation, 1, 1), sire_id=parent.animal_id,
+            ), breeder.id)
+        lines.append(parent)
+    dam, related = lines
+    for index in range(4):
+        crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Boran', gender='male', date_of_birth=date(2010, 1, 1),
+            current_weight=300 + index * 20,
+        ), breeder.id)
+
+    exact_stats, rushed_stats = {}, {}
+    exact = genetics.recommend_sires(dam.id, db, top_n=20, stats=exact_stats)
+    generous = genetics.recommend_sires(dam.id, db, top_n=20, budget_ms=60000)
+    assert exact_stats['exact'] and exact_stats['exact_fraction'] == 1.0
+    assert [r['sire_id'] for r in generous] == [r['sire_id'] for r in exact]
+    assert all(r['coi_exact'] and r['coi_depth'] == 8 for r in exact)
+
+    genetics.get_pedigree_result_cache(db).clear()
+    rushed = genetics.recommend_sires(dam.id, db, top_n=20, stats=rushed_stats, budget_ms=1e-9)
+    assert not rushed_stats['exact']
+    assert rushed_stats['exact_evaluated'] == 0 and rushed_stats['exact_fraction'] == 0.0
+    assert rushed_stats['approximate_evaluated'] == rushed_stats['evaluated']
+    assert all(not r['coi_exact'] and r['coi_depth'] == genetics.APPROXIMATE_COI_DEPTH for r in rushed)
+    coi = {r['sire_id']: r['coi'] for r in exact}
+    assert coi[related.id] > 0
+    assert {r['sire_id']: r['coi'] for r in rushed}[related.id] == 0
+
+# Handles test candidate filters narrow the sire pool in sql logic for this module.
+def test_candidate_filters_narrow_the_sire_pool_in_sql(monkeypatch):
+    from sqlalchemy import text
+    from Backend.app import genetics, pedigree
+    from Backend.app.genetics_candidates import SireCandidateFilter, candidate_sires_query
+
+    db = make_session(); breeder = create_breeder(db)
+    pending = models.Breeder(
+        full_name='Pending Breeder', national_id='998', animal_type='cattle', farm_name='Hill', farm_prefix='HL',
+        farm_location='Eldoret', county='Uasin Gishu', phone='0700000001', email='pending@example.com',
+        password_hash='hash', status='pending'
+    )
+    db.add(pending); db.commit(); db.refresh(pending)
+
+    # Handles add logic for this module.
+    def add(gender, breed='Friesian', born=date(2020, 1, 1), owner=breeder, sire=None, dam=None):
+        return crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed=breed, gender=gender, date_of_birth=born,
+            sire_id=sire.animal_id if sire else None, dam_id=dam.animal_id if dam else None,
+        ), owner.id)
+
+    grand_sire, grand_dam = add('male'), add('female')
+    dam = add('female', sire=grand_sire, dam=grand_dam)
+    brother = add('male', sire=grand_sire)
+    son = add('male', dam=dam, born=date(2024, 3, 1))
+    boran = add('male', breed='Boran')
+    young = add('male', born=date(2025, 6, 1))
+    remote = add('male', owner=pending)
+    unrelated = add('male', born=date(2018, 5, 1))
+    today = date(2026, 1, 15)
+
+    # Handles pool logic for this module.
+    def pool(**kwargs):
+        return {sire.id for sire, _ in candidate_sires_query(db, dam, SireCandidateFilter(**kwargs), today=today).all()}
+
+    everyone = {grand_sire.id, brother.id, son.id, boran.id, young.id, remote.id, unrelated.id}
+    assert pool() == everyone
+    assert pool(breeds=('Boran',)) == {boran.id}
+    assert pool(min_age_months=12) == everyone - {young.id}
+    assert pool(max_age_months=72) == everyone - {unrelated.id}
+    assert pool(max_age_months=71) == {son.id, young.id}
+    assert pool(min_age_months=7, max_age_months=7) == {young.id}
+    assert pool(county='Uasin Gishu') == pool(approved_breeders_only=False, county='Uasin Gishu') == {remote.id}
+    assert remote.id not in pool(approved_breeders_only=True)
+
+    relatives = {grand_sire.id, brother.id, son.id}
+    assert pool(exclude_close_relatives=True) == everyone - relatives
+    monkeypatch.setattr(pedigree, 'PEDIGREE_INDEX_ENABLED', False)
+    assert pool(exclude_close_relatives=True) == everyone - relatives
+    monkeypatch.setattr(pedigree, 'PEDIGREE_INDEX_ENABLED', True)
+
+    stats = {}
+    ranked = genetics.recommend_sires(dam.id, db, top_n=10, stats=stats, filters=SireCandidateFilter(exclude_close_relatives=True))
+    assert stats['candidates'] == 4 and {r['sire_id'] for r in ranked} == everyone - relatives
+
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM animals WHERE animal_type = 'cattle' AND gender = 'male' AND breed = 'Boran'"
+    )).fetchall()
+    assert any('idx_animals_type_gender_breed' in str(row) for row in plan)
+
+# Handles test mate allocation respects caps and matches evaluate pair logic for this module.
+def test_mate_allocation_respects_caps_and_matches_evaluate_pair():
+    import itertools
+    from Backend.app import genetics
+    from Backend.app.routes.genetics import allocate_mates
+
+    db = make_session(); breeder = create_breeder(db)
+
+    # Handles add logic for this module.
+    def add(gender, index, sire=None, **extra):
+        return crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Friesian', gender=gender, date_of_birth=date(2020, 1, 1),
+            sire_id=sire.animal_id if sire else None, **extra
+        ), breeder.id)
+
+    sires = [add('male', i, current_weight=300 + 150 * i, health_status='good' if i else 'poor') for i in range(3)]
+    dams = [add('female', i, sire=sires[2] if i < 2 else None) for i in range(5)]
+    served = dams[4]
+    db.add(models.BreedingEvent(
+        breeding_method='natural', dam_id=served.id, sire_id=sires[0].id, breeding_date=date(2025, 1, 1),
+        status='served', breeder_id=breeder.id,
+    )); db.commit()
+
+    payload = schemas.MateAllocationRequest(default_cap=1, sire_caps={sires[1].id: 2})
+    body = allocate_mates(payload, db=db, current_breeder=breeder)
+    assert body['dams'] == 4 and served.id not in {a['dam_id'] for a in body['assignments']}
+    usage = {row['sire_id']: row['used'] for row in body['sire_usage']}
+    assert usage[sires[0].id] <= 1 and usage[sires[1].id] <= 2 and usage[sires[2].id] <= 1
+    assert all(a['sire_id'] != sires[2].id for a in body['assignments'] if a['dam_id'] in (dams[0].id, dams[1].id))
+    for assignment in body['assignments']:
+        dam = db.get(models.Animal, assignment['dam_id']); sire = db.get(models.Animal, assignment['sire_id'])
+        assert abs(assignment['final_score'] - genetics.evaluate_pair(sire, dam, db, max_depth=8)['final_score']) < 1e-4
+
+    # Brute force over every capped assignment of the four open dams.
+    open_dams = dams[:4]
+    slots = [sires[0], sires[1], sires[1], sires[2]]
+    best = 0.0
+    for order in itertools.permutations(slots):
+        total = 0.0
+        for dam, sire in zip(open_dams, order):
+            if genetics.detect_relationship_risks(sire, dam):
+                break
+            total += genetics.evaluate_pair(sire, dam, db, max_depth=8)['final_score']
+        else:
+            best = max(best, total)
+    assert abs(body['total_score'] - best) < 1e-3
+    assert body['unassigned_dam_ids'] == []
+
+# Handles test batch recommendations match single dam rankings logic for this module.
+def test_batch_recommendations_match_single_dam_rankings(monkeypatch):
+    import pytest
+    from fastapi import HTTPException
+    from Backend.app import genetics
+    from Backend.app.services import genetics_service
+    from Backend.app.routes.genetics import get_batch_sire_recommendations
+
+    db = make_session(); breeder = create_breeder(db)
+    sires = []
+    for index in range(8):
+        extra = {'current_weight': 280 + index * 45, 'health_status': 'good' if index % 3 else 'poor'}
+        sires.append(crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Friesian', gender='male', date_of_birth=date(2019, 1, 1),
+            sire_id=sires[index - 2].animal_id if index >= 2 else None, **extra
+        ), breeder.id))
+    dams = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2021, 1, 1),
+        sire_id=sires[index].animal_id,
+    ), breeder.id) for index in range(4)]
+
+    payload = schemas.BatchRecommendationRequest(dam_ids=[dam.id for dam in dams], top_n=3, coi_method='paths')
+    body = get_batch_sire_recommendations(payload, db=db, current_breeder=breeder)
+    assert body['candidates'] == {'cattle': 8}
+    for dam, entry in zip(dams, body['dams']):
+        single = genetics.recommend_sires(dam.id, db, top_n=3)
+        assert [r['sire_id'] for r in entry['recommendations']] == [r['sire_id'] for r in single]
+        assert [r['final_score'] for r in entry['recommendations']] == [r['final_score'] for r in single]
+
+    excluded = get_batch_sire_recommendations(
+        schemas.BatchRecommendationRequest(dam_ids=[dams[0].id], top_n=8, exclude_close_relatives=True), db=db, current_breeder=breeder
+    )
+    assert sires[0].id not in {r['sire_id'] for r in excluded['dams'][0]['recommendations']}
+    assert excluded['coi_method'] == 'kinship'
+
+    # Oversized groups are rejected before the matrix is built.
+    monkeypatch.setattr(genetics_service, 'MAX_BATCH_KINSHIP_ANIMALS', 8)
+    with pytest.raises(HTTPException) as kinship_error:
+        get_batch_sire_recommendations(schemas.BatchRecommendationRequest(dam_ids=[dams[0].id]), db=db, current_breeder=breeder)
+    assert kinship_error.value.status_code == 400
+    assert get_batch_sire_recommendations(payload, db=db, current_breeder=breeder)['candidates'] == {'cattle': 8}
+    monkeypatch.setattr(genetics_service, 'MAX_BATCH_CELLS', 31)
+    with pytest.raises(HTTPException):
+        get_batch_sire_recommendations(payload, db=db, current_breeder=breeder)
+
+# Handles test optimal contributions meet the coancestry target logic for this module.
+def test_optimal_contributions_meet_the_coancestry_target():
+    import numpy as np
+    from scipy.optimize import minimize
+    from Backend.app.genetics_ocs import optimal_contributions
+    from Backend.app.routes.genetics import get_optimal_contributions
+
+    db = make_session(); breeder = create_breeder(db)
+    founders = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='male' if index % 2 else 'female', date_of_birth=date(2016, 1, 1),
+        current_weight=300 + index * 40, health_status='good' if index % 3 else 'poor',
+    ), breeder.id) for index in range(6)]
+    offspring = [crud.create_animal(db, schemas.AnimalCreate(
+        animal_type='cattle', breed='Friesian', gender='male' if index % 2 else 'female', date_of_birth=date(2020, 1, 1),
+        sire_id=founders[5].animal_id, dam_id=founders[index % 3 * 2].animal_id, current_weight=520 + index * 15,
+    ), breeder.id) for index in range(6)]
+
+    loose = get_optimal_contributions(schemas.OptimalContributionRequest(delta_f=0.5), db=db, current_breeder=breeder)
+    tight = get_optimal_contributions(schemas.OptimalContributionRequest(delta_f=0.005), db=db, current_breeder=breeder)
+    assert loose['candidates'] == 12
+    for body in (loose, tight):
+        for gender in ('male', 'female'):
+            assert abs(sum(s['contribution'] for s in body['selected'] if s['gender'] == gender) - 0.5) < 1e-5
+        assert body['group_coancestry'] <= body['target_coancestry'] + 1e-6
+    assert tight['constraint_binding'] and len(tight['selected']) > len(loose['selected'])
+    assert tight['expected_merit'] <= loose['expected_merit']
+
+    # The Lagrangian solution matches a general-purpose QP solver.
+    rng = np.random.default_rng(3)
+    root = rng.normal(size=(10, 10)); kinship = root @ root.T / 40 + np.eye(10) * 0.5
+    merit = rng.uniform(size=10); is_male = np.arange(10) % 2 == 0
+    result = optimal_contributions(kinship, merit, is_male, 0.08)
+    constraints = [
+        {'type': 'eq', 'fun': lambda c: c[is_male].sum() - 0.5},
+        {'type': 'eq', 'fun': lambda c: c[~is_male].sum() - 0.5},
+        {'type': 'ineq', 'fun': lambda c: 0.08 - c @ kinship @ c},
+    ]
+    reference = minimize(lambda c: -c @ merit, np.full(10, 0.1), bounds=[(0, None)] * 10, constraints=constraints, method='SLSQP')
+    assert abs(result.expected_merit + reference.fun) < 1e-5
+
+# Handles test carrier probabilities propagate and feed pair risk logic for this module.
+def test_carrier_probabilities_propagate_and_feed_pair_risk(monkeypatch):
+    from Backend.app import carrier_probabilities, genetics
+    from Backend.app.carrier_probabilities import get_carrier_probabilities, parse_hereditary_statuses
+
+    # In-memory SQLite is per thread, so refreshes run inline here.
+    monkeypatch.setattr(carrier_probabilities, 'CARRIER_BACKGROUND_REFRESH', False)
+
+    assert parse_hereditary_statuses('BLAD carrier; CVM tested clear') == {'blad': 'carrier', 'cvm': 'clear'}
+    assert parse_hereditary_statuses('Carrier status') == {'hereditary condition': 'carrier'}
+    assert parse_hereditary_statuses('none known') == {}
+
+    db = make_session(); breeder = create_breeder(db)
+    # An affected bull and his son; unrecorded parents of an affected calf, and a half-sib daughter of its sire.
+    # Handles register logic for this module.
+    def register(gender, sire=None, dam=None, hereditary=None):
+        return crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Boran', gender=gender, date_of_birth=date(2020, 1, 1), hereditary_conditions=hereditary,
+            sire_id=sire.animal_id if sire else None, dam_id=dam.animal_id if dam else None,
+        ), breeder.id)
+    bull = register('male', hereditary='BLAD affected')
+    mate = register('female')
+    son = register('male', sire=bull, dam=mate)
+    other_sire, other_dam = register('male'), register('female')
+    register('female', sire=other_sire, dam=other_dam, hereditary='BLAD affected')
+    daughter = register('female', sire=other_sire)
+
+    carriers = get_carrier_probabilities(db, 'cattle')
+    son_genotypes = carriers.genotypes(son.id)['blad']
+    assert son_genotypes[1] + son_genotypes[2] > 0.99
+    # Parents of an affected calf are obligate carriers; a half-sib daughter carries with P ≈ ½.
+    assert carriers.genotypes(other_sire.id)['blad'][1:].sum() > 0.99
+    assert abs(carriers.genotypes(daughter.id)['blad'][1:].sum() - 0.5) < 0.02
+
+    result = genetics.evaluate_pair(son, daughter, db)
+    risk = result['hereditary_risk'][0]
+    assert risk['condition'] == 'blad' and 0.1 < risk['affected_offspring_probability'] < 0.15
+    assert any('chance of an affected offspring' in flag for flag in result['risk_flags'])
+
+    # A new record is applied incrementally: same pedigree arrays, updated probabilities.
+    crud.create_health_record(db, daughter, schemas.AnimalHealthRecordCreate(
+        record_date=date(2024, 1, 1), hereditary_conditions='BLAD carrier'
+    ))
+    updated = get_carrier_probabilities(db, 'cattle')
+    assert updated.pedigree is carriers.pedigree
+    assert updated.genotypes(daughter.id)['blad'][1] > 0.99
+    high = genetics.evaluate_pair(son, daughter, db)
+    assert high['hereditary_risk'][0]['affected_offspring_probability'] > 0.25
+    assert high['recommendation_level'] == 'Avoid / Review'
+    assert high['final_score'] < result['final_score']
+
+# Handles test carrier probabilities refresh in the background logic for this module.
+def test_carrier_probabilities_refresh_in_the_background(tmp_path):
+    from Backend.app import carrier_probabilities
+    from Backend.app.carrier_probabilities import get_carrier_probabilities
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'carriers.db'}", connect_args={'check_same_thread': False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)(); breeder = create_breeder(db)
+    # Handles register logic for this module.
+    def register(gender, sire=None, dam=None, hereditary=None):
+        return crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Boran', gender=gender, date_of_birth=date(2020, 1, 1), hereditary_conditions=hereditary,
+            sire_id=sire.animal_id if sire else None, dam_id=dam.animal_id if dam else None,
+        ), breeder.id)
+    bull = register('male', hereditary='BLAD affected')
+    daughter = register('female', sire=bull)
+
+    carriers = get_carrier_probabilities(db, 'cattle')
+    assert carriers.genotypes(daughter.id)['blad'][1:].sum() > 0.99
+
+    # A new record and a new animal: the old state is served while a copy is refreshed.
+    crud.create_health_record(db, daughter, schemas.AnimalHealthRecordCreate(
+        record_date=date(2024, 1, 1), hereditary_conditions='BLAD affected'
+    ))
+    calf = register('male', sire=bull, dam=daughter)
+    assert get_carrier_probabilities(db, 'cattle') is carriers
+    carrier_probabilities.schedule_carrier_refresh(engine, 'cattle').join(timeout=30)
+
+    updated = get_carrier_probabilities(db, 'cattle')
+    assert updated is not carriers
+    assert updated.genotypes(daughter.id)['blad'][2] > 0.99
+    assert updated.genotypes(calf.id)['blad'][2] > 0.99
+    assert carriers.genotypes(calf.id) == {} and carriers.genotypes(daughter.id)['blad'][2] < 0.05
+
+# Handles test report summary reads latest values from current state logic for this module.
+def test_report_summary_reads_latest_values_from_current_state():
+    from sqlalchemy import event
+    from Backend.app.services import report_service
+
+    db = make_session(); breeder = create_breeder(db)
+    cow, heifer = (
+        crud.create_animal(db, schemas.AnimalCreate(
+            animal_type='cattle', breed='Friesian', gender='female', date_of_birth=date(2021, 1, 1)
+        ), breeder.id)
+        for _ in range(2)
+    )
+    crud.create_health_record(db, cow, schemas.AnimalHealthRecordCreate(record_date=date(2024, 1, 1), health_status='healthy'))
+    crud.create_health_record(db, cow, schemas.AnimalHealthRecordCreate(
+        record_date=date(2024, 6, 1), health_status='sick', disease_history='Mastitis'
+    ))
+    crud.create_production_record(db, cow, schemas.AnimalProductionRecordCreate(record_date=date(2024, 1, 1), daily_milk_yield=20))
+    crud.create_production_record(db, cow, schemas.AnimalProductionRecordCreate(record_date=date(2024, 6, 1), daily_milk_yield=24))
+    crud.create_production_record(db, heifer, schemas.AnimalProductionRecordCreate(record_date=date(2024, 6, 1), daily_milk_yield=13))
+    db.expire_all()
+
+    statements = []
+    event.listen(db.get_bind(), 'before_cursor_execute', lambda conn, cursor, statement, *args: statements.append(statement))
+    summary = report_service.get_breeder_report_summary(db, breeder_id=breeder.id)
+
+    assert summary['health_report']['status_breakdown'] == {'Sick': 1, 'Unknown': 1}
+    assert summary['health_report']['watchlist'][0]['issue'] == 'Mastitis'
+    assert summary['health_report']['latest_record_count'] == 1
+    assert summary['production_report']['animals_with_production_records'] == 2
+    # Herd averages still cover every production record.
+    assert summary['production_report']['average_daily_milk_yield'] == 19.0
+    assert not any('FROM animal_health_records' in statement for statement in statements)
+    assert not any('FROM animal_production_records' in statement and 'avg(' not in statement for statement in statements)